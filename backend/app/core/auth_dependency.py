@@ -1,36 +1,47 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from app.core.config import JWT_SECRET, JWT_ALGORITHM
+from app.core.jwt import TokenError
+from app.core.token_cache import verify_token
 
 security = HTTPBearer()
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """
     Validates JWT access token and returns decoded payload.
-    Used by all protected routes.
+    Used by all protected routes. Async so it runs on the event loop
+    instead of a threadpool hop; verified tokens are served from the
+    token cache (see token_cache).
     """
     token = credentials.credentials
 
     try:
-        payload = jwt.decode(
-            token,
-            JWT_SECRET,
-            algorithms=[JWT_ALGORITHM]
+        payload = verify_token(token)
+
+    except TokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
         )
 
-        if payload.get("sub") is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
+    if payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
 
-        return payload
+    return payload
 
-    except JWTError:
+
+async def require_admin(current_user=Depends(get_current_user)):
+    """
+    Allows only tokens issued to users with the "admin" role.
+    """
+    if current_user.get("role") != "admin":
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
         )
+
+    return current_user
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Small in-process LRU with hit/miss counters.
+    Only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: OrderedDict = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        if key in self._items:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key]
+
+        self.misses += 1
+        return default
+
+    def put(self, key, value) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        return self._items.pop(key, default)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def values(self) -> list:
+        return list(self._items.values())
+
+    def items(self) -> list:
+        return list(self._items.items())
+
+    def __contains__(self, key) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._items),
+            "maxSize": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -6,3 +6,106 @@ load_dotenv()
 JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", 1440))
+# jose (python-jose, default) or pyjwt (optional `PyJWT` package, faster)
+JWT_BACKEND = os.getenv("JWT_BACKEND", "jose")
+# Verified token → claims cache; entries never outlive the token's exp
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", 10000))
+JWT_CACHE_TTL_SECONDS = int(os.getenv("JWT_CACHE_TTL_SECONDS", 300))
+
+# ---------- Inference executor ----------
+INFERENCE_MAX_WORKERS = int(os.getenv("INFERENCE_MAX_WORKERS", 2))
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", 16))
+INFERENCE_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_TIMEOUT_SECONDS", 30))
+INFERENCE_RETRY_AFTER_SECONDS = int(os.getenv("INFERENCE_RETRY_AFTER_SECONDS", 2))
+
+# ---------- Embedding micro-batching ----------
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", 64))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", 5))
+EMBEDDING_ENCODE_BATCH_SIZE = int(os.getenv("EMBEDDING_ENCODE_BATCH_SIZE", 32))
+
+# ---------- Embedding model & cache ----------
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", 2048))
+MODEL_PRELOAD_ON_STARTUP = os.getenv("MODEL_PRELOAD_ON_STARTUP", "true").lower() == "true"
+MODEL_WARMUP_BATCH_SIZE = int(os.getenv("MODEL_WARMUP_BATCH_SIZE", 8))
+
+# ---------- Chunked similarity ----------
+CHUNK_MAX_WORDS = int(os.getenv("CHUNK_MAX_WORDS", 150))
+CHUNK_OVERLAP_WORDS = int(os.getenv("CHUNK_OVERLAP_WORDS", 30))
+SIMILARITY_POOLING = os.getenv("SIMILARITY_POOLING", "max")  # max | mean | topk
+SIMILARITY_TOP_K = int(os.getenv("SIMILARITY_TOP_K", 5))
+
+# ---------- Vector index ----------
+VECTOR_INDEX_MAX_USERS = int(os.getenv("VECTOR_INDEX_MAX_USERS", 256))
+
+# ---------- Batch analysis ----------
+ANALYSIS_BATCH_MAX_PAIRS = int(os.getenv("ANALYSIS_BATCH_MAX_PAIRS", 100))
+
+# ---------- Analysis result cache ----------
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", 1024))
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+
+# ---------- Skill taxonomy ----------
+SKILL_TAXONOMY_SOURCE = os.getenv("SKILL_TAXONOMY_SOURCE", "file")  # file | mongodb
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skill_taxonomy.json")
+)
+SKILL_TAXONOMY_RELOAD_SECONDS = int(os.getenv("SKILL_TAXONOMY_RELOAD_SECONDS", 0))
+
+# ---------- PDF extraction ----------
+# Truncates extracted resume text to this many characters; 0 keeps all of it
+PDF_MAX_TEXT_CHARS = int(os.getenv("PDF_MAX_TEXT_CHARS", 0))
+# Process-parallel extraction only pays off on very long documents (IPC and
+# re-opening the PDF per worker cost more than a resume's pages); off by default
+PDF_PARALLEL_WORKERS = int(os.getenv("PDF_PARALLEL_WORKERS", 0))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 64))
+
+# ---------- Analysis write-behind ----------
+ANALYSIS_WRITE_BEHIND = os.getenv("ANALYSIS_WRITE_BEHIND", "true").lower() == "true"
+ANALYSIS_WRITE_BATCH_SIZE = int(os.getenv("ANALYSIS_WRITE_BATCH_SIZE", 100))
+ANALYSIS_WRITE_FLUSH_MS = float(os.getenv("ANALYSIS_WRITE_FLUSH_MS", 50))
+# Max buffered documents; beyond this, writes go straight to MongoDB
+ANALYSIS_WRITE_QUEUE_SIZE = int(os.getenv("ANALYSIS_WRITE_QUEUE_SIZE", 10000))
+ANALYSIS_WRITE_MAX_RETRIES = int(os.getenv("ANALYSIS_WRITE_MAX_RETRIES", 5))
+
+# ---------- MongoDB connection pool ----------
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "ai_resume_analyzer")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 100))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+# How long a request waits for a free pooled connection before failing
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+# Comma-separated, in preference order: zstd (needs `zstandard`), snappy (needs `python-snappy`), zlib
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+MONGO_PING_ON_STARTUP = os.getenv("MONGO_PING_ON_STARTUP", "true").lower() == "true"
+
+# ---------- MongoDB indexes ----------
+MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", "true").lower() == "true"
+# Diagnostic: explain() hot queries at startup, refuse to start on COLLSCAN / in-memory SORT
+MONGO_VERIFY_QUERY_PLANS = os.getenv("MONGO_VERIFY_QUERY_PLANS", "false").lower() == "true"
+
+# ---------- Password hashing ----------
+# bcrypt cost factor; hashes with a different cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_MAX_WORKERS = int(os.getenv("PASSWORD_HASH_MAX_WORKERS", 2))
+
+# ---------- Metrics ----------
+# Serve Prometheus metrics at GET /metrics (unauthenticated; restrict at the proxy)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# ---------- Analysis jobs ----------
+# Concurrent job runners inside each API worker; 0 leaves jobs to `python -m app.worker`
+ANALYSIS_JOB_WORKERS = int(os.getenv("ANALYSIS_JOB_WORKERS", 2))
+# Idle runners re-check the queue this often (jobs enqueued in-process wake them at once)
+ANALYSIS_JOB_POLL_MS = int(os.getenv("ANALYSIS_JOB_POLL_MS", 500))
+# A running job whose worker stops renewing its lease is picked up again
+ANALYSIS_JOB_LEASE_SECONDS = int(os.getenv("ANALYSIS_JOB_LEASE_SECONDS", 60))
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_JOB_MAX_ATTEMPTS", 3))
+# First retry delay after a transient failure (503/504, errors); doubles per attempt
+ANALYSIS_JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("ANALYSIS_JOB_RETRY_BACKOFF_SECONDS", 2))
+# Finished jobs (and their results) are removed by a TTL index after this long
+ANALYSIS_JOB_TTL_SECONDS = int(os.getenv("ANALYSIS_JOB_TTL_SECONDS", 86400))
+# Max lifetime of one GET /analysis/jobs/{id}/events stream
+ANALYSIS_JOB_EVENTS_TIMEOUT_SECONDS = int(os.getenv("ANALYSIS_JOB_EVENTS_TIMEOUT_SECONDS", 300))
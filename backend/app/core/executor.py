@@ -0,0 +1,110 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.core.config import (
+    INFERENCE_MAX_WORKERS,
+    INFERENCE_MAX_QUEUE,
+    INFERENCE_TIMEOUT_SECONDS,
+    INFERENCE_RETRY_AFTER_SECONDS
+)
+
+# =========================
+# INFERENCE EXECUTOR
+# =========================
+# CPU-bound steps (embedding, PDF extraction, ATS matching) run here
+# instead of on the event loop. A thread pool is used because torch and
+# PyMuPDF release the GIL and the model must be loaded only once.
+
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+# Jobs submitted but not yet finished (running + queued)
+_in_flight = 0
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=INFERENCE_MAX_WORKERS,
+                thread_name_prefix="inference"
+            )
+        return _executor
+
+
+def _release_slot(_future) -> None:
+    global _in_flight
+
+    with _lock:
+        _in_flight -= 1
+
+
+def _acquire_slot() -> bool:
+    global _in_flight
+
+    with _lock:
+        if _in_flight >= INFERENCE_MAX_WORKERS + INFERENCE_MAX_QUEUE:
+            return False
+        _in_flight += 1
+        return True
+
+
+async def run_in_inference_pool(
+    func,
+    *args,
+    timeout: float | None = INFERENCE_TIMEOUT_SECONDS,
+    **kwargs
+):
+    """
+    Runs a blocking function on the inference pool and awaits its result.
+    Raises 503 (with Retry-After) when the pool is saturated
+    and 504 when the call exceeds its timeout.
+    """
+    if not _acquire_slot():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis capacity exhausted, please retry shortly",
+            headers={"Retry-After": str(INFERENCE_RETRY_AFTER_SECONDS)}
+        )
+
+    try:
+        future = _get_executor().submit(functools.partial(func, *args, **kwargs))
+    except BaseException:
+        _release_slot(None)
+        raise
+
+    # The slot is freed only when the worker is actually done, so a timed-out
+    # job that is still running keeps counting against the queue depth.
+    future.add_done_callback(_release_slot)
+
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Analysis step timed out"
+        )
+
+
+def get_inference_pool_stats() -> dict:
+    return {
+        "maxWorkers": INFERENCE_MAX_WORKERS,
+        "maxQueue": INFERENCE_MAX_QUEUE,
+        "inFlight": _in_flight,
+    }
+
+
+def shutdown_inference_pool() -> None:
+    global _executor
+
+    with _lock:
+        executor, _executor = _executor, None
+
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,22 @@
+import hashlib
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapses whitespace so layout-only differences hash the same.
+    """
+    return " ".join(text.split())
+
+
+def content_hash(text: str) -> str:
+    """
+    SHA-256 hex digest of the normalized text.
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def bytes_hash(data: bytes) -> str:
+    """
+    SHA-256 hex digest of raw bytes (e.g. an uploaded file).
+    """
+    return hashlib.sha256(data).hexdigest()
@@ -1,21 +1,80 @@
 from datetime import datetime, timedelta
 from jose import jwt
+from jose import JWTError
 from app.core.config import (
     JWT_SECRET,
     JWT_ALGORITHM,
-    JWT_EXPIRE_MINUTES
+    JWT_EXPIRE_MINUTES,
+    JWT_BACKEND
 )
 
+
+class TokenError(Exception):
+    """
+    Raised for any invalid, expired or undecodable token,
+    whichever backend verified it.
+    """
+
+
 def create_access_token(data: dict) -> str:
     """
     Creates a signed JWT access token with expiry.
     """
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=JWT_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    issued_at = datetime.utcnow()
+    expire = issued_at + timedelta(minutes=JWT_EXPIRE_MINUTES)
+    to_encode.update({"iat": issued_at, "exp": expire})
 
     return jwt.encode(
         to_encode,
         JWT_SECRET,
         algorithm=JWT_ALGORITHM
     )
+
+
+# =========================
+# DECODING BACKENDS
+# =========================
+
+def _decode_with_jose(token: str) -> dict:
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except JWTError as exc:
+        raise TokenError(str(exc)) from exc
+
+
+def _load_pyjwt_decoder():
+    # Optional dependency, imported only when selected
+    try:
+        import jwt as pyjwt
+    except ImportError as exc:
+        raise RuntimeError(
+            "JWT_BACKEND=pyjwt requires the PyJWT package (pip install PyJWT)"
+        ) from exc
+
+    def _decode_with_pyjwt(token: str) -> dict:
+        try:
+            return pyjwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        except pyjwt.PyJWTError as exc:
+            raise TokenError(str(exc)) from exc
+
+    return _decode_with_pyjwt
+
+
+_BACKENDS = {
+    "jose": lambda: _decode_with_jose,
+    "pyjwt": _load_pyjwt_decoder,
+}
+
+if JWT_BACKEND not in _BACKENDS:
+    raise RuntimeError(f"Unknown JWT_BACKEND {JWT_BACKEND!r}; use one of {sorted(_BACKENDS)}")
+
+_decode = _BACKENDS[JWT_BACKEND]()
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verifies signature and expiry and returns the claims.
+    Raises TokenError for anything that is not a valid token.
+    """
+    return _decode(token)
@@ -0,0 +1,286 @@
+import bisect
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# METRIC TYPES
+# =========================
+# Minimal Prometheus-compatible counters and histograms. Observations
+# come from the event loop, inference/password worker threads and
+# PyMongo's monitoring threads, so every update takes the metric lock.
+
+# Seconds; covers sub-millisecond cache hits up to slow cold encodes
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] += amount
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+# =========================
+# REGISTRY
+# =========================
+
+_registry: dict[str, Counter | Histogram] = {}
+
+
+def _register(metric):
+    if metric.name in _registry:
+        raise ValueError(f"Metric {metric.name} is already registered")
+    _registry[metric.name] = metric
+    return metric
+
+
+def counter(name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+    return _register(Counter(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: tuple = (),
+    buckets: tuple = LATENCY_BUCKETS
+) -> Histogram:
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def render_metrics() -> str:
+    """
+    All registered metrics in the Prometheus text exposition format.
+    """
+    lines = []
+    for metric in _registry.values():
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# =========================
+# APPLICATION METRICS
+# =========================
+
+http_requests = counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ("method", "route", "status")
+)
+http_request_duration = histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route")
+)
+
+pipeline_stage_duration = histogram(
+    "pipeline_stage_duration_seconds",
+    "Time spent in each named stage of a request pipeline.",
+    ("pipeline", "stage")
+)
+
+db_command_duration = histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency as reported by the driver.",
+    ("command", "collection", "outcome")
+)
+
+model_encode_duration = histogram(
+    "model_encode_duration_seconds",
+    "Wall time of one embedding model encode call."
+)
+model_encode_batch_size = histogram(
+    "model_encode_batch_size",
+    "Texts per embedding model encode call.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+model_encode_words = histogram(
+    "model_encode_input_words",
+    "Whitespace-separated words per encode call (proxy for model tokens).",
+    buckets=(50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+)
+
+
+def observe_encode(texts: list[str], seconds: float) -> None:
+    model_encode_duration.observe(seconds)
+    model_encode_batch_size.observe(len(texts))
+    model_encode_words.observe(sum(len(text.split()) for text in texts))
+
+
+# =========================
+# MONGODB COMMAND LISTENER
+# =========================
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """
+    Records every MongoDB command's driver-measured duration.
+    The collection is only present on the started event, so it is
+    remembered by request id until the command completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections: dict[tuple, str] = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = ""
+
+        with self._lock:
+            self._collections[(event.connection_id, event.request_id)] = collection
+
+    def _finish(self, event, outcome: str) -> None:
+        with self._lock:
+            collection = self._collections.pop((event.connection_id, event.request_id), "")
+
+        db_command_duration.observe(
+            event.duration_micros / 1e6,
+            command=event.command_name,
+            collection=collection,
+            outcome=outcome
+        )
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+
+command_metrics = CommandMetricsListener()
+
+
+# =========================
+# HTTP MIDDLEWARE
+# =========================
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task hop) that times
+    every HTTP request. Requests are labelled by route template, e.g.
+    /analysis/{analysisId}, so ids never become label values.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route on the scope
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=route_path
+            )
+            http_requests.inc(
+                method=scope["method"],
+                route=route_path,
+                status=str(status_code)
+            )
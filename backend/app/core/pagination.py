@@ -0,0 +1,44 @@
+import base64
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi import HTTPException, status
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def encode_cursor(created_at: datetime, doc_id: ObjectId) -> str:
+    """
+    Opaque keyset cursor for (createdAt, _id). MongoDB stores datetimes
+    with millisecond precision, so milliseconds round-trip exactly.
+    """
+    millis = (created_at - _EPOCH) // timedelta(milliseconds=1)
+    raw = f"{millis}:{doc_id}".encode("ascii")
+
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        millis, doc_id = base64.urlsafe_b64decode(padded).decode("ascii").split(":")
+
+        return _EPOCH + timedelta(milliseconds=int(millis)), ObjectId(doc_id)
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_filter(created_at: datetime, doc_id: ObjectId) -> dict:
+    """
+    Query clause for documents strictly after the cursor in
+    (createdAt desc, _id desc) order. A range on createdAt plus a tie
+    filter keeps it a single bounded scan of {userId, createdAt, _id}.
+    """
+    return {
+        "createdAt": {"$lte": created_at},
+        "$nor": [{"createdAt": created_at, "_id": {"$gte": doc_id}}],
+    }
@@ -0,0 +1,48 @@
+import json
+
+# =========================
+# REQUEST BODY LIMITS
+# =========================
+# Starlette parses (and spools) a multipart body before the route handler
+# runs, so an oversized upload is only noticed after all of it has been
+# received. This middleware rejects it up front from Content-Length.
+# Chunked requests carry no length; the handler still checks their size
+# once the body is in.
+
+# Boundaries, part headers and small form fields around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class BodySizeLimitMiddleware:
+    """
+    Pure ASGI middleware: answers 400 without reading the body when a
+    request to one of the limited paths declares a larger Content-Length.
+    limits maps path -> (max body bytes, error detail).
+    """
+
+    def __init__(self, app, limits: dict[str, tuple[int, str]]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+
+        if limit is not None:
+            max_bytes, detail = limit
+            content_length = dict(scope["headers"]).get(b"content-length")
+
+            if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                body = json.dumps({"detail": detail}).encode("utf-8")
+                await send({
+                    "type": "http.response.start",
+                    "status": 400,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode("ascii")),
+                        (b"connection", b"close"),
+                    ],
+                })
+                await send({"type": "http.response.body", "body": body})
+                return
+
+        await self.app(scope, receive, send)
@@ -1,6 +1,21 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import BCRYPT_ROUNDS, PASSWORD_HASH_MAX_WORKERS
+
+# min = max = default: any stored hash with a different cost
+# is flagged by verify_and_update and re-hashed on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
 
 
 def hash_password(password: str) -> str:
@@ -9,3 +24,66 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+# =========================
+# PASSWORD EXECUTOR
+# =========================
+# bcrypt costs 100ms+ of CPU per call by design. It runs on its own small
+# pool (bcrypt releases the GIL) so a burst of logins neither blocks the
+# event loop nor queues behind embedding jobs in the inference pool. The
+# semaphore keeps excess requests waiting on the loop, not in the pool.
+# Both are created on first use and reset on shutdown, so the app can be
+# started again in the same process (tests, reload) on a new event loop.
+
+_executor: ThreadPoolExecutor | None = None
+_slots: asyncio.Semaphore | None = None
+_lock = threading.Lock()
+
+
+def _get_password_pool() -> tuple[ThreadPoolExecutor, asyncio.Semaphore]:
+    global _executor, _slots
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=PASSWORD_HASH_MAX_WORKERS,
+                thread_name_prefix="password"
+            )
+            _slots = asyncio.Semaphore(PASSWORD_HASH_MAX_WORKERS)
+        return _executor, _slots
+
+
+async def _run_in_password_pool(func, *args):
+    executor, slots = _get_password_pool()
+
+    async with slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args))
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_password_pool(hash_password, password)
+
+
+async def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verifies off the event loop. Returns (valid, new_hash); new_hash is
+    set when the stored hash uses an outdated scheme or cost factor.
+    """
+    return await _run_in_password_pool(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+def shutdown_password_pool() -> None:
+    global _executor, _slots
+
+    with _lock:
+        executor, _executor, _slots = _executor, None, None
+
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,58 @@
+import logging
+import time
+from contextlib import contextmanager
+
+from app.core.metrics import pipeline_stage_duration
+
+
+class StageTimer:
+    """
+    Wall-clock breakdown of a request by named stage.
+    Repeated stages accumulate; the result is reported as a
+    Server-Timing header so browsers and curl -v show it directly.
+    Each stage is also recorded in the pipeline stage histogram
+    (see /metrics) under the timer's pipeline name.
+    """
+
+    def __init__(self, pipeline: str):
+        self.pipeline = pipeline
+        self.stages: dict[str, float] = {}
+        # Extra key=value context for the timing log (e.g. cache hit)
+        self.tags: dict = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed * 1000
+            pipeline_stage_duration.observe(elapsed, pipeline=self.pipeline, stage=name)
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def server_timing(self) -> str:
+        entries = [f"{name};dur={ms:.2f}" for name, ms in self.stages.items()]
+        entries.append(f"total;dur={self.total_ms():.2f}")
+        return ", ".join(entries)
+
+    def log(self, logger: logging.Logger, **fields) -> None:
+        """
+        One structured timing line per request: key=value pairs in the
+        message, and the same data under `timing` for JSON formatters.
+        """
+        timing = {
+            "pipeline": self.pipeline,
+            **self.tags,
+            **fields,
+            **{f"{name}_ms": round(ms, 2) for name, ms in self.stages.items()},
+            "total_ms": round(self.total_ms(), 2),
+        }
+        logger.info(
+            "timing %s",
+            " ".join(f"{key}={value}" for key, value in timing.items()),
+            extra={"timing": timing}
+        )
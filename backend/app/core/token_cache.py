@@ -0,0 +1,128 @@
+import heapq
+import time
+
+from app.core.cache import LRUCache
+from app.core.config import JWT_CACHE_SIZE, JWT_CACHE_TTL_SECONDS, JWT_EXPIRE_MINUTES
+from app.core.jwt import TokenError, decode_access_token
+
+# =========================
+# VERIFIED TOKEN CACHE
+# =========================
+# The same few tokens are presented over and over (the frontend polls the
+# list endpoints), so verified claims are cached per token. An entry lives
+# until the token's exp or JWT_CACHE_TTL_SECONDS, whichever comes first.
+# Only touched from the event loop (async dependency), so no locking.
+
+_claims = LRUCache(JWT_CACHE_SIZE)
+
+# Revocation: explicit tokens until they expire, and per-user cut-offs
+# (tokens issued before the cut-off are rejected). In-process: with
+# several workers, call the hooks on each worker. Never size-bounded:
+# entries only go once the token they reject has expired anyway.
+_revoked_tokens: dict[str, float] = {}
+# (exp, token), oldest first, so expired revocations are pruned cheaply
+_revoked_expiry: list[tuple[float, str]] = []
+_revoked_before: dict[str, float] = {}
+
+# Once every token issued before a cut-off has expired, the cut-off can go
+_CUT_OFF_LIFETIME_SECONDS = JWT_EXPIRE_MINUTES * 60 + 1
+
+
+def _prune_revoked_tokens(now: float) -> None:
+    while _revoked_expiry and _revoked_expiry[0][0] <= now:
+        _, token = heapq.heappop(_revoked_expiry)
+        _revoked_tokens.pop(token, None)
+
+
+def _prune_cut_offs(now: float) -> None:
+    for user_id in [
+        user_id for user_id, cut_off in _revoked_before.items()
+        if cut_off + _CUT_OFF_LIFETIME_SECONDS < now
+    ]:
+        del _revoked_before[user_id]
+
+
+def _is_revoked(token: str, claims: dict) -> bool:
+    revoked_until = _revoked_tokens.get(token)
+    if revoked_until is not None and revoked_until > time.time():
+        return True
+
+    cut_off = _revoked_before.get(claims.get("sub"))
+    # Tokens issued before iat was added are treated as issued at 0
+    return cut_off is not None and claims.get("iat", 0) < cut_off
+
+
+def verify_token(token: str) -> dict:
+    """
+    Returns the claims of a valid token, from cache when possible.
+    Raises TokenError if it is invalid, expired or revoked.
+    """
+    now = time.time()
+
+    entry = _claims.get(token)
+    if entry is not None:
+        expires_at, claims = entry
+        if expires_at > now:
+            return claims
+        _claims.pop(token)
+
+    claims = decode_access_token(token)
+
+    if _is_revoked(token, claims):
+        raise TokenError("Token has been revoked")
+
+    expires_at = min(claims.get("exp", now), now + JWT_CACHE_TTL_SECONDS)
+    if expires_at > now:
+        _claims.put(token, (expires_at, claims))
+
+    return claims
+
+
+def revoke_token(token: str) -> None:
+    """
+    Invalidation hook: rejects this token from now on (e.g. logout).
+    """
+    _claims.pop(token)
+
+    try:
+        expires_at = decode_access_token(token).get("exp", time.time())
+    except TokenError:
+        return
+
+    _prune_revoked_tokens(time.time())
+
+    if token not in _revoked_tokens:
+        _revoked_tokens[token] = expires_at
+        heapq.heappush(_revoked_expiry, (expires_at, token))
+
+
+def revoke_user_tokens(user_id: str) -> None:
+    """
+    Invalidation hook: rejects every token issued to the user so far
+    (e.g. password change, role change, account disabled).
+    """
+    now = time.time()
+    _prune_cut_offs(now)
+
+    # iat has one-second resolution: tokens issued within the same
+    # second as the revocation stay valid, so a fresh login works
+    _revoked_before[user_id] = int(now)
+
+    for token in [token for token, (_, claims) in _claims.items() if claims.get("sub") == user_id]:
+        _claims.pop(token)
+
+
+def clear_token_cache() -> None:
+    _claims.clear()
+
+
+def get_token_cache_stats() -> dict:
+    now = time.time()
+    _prune_revoked_tokens(now)
+    _prune_cut_offs(now)
+
+    return {
+        **_claims.stats(),
+        "revokedTokens": len(_revoked_tokens),
+        "revokedUsers": len(_revoked_before),
+    }
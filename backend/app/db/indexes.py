@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import sys
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.core.config import (
+    ANALYSIS_CACHE_TTL_SECONDS,
+    ANALYSIS_JOB_MAX_ATTEMPTS,
+    ANALYSIS_JOB_TTL_SECONDS
+)
+from app.core.pagination import keyset_filter
+from app.db.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+db = get_database()
+
+
+# =========================
+# DECLARED INDEXES
+# =========================
+# Every hot query must be served by one of these. Lookups by `_id`
+# (embeddings, resume_blobs, analysis_cache, fetch by id + userId)
+# use the built-in _id index.
+
+# Per-user lists sorted newest first; _id breaks createdAt ties
+USER_CREATED_INDEX = [("userId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]
+
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "resumes": [
+        IndexModel(USER_CREATED_INDEX, name="user_created"),
+    ],
+    "job_descriptions": [
+        IndexModel(USER_CREATED_INDEX, name="user_created"),
+    ],
+    "analyses": [
+        IndexModel(USER_CREATED_INDEX, name="user_created"),
+        IndexModel(
+            [
+                ("userId", ASCENDING),
+                ("resumeId", ASCENDING),
+                ("jobDescriptionId", ASCENDING),
+                ("resultKey", ASCENDING),
+            ],
+            name="user_pair_result"
+        ),
+    ],
+    "analysis_cache": [
+        IndexModel(
+            [("createdAt", ASCENDING)],
+            name="created_ttl",
+            expireAfterSeconds=ANALYSIS_CACHE_TTL_SECONDS
+        ),
+    ],
+    "analysis_jobs": [
+        # Claim: oldest queued job, or a running one with an expired lease
+        IndexModel([("status", ASCENDING), ("createdAt", ASCENDING)], name="status_created"),
+        # Only finished jobs have finishedAt, so only they expire
+        IndexModel(
+            [("finishedAt", ASCENDING)],
+            name="finished_ttl",
+            expireAfterSeconds=ANALYSIS_JOB_TTL_SECONDS
+        ),
+    ],
+    "skill_taxonomies": [
+        IndexModel([("active", ASCENDING), ("createdAt", DESCENDING)], name="active_created"),
+    ],
+}
+
+
+async def ensure_indexes() -> None:
+    """
+    Creates the declared indexes. Safe to run on every startup:
+    MongoDB skips indexes that already exist with the same spec.
+    A conflicting index (same name, different options) or a unique
+    index blocked by existing duplicates is logged, not fatal.
+    """
+    for collection, models in INDEXES.items():
+        try:
+            await db[collection].create_indexes(models)
+        except OperationFailure:
+            logger.error("Index creation failed on %s", collection, exc_info=True)
+
+
+# =========================
+# QUERY PLAN VERIFICATION
+# =========================
+
+def _hot_queries() -> dict:
+    """
+    Cursors shaped like the app's hot queries, keyed by a readable name.
+    Placeholder ids are fine: the plan depends on the query shape only.
+    """
+    user_id = ObjectId()
+    doc_id = ObjectId()
+    after_cursor = keyset_filter(datetime.utcnow(), doc_id)
+
+    return {
+        "list_user_resumes": db.resumes.find({"userId": user_id}).sort("createdAt", -1),
+        "list_user_job_descriptions": db.job_descriptions.find({"userId": user_id}).sort("createdAt", -1),
+        "get_analysis_history": (
+            db.analyses.find({"userId": user_id})
+            .sort([("createdAt", -1), ("_id", -1)])
+            .limit(11)
+        ),
+        "get_analysis_history_cursor": (
+            db.analyses.find({"userId": user_id, **after_cursor})
+            .sort([("createdAt", -1), ("_id", -1)])
+            .limit(11)
+        ),
+        "fetch_resume": db.resumes.find({"_id": doc_id, "userId": user_id}).limit(1),
+        "fetch_job_description": db.job_descriptions.find({"_id": doc_id, "userId": user_id}).limit(1),
+        "find_analysis_by_result_key": db.analyses.find({
+            "userId": user_id,
+            "resumeId": doc_id,
+            "jobDescriptionId": doc_id,
+            "resultKey": "",
+        }).limit(1),
+        "find_user_by_email": db.users.find({"email": ""}).limit(1),
+        "claim_analysis_job": db.analysis_jobs.find({
+            "$or": [
+                {"status": "queued", "availableAt": {"$lte": datetime.utcnow()}},
+                {"status": "running", "leaseExpiresAt": {"$lt": datetime.utcnow()}, "attempts": {"$lt": ANALYSIS_JOB_MAX_ATTEMPTS}},
+            ]
+        }).sort("createdAt", 1).limit(1),
+    }
+
+
+def _plan_stages(plan) -> list[str]:
+    """
+    Flattens an explain() plan tree into its stage names
+    (classic and slot-based engine layouts).
+    """
+    if isinstance(plan, list):
+        return [stage for child in plan for stage in _plan_stages(child)]
+
+    if not isinstance(plan, dict):
+        return []
+
+    stages = [plan["stage"]] if "stage" in plan else []
+
+    for key in ("queryPlan", "inputStage", "inputStages", "innerStage", "outerStage"):
+        if key in plan:
+            stages.extend(_plan_stages(plan[key]))
+
+    return stages
+
+
+async def verify_query_plans() -> dict[str, list[str]]:
+    """
+    Runs explain() on every hot query and raises RuntimeError if any
+    winning plan contains a COLLSCAN or an in-memory SORT.
+    Returns query name → plan stages.
+    """
+    plans = {}
+    problems = []
+
+    for name, cursor in _hot_queries().items():
+        explained = await cursor.explain()
+        stages = _plan_stages(explained["queryPlanner"]["winningPlan"])
+        plans[name] = stages
+
+        bad = sorted({stage for stage in stages if stage in ("COLLSCAN", "SORT")})
+        if bad:
+            problems.append(f"{name}: {', '.join(bad)} ({' <- '.join(stages)})")
+
+    if problems:
+        raise RuntimeError("Unindexed query plans:\n  " + "\n  ".join(problems))
+
+    return plans
+
+
+async def _main(verify: bool) -> None:
+    await ensure_indexes()
+
+    if verify:
+        for name, stages in (await verify_query_plans()).items():
+            print(f"{name}: {' <- '.join(stages)}")
+
+
+if __name__ == "__main__":
+    # python -m app.db.indexes [--verify]
+    asyncio.run(_main("--verify" in sys.argv))
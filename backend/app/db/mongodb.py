@@ -1,19 +1,226 @@
+import logging
+import threading
+from collections import defaultdict
+
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
 from dotenv import load_dotenv
 import os
 
+from app.core.config import (
+    MONGO_DB_NAME,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_COMPRESSORS,
+    MONGO_READ_PREFERENCE
+)
+from app.core.metrics import command_metrics
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Prefer Docker / cloud variable, fallback to local .env
 MONGO_URI = os.getenv("MONGODB_URI") or os.getenv("MONGO_URI")
 
 if not MONGO_URI:
     raise RuntimeError("MongoDB URI not set. Define MONGODB_URI or MONGO_URI.")
 
-DB_NAME = "ai_resume_analyzer"
+DB_NAME = MONGO_DB_NAME
+
+
+# =========================
+# POOL METRICS
+# =========================
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Tracks connection pool utilization per server from PyMongo's CMAP
+    events. Callbacks run on driver threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._servers = defaultdict(lambda: {
+            "open": 0,
+            "inUse": 0,
+            "waiting": 0,
+            "checkouts": 0,
+            "checkoutFailures": defaultdict(int),
+            "waitMsTotal": 0.0,
+            "waitMsMax": 0.0,
+        })
+
+    def _server(self, event) -> dict:
+        host, port = event.address
+        return self._servers[f"{host}:{port}"]
+
+    def _record_wait(self, server: dict, event) -> None:
+        # duration (seconds) is reported by PyMongo 4.7+
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            wait_ms = duration * 1000
+            server["waitMsTotal"] += wait_ms
+            server["waitMsMax"] = max(server["waitMsMax"], wait_ms)
+
+    def pool_created(self, event):
+        with self._lock:
+            self._server(event)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._servers.pop("%s:%s" % event.address, None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._server(event)["open"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            server = self._server(event)
+            server["open"] = max(server["open"] - 1, 0)
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self._server(event)["waiting"] += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            server = self._server(event)
+            server["waiting"] = max(server["waiting"] - 1, 0)
+            server["checkoutFailures"][str(event.reason)] += 1
+            self._record_wait(server, event)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            server = self._server(event)
+            server["waiting"] = max(server["waiting"] - 1, 0)
+            server["inUse"] += 1
+            server["checkouts"] += 1
+            self._record_wait(server, event)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            server = self._server(event)
+            server["inUse"] = max(server["inUse"] - 1, 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            servers = {}
+            for address, server in self._servers.items():
+                servers[address] = {
+                    "open": server["open"],
+                    "inUse": server["inUse"],
+                    "waiting": server["waiting"],
+                    "utilization": round(server["inUse"] / MONGO_MAX_POOL_SIZE, 3),
+                    "checkouts": server["checkouts"],
+                    "checkoutFailures": dict(server["checkoutFailures"]),
+                    "avgWaitMs": round(server["waitMsTotal"] / max(server["checkouts"], 1), 3),
+                    "maxWaitMs": round(server["waitMsMax"], 3),
+                }
+            return servers
+
+
+pool_metrics = PoolMetricsListener()
+
+
+# =========================
+# CLIENT LIFECYCLE
+# =========================
+
+_client = None
+_database = None
+
+
+def _create_client() -> AsyncIOMotorClient:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "readPreference": MONGO_READ_PREFERENCE,
+        "event_listeners": [pool_metrics, command_metrics],
+    }
+
+    # PyMongo skips (with a warning) compressors whose package is missing
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+
+    return AsyncIOMotorClient(MONGO_URI, **options)
+
+
+def connect_to_database(client=None):
+    """
+    Creates the client (or adopts an injected one, e.g. a test double)
+    and returns the application database. Called from the app lifespan;
+    a no-op if already connected.
+    """
+    global _client, _database
+
+    if _client is None:
+        _client = client if client is not None else _create_client()
+        _database = _client[DB_NAME]
+
+    return _database
+
+
+async def ping_database() -> None:
+    await _current_database().command("ping")
+
+
+def close_database() -> None:
+    global _client, _database
+
+    client, _client, _database = _client, None, None
+
+    if client is not None:
+        client.close()
+
+
+def _current_database():
+    # Scripts and CLIs that never run the lifespan connect on first use
+    return _database if _database is not None else connect_to_database()
+
+
+class _DatabaseProxy:
+    """
+    Stable handle that services capture at import (`db = get_database()`).
+    Every access resolves to the live database, so the client can be
+    created and closed by the app lifespan.
+    """
+
+    def __getattr__(self, name):
+        return getattr(_current_database(), name)
+
+    def __getitem__(self, name):
+        return _current_database()[name]
+
+
+_proxy = _DatabaseProxy()
 
-client = AsyncIOMotorClient(MONGO_URI)
-database = client[DB_NAME]
 
 def get_database():
-    return database
+    return _proxy
+
+
+def get_pool_stats() -> dict:
+    return {
+        "connected": _client is not None,
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "waitQueueTimeoutMs": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "compressors": MONGO_COMPRESSORS or None,
+        "readPreference": MONGO_READ_PREFERENCE,
+        "servers": pool_metrics.snapshot(),
+    }
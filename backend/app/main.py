@@ -1,18 +1,119 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from dotenv import load_dotenv
 import os
 
+from app.core.config import (
+    ANALYSIS_JOB_WORKERS,
+    ANALYSIS_WRITE_BEHIND,
+    METRICS_ENABLED,
+    MODEL_PRELOAD_ON_STARTUP,
+    MONGO_ENSURE_INDEXES,
+    MONGO_PING_ON_STARTUP,
+    MONGO_VERIFY_QUERY_PLANS,
+    PDF_PARALLEL_WORKERS,
+    SKILL_TAXONOMY_SOURCE,
+    SKILL_TAXONOMY_RELOAD_SECONDS
+)
+from app.core.executor import shutdown_inference_pool
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.request_limits import BodySizeLimitMiddleware, MULTIPART_OVERHEAD_BYTES
+from app.core.security import shutdown_password_pool
+from app.db.indexes import ensure_indexes, verify_query_plans
+from app.db.mongodb import connect_to_database, ping_database, close_database
+from app.services.analysis_job_service import analysis_job_worker
+from app.services.analysis_write_service import analysis_writer
+from app.services.model_registry import get_model_status, preload_model
+from app.services.pdf_service import shutdown_pdf_pool, start_pdf_pool
+from app.services.skill_taxonomy_service import reload_taxonomy, watch_taxonomy
+
 from app.routes import auth
-from app.routes.resume import router as resume_router
+from app.routes.resume import MAX_FILE_SIZE, router as resume_router
 from app.routes.jd import router as jd_router
 from app.routes.analysis import router as analysis_router
+from app.routes.admin import router as admin_router
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ---------- Startup ----------
+    # One pooled client per worker, created on the serving event loop.
+    # Fail fast if MongoDB is unreachable instead of on the first request.
+    connect_to_database()
+    if MONGO_PING_ON_STARTUP:
+        await ping_database()
+
+    # Load the model in the background so the worker accepts
+    # requests (and passes /health) while it is still loading.
+    background_tasks = []
+    if MODEL_PRELOAD_ON_STARTUP:
+        background_tasks.append(asyncio.create_task(preload_model()))
+
+    # The bundled taxonomy file is compiled at import; a MongoDB-hosted
+    # taxonomy replaces it before the first request.
+    if SKILL_TAXONOMY_SOURCE == "mongodb":
+        await reload_taxonomy()
+
+    # Spawn the PDF worker processes now, not on the first large upload
+    if PDF_PARALLEL_WORKERS > 1:
+        background_tasks.append(asyncio.create_task(asyncio.to_thread(start_pdf_pool)))
+
+    if SKILL_TAXONOMY_RELOAD_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(watch_taxonomy()))
+
+    # Idempotent: existing indexes are left untouched
+    if MONGO_ENSURE_INDEXES:
+        await ensure_indexes()
+
+    if MONGO_VERIFY_QUERY_PLANS:
+        await verify_query_plans()
+
+    if ANALYSIS_WRITE_BEHIND:
+        analysis_writer.start()
+
+    # Queued analyses (/analysis/run?async=true) also run here unless
+    # ANALYSIS_JOB_WORKERS=0 leaves them to `python -m app.worker`
+    analysis_job_worker.start(ANALYSIS_JOB_WORKERS)
+
+    yield
+
+    # ---------- Shutdown ----------
+    for task in background_tasks:
+        if not task.done():
+            task.cancel()
+
+    # Running jobs finish, then buffered analyses are flushed,
+    # all while the client is still open
+    await analysis_job_worker.stop()
+    await analysis_writer.drain()
+
+    shutdown_inference_pool()
+    shutdown_password_pool()
+    shutdown_pdf_pool()
+    close_database()
+
+
 app = FastAPI(
     title=os.getenv("APP_NAME", "AI Resume Analyzer"),
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
+)
+
+# ---------- Upload size ----------
+# Added before CORS so the 400 still carries the CORS headers
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        "/resumes/upload": (
+            MAX_FILE_SIZE + MULTIPART_OVERHEAD_BYTES,
+            f"File size exceeds {MAX_FILE_SIZE // (1024 * 1024)}MB limit"
+        ),
+    }
 )
 
 # ---------- CORS (REQUIRED FOR FRONTEND) ----------
@@ -30,11 +131,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---------- Request metrics ----------
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # ---------- Routes ----------
 app.include_router(auth.router)
 app.include_router(resume_router)
 app.include_router(jd_router)
 app.include_router(analysis_router)
+app.include_router(admin_router)
 
 # ---------- Health Check ----------
 @app.get("/health")
@@ -43,3 +149,37 @@ async def health_check():
         "status": "ok",
         "environment": os.getenv("ENV", "unknown")
     }
+
+
+# ---------- Readiness Probe ----------
+@app.get("/ready")
+async def readiness_check():
+    """
+    Reports ready once the embedding model is loaded.
+    With preloading disabled the model loads on first use,
+    so the worker is considered ready immediately.
+    """
+    model_status = get_model_status()
+    ready = model_status["loaded"] or not MODEL_PRELOAD_ON_STARTUP
+
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "loading",
+            "model": model_status
+        }
+    )
+
+
+# ---------- Prometheus Metrics ----------
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """
+        Per-route, per-stage, MongoDB command and model encode
+        histograms for this worker, in Prometheus text format.
+        """
+        return PlainTextResponse(
+            render_metrics(),
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
@@ -0,0 +1,32 @@
+from datetime import datetime
+from bson import ObjectId
+
+
+def create_analysis_job_document(
+    user_id: str,
+    job_type: str,
+    payload: dict
+) -> dict:
+    """
+    Creates a MongoDB-ready analysis job document in the queued state.
+    """
+    now = datetime.utcnow()
+
+    return {
+        "_id": ObjectId(),
+        "userId": ObjectId(user_id),
+        "type": job_type,
+        "payload": payload,
+        "status": "queued",
+        "attempts": 0,
+        "createdAt": now,
+        "updatedAt": now,
+        # Not claimed before this time (pushed back when a retry backs off)
+        "availableAt": now,
+        "startedAt": None,
+        "finishedAt": None,
+        "leaseExpiresAt": None,
+        "workerId": None,
+        "result": None,
+        "error": None,
+    }
@@ -19,12 +19,16 @@ def create_analysis_document(
 
     strengths: list[str],
     improvements: list[str],
+
+    result_key: str | None = None,
 ) -> dict:
     """
     Creates a MongoDB-ready analysis document.
     """
 
     return {
+        # Generated client-side so the id is known before the write lands
+        "_id": ObjectId(),
         "userId": ObjectId(user_id),
         "resumeId": ObjectId(resume_id),
         "jobDescriptionId": ObjectId(job_description_id),
@@ -42,5 +46,8 @@ def create_analysis_document(
         "strengths": strengths,
         "improvements": improvements,
 
+        # Analysis cache key (content hashes + model + taxonomy version)
+        "resultKey": result_key,
+
         "createdAt": datetime.utcnow(),
     }
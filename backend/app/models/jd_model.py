@@ -1,12 +1,14 @@
 from datetime import datetime
 from bson import ObjectId
+from app.core.hashing import content_hash
 
 
 def create_jd_document(
     user_id: str,
     jd_text: str,
     jd_title: str | None = None,
-    company_name: str | None = None
+    company_name: str | None = None,
+    skill_profile: dict | None = None
 ) -> dict:
     """
     Creates a MongoDB-ready Job Description document.
@@ -14,6 +16,8 @@ def create_jd_document(
     return {
         "userId": ObjectId(user_id),
         "jdText": jd_text,
+        "textHash": content_hash(jd_text),
+        "skillProfile": skill_profile,
         "jdTitle": jd_title,
         "companyName": company_name,
         "createdAt": datetime.utcnow(),
@@ -6,16 +6,21 @@ def create_resume_document(
     user_id: str,
     resume_title: str | None,
     original_filename: str,
-    extracted_text: str
+    content_hash: str,
+    text_hash: str,
+    skill_profile: dict | None = None
 ) -> dict:
     """
     Creates a MongoDB-ready resume document.
+    The extracted text lives in `resume_blobs`, linked by contentHash.
     """
     return {
         "userId": ObjectId(user_id),
         "resumeTitle": resume_title,
         "originalFileName": original_filename,
-        "extractedText": extracted_text,
+        "contentHash": content_hash,
+        "textHash": text_hash,
+        "skillProfile": skill_profile,
         "createdAt": datetime.utcnow(),
         "updatedAt": datetime.utcnow(),
     }
@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, status
+from app.core.auth_dependency import require_admin
+from app.core.config import MODEL_WARMUP_BATCH_SIZE
+from app.core.executor import get_inference_pool_stats
+from app.core.token_cache import get_token_cache_stats
+from app.db.mongodb import get_pool_stats
+from app.services.analysis_cache_service import get_analysis_cache_stats
+from app.services.analysis_job_service import get_analysis_job_stats
+from app.services.analysis_write_service import get_analysis_writer_stats
+from app.services.embedding_cache_service import get_embedding_cache_stats
+from app.services.model_registry import warmup_model
+from app.services.similarity_service import get_batcher_stats
+from app.services.vector_index_service import get_vector_index_stats
+from app.services.skill_taxonomy_service import get_taxonomy, reload_taxonomy
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"]
+)
+
+
+@router.post(
+    "/warmup",
+    status_code=status.HTTP_200_OK
+)
+async def warmup(
+    batch_size: int = MODEL_WARMUP_BATCH_SIZE,
+    current_user=Depends(require_admin)
+):
+    """
+    Preloads the embedding model and runs a dummy batch through it.
+    """
+    batch_size = min(max(batch_size, 1), 256)
+
+    return {
+        "message": "Model warmed up",
+        "warmup": await warmup_model(batch_size)
+    }
+
+
+@router.get(
+    "/taxonomy",
+    status_code=status.HTTP_200_OK
+)
+async def get_taxonomy_route(
+    current_user=Depends(require_admin)
+):
+    return {
+        "taxonomy": get_taxonomy().summary()
+    }
+
+
+@router.post(
+    "/taxonomy/reload",
+    status_code=status.HTTP_200_OK
+)
+async def reload_taxonomy_route(
+    current_user=Depends(require_admin)
+):
+    """
+    Reloads the skill taxonomy from its source and swaps it in
+    without a restart (this worker only; others follow on their
+    next SKILL_TAXONOMY_RELOAD_SECONDS check).
+    """
+    return {
+        "taxonomy": await reload_taxonomy()
+    }
+
+
+@router.get(
+    "/stats",
+    status_code=status.HTTP_200_OK
+)
+async def get_stats(
+    current_user=Depends(require_admin)
+):
+    """
+    Cache hit/miss counters and pool/batcher state for this worker.
+    """
+    return {
+        "analysisCache": get_analysis_cache_stats(),
+        "analysisWriter": get_analysis_writer_stats(),
+        "analysisJobs": await get_analysis_job_stats(),
+        "embeddingCache": get_embedding_cache_stats(),
+        "vectorIndex": get_vector_index_stats(),
+        "encodeBatcher": get_batcher_stats(),
+        "inferencePool": get_inference_pool_stats(),
+        "mongoPool": get_pool_stats(),
+        "tokenCache": get_token_cache_stats(),
+    }
@@ -1,31 +1,54 @@
-from fastapi import APIRouter, Depends, status
+import json
+import logging
+import time
+
+from fastapi import APIRouter, Depends, Query, Response, status, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.core.auth_dependency import get_current_user
+from app.core.config import (
+    ANALYSIS_BATCH_MAX_PAIRS,
+    ANALYSIS_JOB_EVENTS_TIMEOUT_SECONDS,
+    ANALYSIS_JOB_POLL_MS
+)
+from app.core.timing import StageTimer
 
 from app.schemas.analysis import (
     AnalysisRunRequest,
-    AnalysisRunResponse
+    AnalysisRunResponse,
+    AnalysisBatchRequest,
+    AnalysisBatchResponse,
+    AnalysisJobAcceptedResponse,
+    AnalysisJobResponse
 )
 from app.schemas.analysis_history import (
     AnalysisHistoryResponse,
     AnalysisDetailResponse
 )
+from app.schemas.ranking import RankingResponse
 
-from app.services.analysis_service import (
-    fetch_resume_and_jd,
-    run_ats_keyword_match
+from app.services.analysis_run_service import run_analysis_pipeline
+from app.services.analysis_job_service import (
+    enqueue_analysis_job,
+    format_job,
+    get_job,
+    watch_job
+)
+from app.services.analysis_batch_service import (
+    count_pairs,
+    expand_pairs,
+    run_batch_analysis
 )
-from app.services.analysis_persistence_service import save_analysis_result
 from app.services.analysis_history_service import (
     get_analysis_history,
     get_analysis_by_id
 )
-from app.services.similarity_service import compute_similarity_score
-from app.services.scoring_service import (
-    compute_final_score,
-    get_fit_label
-)
-from app.services.analysis_service import run_ats_keyword_match
+from app.services.vector_index_service import rank_documents
+
 
+logger = logging.getLogger(__name__)
+
+# Comment line sent on idle event streams so proxies keep them open
+SSE_KEEPALIVE_SECONDS = 15
 
 router = APIRouter(
     prefix="/analysis",
@@ -33,83 +56,181 @@ router = APIRouter(
 )
 
 
+def _job_accepted(job: dict) -> JSONResponse:
+    """
+    202 with where to follow the job (also in the Location header).
+    """
+    job_id = str(job["_id"])
+    status_url = f"{router.prefix}/jobs/{job_id}"
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": status_url},
+        content={
+            "message": "Analysis queued",
+            "jobId": job_id,
+            "status": job["status"],
+            "statusUrl": status_url,
+            "eventsUrl": f"{status_url}/events",
+        }
+    )
+
+
 @router.post(
     "/run",
     response_model=AnalysisRunResponse,
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    responses={202: {"model": AnalysisJobAcceptedResponse}}
 )
 async def run_analysis(
     payload: AnalysisRunRequest,
+    response: Response,
+    run_async: bool = Query(False, alias="async"),
     current_user=Depends(get_current_user)
 ):
-    # ---------- STEP 4.2: Fetch & ownership check ----------
-    resume, job_description = await fetch_resume_and_jd(
+    """
+    async=true queues the analysis and returns 202 with a job id at
+    once; follow it at /analysis/jobs/{jobId} (or its /events stream).
+    """
+    if run_async:
+        job = await enqueue_analysis_job(
+            user_id=current_user["sub"],
+            job_type="analysis_run",
+            payload={
+                "resumeId": payload.resumeId,
+                "jobDescriptionId": payload.jobDescriptionId,
+            }
+        )
+        return _job_accepted(job)
+
+    timer = StageTimer("analysis_run")
+
+    analysis = await run_analysis_pipeline(
         user_id=current_user["sub"],
         resume_id=payload.resumeId,
-        job_description_id=payload.jobDescriptionId
+        job_description_id=payload.jobDescriptionId,
+        timer=timer
     )
 
-    # ---------- STEP 4.4 + 4.5: ATS analysis ----------
-    ats_result = run_ats_keyword_match(
-        resume_text=resume["extractedText"],
-        jd_text=job_description["jdText"]
-    )
-    print("ATS RESULT KEYS:", ats_result.keys())
+    # ---------- Per-stage latency breakdown ----------
+    response.headers["Server-Timing"] = timer.server_timing()
+    timer.log(logger)
 
-    # ---------- STEP 6.3: AI similarity ----------
-    similarity_score = compute_similarity_score(
-        resume_text=resume["extractedText"],
-        jd_text=job_description["jdText"]
-    )
+    # ---------- Response ----------
+    return {
+        "message": "Analysis completed successfully",
+        "analysis": analysis
+    }
+
+
+@router.post(
+    "/run-batch",
+    response_model=AnalysisBatchResponse,
+    status_code=status.HTTP_200_OK,
+    responses={202: {"model": AnalysisJobAcceptedResponse}}
+)
+async def run_batch_analysis_route(
+    payload: AnalysisBatchRequest,
+    run_async: bool = Query(False, alias="async"),
+    current_user=Depends(get_current_user)
+):
+    # ---------- Validation ----------
+    explicit_pairs = [(pair.resumeId, pair.jobDescriptionId) for pair in payload.pairs]
+
+    # Checked before the cross product is built
+    if count_pairs(explicit_pairs, payload.resumeIds, payload.jobDescriptionIds) > ANALYSIS_BATCH_MAX_PAIRS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can contain at most {ANALYSIS_BATCH_MAX_PAIRS} pairs"
+        )
 
-    # ---------- STEP 6.4: Final weighted score ----------
-    final_score = compute_final_score(
-        ats_score=ats_result["atsScore"],
-        similarity_score=similarity_score
+    pairs = expand_pairs(
+        pairs=explicit_pairs,
+        resume_ids=payload.resumeIds,
+        job_description_ids=payload.jobDescriptionIds
     )
 
-    # ---------- STEP 6.5: Fit label ----------
-    fit_label = get_fit_label(final_score)
+    if not pairs:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide pairs or both resumeIds and jobDescriptionIds"
+        )
 
-    # ---------- STEP 4.6: Save analysis ----------
-    analysis_result = await save_analysis_result(
+    if run_async:
+        job = await enqueue_analysis_job(
+            user_id=current_user["sub"],
+            job_type="analysis_batch",
+            payload={"pairs": [list(pair) for pair in pairs]}
+        )
+        return _job_accepted(job)
+
+    # ---------- Batch pipeline ----------
+    batch = await run_batch_analysis(
         user_id=current_user["sub"],
-        resume_id=payload.resumeId,
-        job_description_id=payload.jobDescriptionId,
-        ats_score=ats_result["atsScore"],
-        similarity_score=similarity_score,
-        final_score=final_score,
-        fit_label=fit_label,
-        matched_skills=ats_result["matchedSkills"],
-        missing_skills=ats_result["missingSkills"],
-        categorized_skills=ats_result["categorizedSkills"],  # ✅ ADD THIS
-        strengths=ats_result["strengths"],
-        improvements=ats_result["improvements"],
+        pairs=pairs
     )
 
-    
-
-    # ---------- Response ----------
     return {
-        "message": "Analysis completed successfully",
-        "analysis": {
-            "analysisId": str(analysis_result["analysis_id"]),
-            "scores": {
-                "atsScore": ats_result["atsScore"],
-                "similarityScore": similarity_score,
-                "finalScore": final_score
-            },
-            "fitLabel": fit_label,
-            "matchedSkills": ats_result["matchedSkills"],
-            "missingSkills": ats_result["missingSkills"],
-            "categorizedSkills": ats_result["categorizedSkills"],
-            "strengths": ats_result["strengths"],
-            "improvements": ats_result["improvements"],
-            "createdAt": analysis_result["created_at"].isoformat()
-        }
+        "message": f"Analyzed {len(batch['results'])} of {len(pairs)} pairs",
+        "results": batch["results"],
+        "failures": batch["failures"]
     }
 
 
+@router.get(
+    "/jobs/{jobId}",
+    response_model=AnalysisJobResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_analysis_job_route(
+    jobId: str,
+    current_user=Depends(get_current_user)
+):
+    """
+    Status of a queued analysis; `result` holds the usual response
+    body once the job has succeeded.
+    """
+    return format_job(await get_job(current_user["sub"], jobId))
+
+
+@router.get(
+    "/jobs/{jobId}/events",
+    status_code=status.HTTP_200_OK
+)
+async def stream_analysis_job_route(
+    jobId: str,
+    current_user=Depends(get_current_user)
+):
+    """
+    Server-Sent Events: one `status` event per status change, ending
+    after succeeded/failed (the last event carries the result).
+    """
+    # Raises 404 before the stream starts
+    await get_job(current_user["sub"], jobId)
+
+    async def events():
+        last_sent = time.monotonic()
+
+        async for job in watch_job(
+            user_id=current_user["sub"],
+            job_id=jobId,
+            timeout=ANALYSIS_JOB_EVENTS_TIMEOUT_SECONDS,
+            poll_interval=ANALYSIS_JOB_POLL_MS / 1000
+        ):
+            if job is not None:
+                yield f"event: status\ndata: {json.dumps(format_job(job))}\n\n"
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get(
     "/history",
     response_model=AnalysisHistoryResponse,
@@ -118,15 +239,73 @@ async def run_analysis(
 async def get_analysis_history_route(
     page: int = 1,
     limit: int = 10,
+    cursor: str | None = None,
+    lean: bool = False,
     current_user=Depends(get_current_user)
 ):
+    """
+    Pass the previous response's nextCursor as `cursor` to page
+    through history; page/limit is kept for compatibility.
+    lean=true returns the same payload without response_model
+    re-validation (the service already builds JSON-safe output).
+    """
     page = max(page, 1)
     limit = min(max(limit, 1), 50)
 
-    return await get_analysis_history(
+    history = await get_analysis_history(
         user_id=current_user["sub"],
         page=page,
-        limit=limit
+        limit=limit,
+        cursor=cursor
+    )
+
+    if lean:
+        return JSONResponse(content=history)
+
+    return history
+
+
+@router.get(
+    "/rank/resumes",
+    response_model=RankingResponse,
+    status_code=status.HTTP_200_OK
+)
+async def rank_resumes_route(
+    jobDescriptionId: str,
+    limit: int = 10,
+    current_user=Depends(get_current_user)
+):
+    """
+    Ranks all of the user's resumes against one job description.
+    """
+    return await rank_documents(
+        user_id=current_user["sub"],
+        query_collection="job_descriptions",
+        query_id=jobDescriptionId,
+        target_collection="resumes",
+        top_k=min(max(limit, 1), 100)
+    )
+
+
+@router.get(
+    "/rank/job-descriptions",
+    response_model=RankingResponse,
+    status_code=status.HTTP_200_OK
+)
+async def rank_job_descriptions_route(
+    resumeId: str,
+    limit: int = 10,
+    current_user=Depends(get_current_user)
+):
+    """
+    Ranks all of the user's job descriptions against one resume.
+    """
+    return await rank_documents(
+        user_id=current_user["sub"],
+        query_collection="resumes",
+        query_id=resumeId,
+        target_collection="job_descriptions",
+        top_k=min(max(limit, 1), 100)
     )
 
 
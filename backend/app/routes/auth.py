@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException
+from pymongo.errors import DuplicateKeyError
 from app.schemas.user import UserCreate, UserLogin
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password_async, verify_and_update_password
 from app.core.jwt import create_access_token
 from app.db.mongodb import get_database
 from datetime import datetime
 from fastapi import Depends
-from app.core.auth_dependency import get_current_user
+from fastapi.security import HTTPAuthorizationCredentials
+from app.core.auth_dependency import get_current_user, security
+from app.core.token_cache import revoke_token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 db = get_database()
@@ -20,13 +23,18 @@ async def register(user: UserCreate):
     user_doc = {
         "name": user.name,
         "email": user.email,
-        "passwordHash": hash_password(user.password),
+        "passwordHash": await hash_password_async(user.password),
         "role": "user",
         "createdAt": datetime.utcnow(),
         "updatedAt": datetime.utcnow(),
     }
 
-    await db.users.insert_one(user_doc)
+    try:
+        await db.users.insert_one(user_doc)
+    except DuplicateKeyError:
+        # Concurrent registration of the same email (unique index)
+        raise HTTPException(status_code=409, detail="Email already registered")
+
     return {"message": "User registered successfully"}
 
 
@@ -36,9 +44,17 @@ async def login(user: UserLogin):
     if not db_user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if not verify_password(user.password, db_user["passwordHash"]):
+    valid, new_hash = await verify_and_update_password(user.password, db_user["passwordHash"])
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    # Cost factor (BCRYPT_ROUNDS) changed since this hash was created
+    if new_hash:
+        await db.users.update_one(
+            {"_id": db_user["_id"]},
+            {"$set": {"passwordHash": new_hash, "updatedAt": datetime.utcnow()}}
+        )
+
     token = create_access_token(
         {"sub": str(db_user["_id"]), "role": db_user["role"]}
     )
@@ -59,3 +75,14 @@ async def get_me(current_user=Depends(get_current_user)):
         "id": current_user["sub"],
         "role": current_user["role"]
     }
+
+
+@router.post("/logout")
+async def logout(
+    current_user=Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    # Revocation is per worker: other workers keep accepting
+    # the token until it expires
+    revoke_token(credentials.credentials)
+    return {"message": "Logged out"}
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi.responses import JSONResponse
 from app.core.auth_dependency import get_current_user
+from app.core.executor import run_in_inference_pool
 from app.schemas.jd import (
     JobDescriptionCreate,
     JobDescriptionSuccessResponse
 )
+from app.services.analysis_service import build_skill_profile
 from app.services.jd_service import create_job_description
 from app.services.jd_service import list_user_job_descriptions
 
@@ -36,13 +39,18 @@ async def create_job_description_route(
             detail="Job description text is too short"
         )
 
+    # ---------- Skill profile (stored for ATS scoring) ----------
+
+    skill_profile = await run_in_inference_pool(build_skill_profile, payload.jdText)
+
     # ---------- STEP 3.4: Save JD to MongoDB ----------
 
     jd_id = await create_job_description(
         user_id=current_user["sub"],
         jd_text=payload.jdText,
         jd_title=payload.jdTitle,
-        company_name=payload.companyName
+        company_name=payload.companyName,
+        skill_profile=skill_profile
     )
 
     # ---------- Response ----------
@@ -65,12 +73,17 @@ async def create_job_description_route(
     status_code=status.HTTP_200_OK
 )
 async def get_user_job_descriptions(
+    lean: bool = False,
     current_user=Depends(get_current_user)
 ):
     job_descriptions = await list_user_job_descriptions(
         user_id=current_user["sub"]
     )
 
+    # Lean: the list is already JSON-safe, skip response encoding
+    if lean:
+        return JSONResponse(content={"jobDescriptions": job_descriptions})
+
     return {
         "jobDescriptions": job_descriptions
     }
\ No newline at end of file
@@ -7,13 +7,12 @@ from fastapi import (
     HTTPException,
     status
 )
+from fastapi.responses import JSONResponse
 
 from app.core.auth_dependency import get_current_user
 from app.schemas.resume import ResumeUploadSuccessResponse
-from app.services.pdf_service import (
-    read_pdf_bytes,
-    extract_text_from_pdf
-)
+from app.services.pdf_service import read_pdf_bytes
+from app.services.resume_blob_service import get_or_create_resume_blob
 from app.services.resume_service import create_resume
 from app.services.resume_service import list_user_resumes
 
@@ -49,21 +48,15 @@ async def upload_resume(
             detail="Only PDF files are allowed"
         )
 
-    file_bytes = await file.read()
-
-    if len(file_bytes) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File size exceeds 2MB limit"
-        )
-
-    # Reset pointer for downstream services
-    await file.seek(0)
+    # Single chunked read; size re-checked for requests without Content-Length
+    pdf_bytes = await read_pdf_bytes(file, max_size=MAX_FILE_SIZE)
 
     # ---------- STEP 2.3: PDF Text Extraction ----------
+    # Content-addressed: a PDF seen before reuses its stored text and
+    # skill profile; only new PDFs are extracted.
 
-    pdf_bytes = await read_pdf_bytes(file)
-    extracted_text = extract_text_from_pdf(pdf_bytes)
+    blob, _ = await get_or_create_resume_blob(pdf_bytes)
+    extracted_text = blob["extractedText"]
 
     # ---------- STEP 2.4: Save Resume to MongoDB ----------
 
@@ -71,7 +64,7 @@ async def upload_resume(
         user_id=current_user["sub"],
         resume_title=resumeTitle,
         original_filename=file.filename,
-        extracted_text=extracted_text
+        blob=blob
     )
 
     # ---------- Response ----------
@@ -97,12 +90,17 @@ async def upload_resume(
     status_code=status.HTTP_200_OK
 )
 async def get_user_resumes(
+    lean: bool = False,
     current_user=Depends(get_current_user)
 ):
     resumes = await list_user_resumes(
         user_id=current_user["sub"]
     )
 
+    # Lean: the list is already JSON-safe, skip response encoding
+    if lean:
+        return JSONResponse(content={"resumes": resumes})
+
     return {
         "resumes": resumes
     }
\ No newline at end of file
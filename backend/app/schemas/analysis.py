@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional, Any
 
 
 # =========================
@@ -64,3 +64,69 @@ class AnalysisResult(BaseModel):
 class AnalysisRunResponse(BaseModel):
     message: str
     analysis: AnalysisResult
+
+
+# =========================
+# BATCH
+# =========================
+
+class AnalysisPair(BaseModel):
+    resumeId: str
+    jobDescriptionId: str
+
+
+class AnalysisBatchRequest(BaseModel):
+    # explicit pairs...
+    pairs: List[AnalysisPair] = []
+
+    # ...and/or a cross product of resumes × job descriptions
+    resumeIds: List[str] = []
+    jobDescriptionIds: List[str] = []
+
+
+class AnalysisBatchItem(BaseModel):
+    resumeId: str
+    jobDescriptionId: str
+    analysis: AnalysisResult
+
+
+class AnalysisBatchFailure(BaseModel):
+    resumeId: str
+    jobDescriptionId: str
+    detail: str
+
+
+class AnalysisBatchResponse(BaseModel):
+    message: str
+    results: List[AnalysisBatchItem]
+    failures: List[AnalysisBatchFailure]
+
+
+# =========================
+# BACKGROUND JOBS
+# =========================
+
+class AnalysisJobAcceptedResponse(BaseModel):
+    message: str
+    jobId: str
+    status: str
+    statusUrl: str
+    eventsUrl: str
+
+
+class AnalysisJobError(BaseModel):
+    statusCode: int
+    detail: Any
+
+
+class AnalysisJobResponse(BaseModel):
+    jobId: str
+    type: str
+    status: str  # queued | running | succeeded | failed
+    attempts: int
+    createdAt: Optional[str]
+    startedAt: Optional[str]
+    finishedAt: Optional[str]
+    # Same body the synchronous endpoint returns, once succeeded
+    result: Optional[dict] = None
+    error: Optional[AnalysisJobError] = None
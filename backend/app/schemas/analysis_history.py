@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 
 # ---------- HISTORY (LIST) ----------
@@ -30,6 +30,7 @@ class AnalysisHistoryResponse(BaseModel):
     page: int
     limit: int
     total: int
+    nextCursor: Optional[str] = None
     analyses: List[AnalysisHistoryItem]
 
 
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class RankedDocument(BaseModel):
+    id: str
+    title: Optional[str]
+    subtitle: Optional[str]
+    similarityScore: int
+
+
+class RankingResponse(BaseModel):
+    queryId: str
+    total: int
+    results: List[RankedDocument]
+    tookMs: float
@@ -0,0 +1,241 @@
+import asyncio
+
+from bson import ObjectId
+
+from app.db.mongodb import get_database
+from app.models.analysis_model import create_analysis_document
+from app.services.analysis_cache_service import (
+    analysis_result_key,
+    get_cached_analysis,
+    store_cached_analysis
+)
+from app.services.analysis_persistence_service import (
+    find_analysis_by_result_key,
+    save_analysis_results
+)
+from app.services.resume_blob_service import attach_resume_texts
+from app.services.analysis_service import (
+    ensure_skill_profiles,
+    run_ats_from_profiles,
+    format_analysis_result
+)
+from app.services.scoring_service import compute_final_score, get_fit_label
+from app.services.similarity_service import (
+    get_document_embeddings,
+    pool_similarity
+)
+
+db = get_database()
+
+
+def count_pairs(
+    pairs: list[tuple[str, str]],
+    resume_ids: list[str],
+    job_description_ids: list[str]
+) -> int:
+    """
+    Upper bound on the batch size (before de-duplication), so oversized
+    requests are rejected without materializing the cross product.
+    """
+    return len(pairs) + len(resume_ids) * len(job_description_ids)
+
+
+def expand_pairs(
+    pairs: list[tuple[str, str]],
+    resume_ids: list[str],
+    job_description_ids: list[str]
+) -> list[tuple[str, str]]:
+    """
+    Combines explicit pairs with the resumes × job descriptions
+    cross product, dropping duplicates but keeping order.
+    Callers bound the size with count_pairs first.
+    """
+    expanded = list(pairs)
+
+    for resume_id in resume_ids:
+        for job_description_id in job_description_ids:
+            expanded.append((resume_id, job_description_id))
+
+    return list(dict.fromkeys(expanded))
+
+
+async def _fetch_owned(collection: str, user_id: str, ids: set[str], text_field: str) -> dict:
+    valid_ids = [ObjectId(doc_id) for doc_id in ids if ObjectId.is_valid(doc_id)]
+    if not valid_ids:
+        return {}
+
+    cursor = db[collection].find(
+        {"_id": {"$in": valid_ids}, "userId": ObjectId(user_id)},
+        {"_id": 1, text_field: 1, "contentHash": 1, "textHash": 1, "skillProfile": 1}
+    )
+    docs = [doc async for doc in cursor]
+
+    if collection == "resumes":
+        await attach_resume_texts(docs)
+
+    return {str(doc["_id"]): doc for doc in docs}
+
+
+def _build_analysis_document(
+    user_id: str,
+    resume_id: str,
+    jd_id: str,
+    computed: dict,
+    result_key: str
+) -> dict:
+    ats_result = computed["atsResult"]
+
+    return create_analysis_document(
+        user_id=user_id,
+        resume_id=resume_id,
+        job_description_id=jd_id,
+        ats_score=ats_result["atsScore"],
+        similarity_score=computed["similarityScore"],
+        final_score=computed["finalScore"],
+        fit_label=computed["fitLabel"],
+        matched_skills=ats_result["matchedSkills"],
+        missing_skills=ats_result["missingSkills"],
+        categorized_skills=ats_result["categorizedSkills"],
+        strengths=ats_result["strengths"],
+        improvements=ats_result["improvements"],
+        result_key=result_key,
+    )
+
+
+async def run_batch_analysis(user_id: str, pairs: list[tuple[str, str]]) -> dict:
+    """
+    Analyzes many resume/JD pairs with one fetch per collection,
+    one embedding batch and one batched save. Like /analysis/run, pairs
+    whose content was analyzed before come from the result cache and
+    reuse the stored analysis. ATS runs on the stored skill profiles;
+    stale ones are rebuilt in a single pool job.
+    Pairs referencing missing documents are reported as failures.
+    """
+    # ---------- Fetch all documents ($in, both collections concurrently) ----------
+    resumes, job_descriptions = await asyncio.gather(
+        _fetch_owned(
+            "resumes", user_id, {resume_id for resume_id, _ in pairs}, "extractedText"
+        ),
+        _fetch_owned(
+            "job_descriptions", user_id, {jd_id for _, jd_id in pairs}, "jdText"
+        )
+    )
+
+    runnable = []
+    failures = []
+
+    for resume_id, jd_id in pairs:
+        if resume_id not in resumes:
+            detail = "Resume not found"
+        elif jd_id not in job_descriptions:
+            detail = "Job description not found"
+        else:
+            runnable.append((resume_id, jd_id))
+            continue
+
+        failures.append({
+            "resumeId": resume_id,
+            "jobDescriptionId": jd_id,
+            "detail": detail,
+        })
+
+    if not runnable:
+        return {"results": [], "failures": failures}
+
+    # ---------- Result cache (same keys as /analysis/run) ----------
+    result_keys = [
+        analysis_result_key(resumes[resume_id], job_descriptions[jd_id])
+        for resume_id, jd_id in runnable
+    ]
+    computed = await asyncio.gather(*(get_cached_analysis(key) for key in result_keys))
+    was_cached = [result is not None for result in computed]
+
+    uncached = [index for index, result in enumerate(computed) if result is None]
+
+    if uncached:
+        # ---------- Embed every unique text in one batch ----------
+        resume_keys = list(dict.fromkeys(runnable[index][0] for index in uncached))
+        jd_keys = list(dict.fromkeys(runnable[index][1] for index in uncached))
+
+        matrices = await get_document_embeddings(
+            [resumes[resume_id]["extractedText"] for resume_id in resume_keys]
+            + [job_descriptions[jd_id]["jdText"] for jd_id in jd_keys]
+        )
+        resume_chunks = dict(zip(resume_keys, matrices[:len(resume_keys)]))
+        jd_chunks = dict(zip(jd_keys, matrices[len(resume_keys):]))
+
+        # ---------- ATS for uncached pairs (stored skill profiles) ----------
+        resume_profiles = dict(zip(resume_keys, await ensure_skill_profiles(
+            "resumes", [resumes[resume_id] for resume_id in resume_keys], "extractedText"
+        )))
+        jd_profiles = dict(zip(jd_keys, await ensure_skill_profiles(
+            "job_descriptions", [job_descriptions[jd_id] for jd_id in jd_keys], "jdText"
+        )))
+
+        # ---------- Score ----------
+        for index in uncached:
+            resume_id, jd_id = runnable[index]
+
+            ats_result = run_ats_from_profiles(resume_profiles[resume_id], jd_profiles[jd_id])
+            similarity_score = round(
+                pool_similarity(resume_chunks[resume_id], jd_chunks[jd_id]) * 100
+            )
+            final_score = compute_final_score(
+                ats_score=ats_result["atsScore"],
+                similarity_score=similarity_score
+            )
+
+            computed[index] = {
+                "atsResult": ats_result,
+                "similarityScore": similarity_score,
+                "finalScore": final_score,
+                "fitLabel": get_fit_label(final_score),
+            }
+
+        await asyncio.gather(*(
+            store_cached_analysis(result_keys[index], computed[index])
+            for index in uncached
+        ))
+
+    # ---------- Reuse stored records of cached pairs ----------
+    stored = await asyncio.gather(*(
+        find_analysis_by_result_key(
+            user_id=user_id,
+            resume_id=resume_id,
+            job_description_id=jd_id,
+            result_key=result_key
+        ) if cached else asyncio.sleep(0)
+        for (resume_id, jd_id), result_key, cached in zip(runnable, result_keys, was_cached)
+    ))
+
+    # ---------- Persist the rest (write-behind or insert_many) ----------
+    new_docs = {
+        index: _build_analysis_document(user_id, resume_id, jd_id, computed[index], result_keys[index])
+        for index, (resume_id, jd_id) in enumerate(runnable)
+        if not stored[index]
+    }
+    await save_analysis_results(list(new_docs.values()))
+
+    for index, analysis_doc in new_docs.items():
+        stored[index] = {
+            "analysis_id": analysis_doc["_id"],
+            "created_at": analysis_doc["createdAt"],
+        }
+
+    results = [
+        {
+            "resumeId": resume_id,
+            "jobDescriptionId": jd_id,
+            "analysis": format_analysis_result(
+                analysis_id=record["analysis_id"],
+                created_at=record["created_at"],
+                ats_result=result["atsResult"],
+                similarity_score=result["similarityScore"],
+                final_score=result["finalScore"],
+                fit_label=result["fitLabel"]
+            ),
+        }
+        for (resume_id, jd_id), result, record in zip(runnable, computed, stored)
+    ]
+
+    return {"results": results, "failures": failures}
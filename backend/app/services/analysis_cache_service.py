@@ -0,0 +1,116 @@
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta
+
+from pymongo.errors import DuplicateKeyError
+
+from app.core.cache import LRUCache
+from app.core.config import (
+    ANALYSIS_CACHE_SIZE,
+    ANALYSIS_CACHE_TTL_SECONDS,
+    CHUNK_MAX_WORDS,
+    CHUNK_OVERLAP_WORDS,
+    EMBEDDING_MODEL_NAME,
+    SIMILARITY_POOLING,
+    SIMILARITY_TOP_K
+)
+from app.core.hashing import content_hash
+from app.db.mongodb import get_database
+from app.services.skill_taxonomy_service import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+db = get_database()
+
+# Per-process tier in front of the `analysis_cache` collection.
+# Entries are (expires_at, result) so both tiers honour the same TTL.
+_lru = LRUCache(ANALYSIS_CACHE_SIZE)
+
+_counters = {
+    "mongoHits": 0,
+    "misses": 0,
+}
+
+
+def analysis_result_key(resume: dict, job_description: dict) -> str:
+    """
+    Cache key for a computed analysis: the content hashes of both texts
+    plus everything else the result depends on (embedding model,
+    chunking/pooling settings and the skill taxonomy version).
+    """
+    resume_hash = resume.get("textHash") or content_hash(resume.get("extractedText") or "")
+    jd_hash = job_description.get("textHash") or content_hash(job_description.get("jdText") or "")
+
+    return hashlib.sha256(
+        (
+            f"{resume_hash}:{jd_hash}:{EMBEDDING_MODEL_NAME}:"
+            f"{CHUNK_MAX_WORDS}:{CHUNK_OVERLAP_WORDS}:{SIMILARITY_POOLING}:{SIMILARITY_TOP_K}:"
+            f"{get_taxonomy().version}"
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+async def get_cached_analysis(key: str) -> dict | None:
+    """
+    Returns the cached result ({atsResult, similarityScore, finalScore,
+    fitLabel}) or None. Checks the LRU first, then MongoDB; a failed
+    MongoDB read counts as a miss.
+    """
+    entry = _lru.get(key)
+    if entry is not None:
+        expires_at, result = entry
+        if expires_at > time.time():
+            return result
+        _lru.pop(key)
+
+    # The TTL monitor only sweeps periodically, so expiry is checked here too
+    try:
+        doc = await db.analysis_cache.find_one({
+            "_id": key,
+            "createdAt": {"$gt": datetime.utcnow() - timedelta(seconds=ANALYSIS_CACHE_TTL_SECONDS)}
+        })
+    except Exception:
+        logger.warning("Analysis cache read failed", exc_info=True)
+        doc = None
+
+    if not doc:
+        _counters["misses"] += 1
+        return None
+
+    _counters["mongoHits"] += 1
+
+    expires_at = (
+        doc["createdAt"] + timedelta(seconds=ANALYSIS_CACHE_TTL_SECONDS) - datetime.utcnow()
+    ).total_seconds() + time.time()
+    _lru.put(key, (expires_at, doc["result"]))
+
+    return doc["result"]
+
+
+async def store_cached_analysis(key: str, result: dict) -> None:
+    _lru.put(key, (time.time() + ANALYSIS_CACHE_TTL_SECONDS, result))
+
+    try:
+        await db.analysis_cache.insert_one({
+            "_id": key,
+            "result": result,
+            "createdAt": datetime.utcnow(),
+        })
+    except DuplicateKeyError:
+        # Another worker cached the same analysis first
+        pass
+    except Exception:
+        logger.warning("Analysis cache write failed", exc_info=True)
+
+
+def get_analysis_cache_stats() -> dict:
+    lru_stats = _lru.stats()
+
+    return {
+        "size": lru_stats["size"],
+        "maxSize": lru_stats["maxSize"],
+        "lruHits": lru_stats["hits"],
+        **_counters,
+        "ttlSeconds": ANALYSIS_CACHE_TTL_SECONDS,
+    }
@@ -1,6 +1,9 @@
 from bson import ObjectId
 from app.db.mongodb import get_database
 from fastapi import HTTPException, status
+from app.core.pagination import encode_cursor, decode_cursor, keyset_filter
+from app.services.analysis_write_service import analysis_writer
+from app.services.user_counter_service import get_user_count
 
 # ✅ import categorization logic
 from app.services.analysis_service import categorize_skills
@@ -8,31 +11,94 @@ from app.services.analysis_service import categorize_skills
 
 db = get_database()
 
+# Only the fields each response actually uses are read from MongoDB
+HISTORY_ITEM_PROJECTION = {
+    "_id": 1,
+    "resumeId": 1,
+    "jobDescriptionId": 1,
+    "atsScore": 1,
+    "similarityScore": 1,
+    "finalScore": 1,
+    "fitLabel": 1,
+    "createdAt": 1,
+}
+
+DETAIL_PROJECTION = {
+    **HISTORY_ITEM_PROJECTION,
+    "matchedSkills": 1,
+    "missingSkills": 1,
+    "strengths": 1,
+    "improvements": 1,
+}
+
+
+def _sort_key(doc: dict) -> tuple:
+    return doc["createdAt"], doc["_id"]
+
 
 async def get_analysis_history(
     user_id: str,
     page: int = 1,
-    limit: int = 10
+    limit: int = 10,
+    cursor: str | None = None
 ) -> dict:
     """
     Returns paginated analysis history for a user.
+    With a cursor (the previous page's nextCursor) the page is read by
+    keyset on (createdAt, _id), so every page costs the same. page/skip
+    is still accepted for older clients. The total is the user's cached
+    analysis count.
+    Analyses still in the write-behind queue (the newest ones) count as
+    part of the history, ahead of the stored ones, so a run shows up at
+    once and the total and page boundaries agree on every page.
     """
-    skip = (page - 1) * limit
-
     query = {"userId": ObjectId(user_id)}
 
-    total = await db.analyses.count_documents(query)
-
-    cursor = (
-        db.analyses
-        .find(query)
-        .sort("createdAt", -1)
-        .skip(skip)
-        .limit(limit)
+    pending = sorted(
+        analysis_writer.list_pending(userId=ObjectId(user_id)),
+        key=_sort_key,
+        reverse=True
     )
+    pending_ids = {doc["_id"] for doc in pending}
+
+    total = await get_user_count(user_id, "analyses") + len(pending)
+
+    if cursor:
+        after = decode_cursor(cursor)
+        query.update(keyset_filter(*after))
+        pending = [doc for doc in pending if _sort_key(doc) < after]
+        stored_skip = 0
+    else:
+        # Pending documents take the first places; stored ones follow
+        skip = (page - 1) * limit
+        stored_skip = max(skip - len(pending), 0)
+        pending = pending[skip:]
+
+    pending = pending[:limit + 1]
+    stored_limit = limit + 1 - len(pending)
+
+    # One extra document tells whether there is a next page
+    docs = []
+    if stored_limit > 0:
+        docs = await (
+            db.analyses
+            .find(query, HISTORY_ITEM_PROJECTION)
+            .sort([("createdAt", -1), ("_id", -1)])
+            .skip(stored_skip)
+            .limit(stored_limit)
+            .to_list(length=stored_limit)
+        )
+
+    # An in-flight flush can have a document in both places
+    docs = pending + [doc for doc in docs if doc["_id"] not in pending_ids]
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1]["createdAt"], docs[-1]["_id"])
 
     analyses = []
-    async for doc in cursor:
+    for doc in docs:
         analyses.append({
             "analysisId": str(doc["_id"]),
             "resumeId": str(doc["resumeId"]),
@@ -48,15 +114,24 @@ async def get_analysis_history(
         "page": page,
         "limit": limit,
         "total": total,
+        "nextCursor": next_cursor,
         "analyses": analyses,
     }
 
 
 async def get_analysis_by_id(user_id: str, analysis_id: str) -> dict:
-    doc = await db.analyses.find_one({
-        "_id": ObjectId(analysis_id),
-        "userId": ObjectId(user_id)
-    })
+    # Read-your-writes: a just-computed analysis may still be queued
+    doc = analysis_writer.get_pending(ObjectId(analysis_id))
+    if doc and doc["userId"] != ObjectId(user_id):
+        doc = None
+
+    doc = doc or await db.analyses.find_one(
+        {
+            "_id": ObjectId(analysis_id),
+            "userId": ObjectId(user_id)
+        },
+        DETAIL_PROJECTION
+    )
 
     if not doc:
         raise HTTPException(
@@ -85,12 +160,8 @@ async def get_analysis_by_id(user_id: str, analysis_id: str) -> dict:
 
         "matchedSkills": matched,
         "missingSkills": missing,
-        "categorizedSkills": doc.get("categorizedSkills", {
-    "matched": {"core": [], "important": [], "niceToHave": []},
-    "missing": {"core": [], "important": [], "niceToHave": []},
-}),
 
-        # ✅ ALWAYS PRESENT NOW
+        # ✅ ALWAYS PRESENT NOW (recomputed, so the stored copy is not read)
         "categorizedSkills": categorized_skills,
 
         "strengths": doc.get("strengths", []),
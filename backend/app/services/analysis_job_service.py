@@ -0,0 +1,524 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+
+from app.core.config import (
+    ANALYSIS_JOB_LEASE_SECONDS,
+    ANALYSIS_JOB_MAX_ATTEMPTS,
+    ANALYSIS_JOB_POLL_MS,
+    ANALYSIS_JOB_RETRY_BACKOFF_SECONDS
+)
+from app.core.metrics import counter, histogram
+from app.core.timing import StageTimer
+from app.db.mongodb import get_database
+from app.models.analysis_job_model import create_analysis_job_document
+from app.services.analysis_batch_service import run_batch_analysis
+from app.services.analysis_run_service import run_analysis_pipeline
+
+logger = logging.getLogger(__name__)
+
+db = get_database()
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+# What GET /analysis/jobs/{id} returns; the payload stays internal
+JOB_STATUS_PROJECTION = {
+    "_id": 1,
+    "type": 1,
+    "status": 1,
+    "attempts": 1,
+    "createdAt": 1,
+    "startedAt": 1,
+    "finishedAt": 1,
+    "result": 1,
+    "error": 1,
+}
+
+job_duration = histogram(
+    "analysis_job_duration_seconds",
+    "Time an analysis job spent running, by type and outcome.",
+    ("type", "outcome")
+)
+job_queue_wait = histogram(
+    "analysis_job_queue_wait_seconds",
+    "Time from enqueue until a worker claimed the job.",
+    ("type",)
+)
+jobs_enqueued = counter(
+    "analysis_jobs_enqueued_total",
+    "Analysis jobs accepted, by type.",
+    ("type",)
+)
+
+
+# =========================
+# JOB HANDLERS
+# =========================
+# type -> coroutine(user_id, payload) returning the job's result.
+# Both produce exactly what the synchronous endpoints return.
+
+async def _run_single(user_id: str, payload: dict) -> dict:
+    timer = StageTimer("analysis_job")
+
+    analysis = await run_analysis_pipeline(
+        user_id=user_id,
+        resume_id=payload["resumeId"],
+        job_description_id=payload["jobDescriptionId"],
+        timer=timer
+    )
+
+    timer.log(logger)
+    return {
+        "message": "Analysis completed successfully",
+        "analysis": analysis
+    }
+
+
+async def _run_batch(user_id: str, payload: dict) -> dict:
+    pairs = [tuple(pair) for pair in payload["pairs"]]
+    batch = await run_batch_analysis(user_id=user_id, pairs=pairs)
+
+    return {
+        "message": f"Analyzed {len(batch['results'])} of {len(pairs)} pairs",
+        "results": batch["results"],
+        "failures": batch["failures"]
+    }
+
+
+JOB_HANDLERS = {
+    "analysis_run": _run_single,
+    "analysis_batch": _run_batch,
+}
+
+
+# =========================
+# QUEUE (analysis_jobs)
+# =========================
+
+# Wakes this process's idle runners when a job is enqueued here;
+# runners in other processes find it on their next poll
+_job_available: asyncio.Event | None = None
+
+# job id -> events set whenever this process changes that job
+_job_watchers: dict[ObjectId, set[asyncio.Event]] = {}
+
+
+def _signal_job_available() -> None:
+    if _job_available is not None:
+        _job_available.set()
+
+
+def _notify_watchers(job_id: ObjectId) -> None:
+    for event in _job_watchers.get(job_id, ()):
+        event.set()
+
+
+def _validate_object_ids(*ids: str) -> None:
+    # Fail on the request, not later inside the worker
+    for value in ids:
+        if not ObjectId.is_valid(value):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid id: {value}"
+            )
+
+
+async def enqueue_analysis_job(user_id: str, job_type: str, payload: dict) -> dict:
+    """
+    Stores a queued job and returns it. Ownership of the referenced
+    documents is checked when the job runs, like the synchronous path.
+    """
+    if job_type == "analysis_run":
+        _validate_object_ids(payload["resumeId"], payload["jobDescriptionId"])
+    else:
+        _validate_object_ids(*[item for pair in payload["pairs"] for item in pair])
+
+    job = create_analysis_job_document(user_id, job_type, payload)
+
+    try:
+        await db.analysis_jobs.insert_one(job)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue analysis"
+        )
+
+    jobs_enqueued.inc(type=job_type)
+    _signal_job_available()
+
+    return job
+
+
+def format_job(job: dict) -> dict:
+    def iso(value):
+        return value.isoformat() if value else None
+
+    return {
+        "jobId": str(job["_id"]),
+        "type": job["type"],
+        "status": job["status"],
+        "attempts": job.get("attempts", 0),
+        "createdAt": iso(job.get("createdAt")),
+        "startedAt": iso(job.get("startedAt")),
+        "finishedAt": iso(job.get("finishedAt")),
+        "result": job.get("result"),
+        "error": job.get("error"),
+    }
+
+
+async def get_job(user_id: str, job_id: str) -> dict:
+    """
+    Returns the user's job or raises 404 (also for other users' jobs).
+    """
+    job = None
+    if ObjectId.is_valid(job_id):
+        job = await db.analysis_jobs.find_one(
+            {"_id": ObjectId(job_id), "userId": ObjectId(user_id)},
+            JOB_STATUS_PROJECTION
+        )
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job
+
+
+async def watch_job(user_id: str, job_id: str, timeout: float, poll_interval: float):
+    """
+    Yields the job each time its status changes, until it finishes or
+    timeout seconds pass. Changes made by this process are seen at once;
+    jobs run by other processes are re-read every poll_interval.
+    Yields None when nothing changed in a poll interval (keep-alive).
+    """
+    job = await get_job(user_id, job_id)
+    event = asyncio.Event()
+    _job_watchers.setdefault(job["_id"], set()).add(event)
+
+    try:
+        deadline = time.monotonic() + timeout
+        last_status = None
+
+        while True:
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield job
+            else:
+                yield None
+
+            remaining = deadline - time.monotonic()
+            if job["status"] in TERMINAL_STATUSES or remaining <= 0:
+                return
+
+            try:
+                await asyncio.wait_for(event.wait(), min(poll_interval, remaining))
+            except asyncio.TimeoutError:
+                pass
+            event.clear()
+
+            job = await get_job(user_id, job_id)
+
+    finally:
+        watchers = _job_watchers.get(job["_id"])
+        if watchers is not None:
+            watchers.discard(event)
+            if not watchers:
+                _job_watchers.pop(job["_id"], None)
+
+
+async def get_job_queue_stats() -> dict:
+    queued, running = await asyncio.gather(
+        db.analysis_jobs.count_documents({"status": "queued"}),
+        db.analysis_jobs.count_documents({"status": "running"})
+    )
+    return {"queued": queued, "running": running}
+
+
+# =========================
+# WORKERS
+# =========================
+
+class AnalysisJobWorker:
+    """
+    Runs queued jobs with `concurrency` runner tasks. Jobs are claimed
+    atomically with find_one_and_update, so any number of API and
+    standalone worker processes can share one queue. A running job
+    holds a lease that its runner renews; if the process dies, the
+    lease expires and another worker retries the job, up to
+    ANALYSIS_JOB_MAX_ATTEMPTS attempts in total. Transient failures
+    (5xx, unexpected errors) are requeued with exponential backoff;
+    4xx outcomes fail the job at once.
+    """
+
+    def __init__(
+        self,
+        lease_seconds: int,
+        max_attempts: int,
+        poll_ms: int,
+        retry_backoff_seconds: float
+    ):
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_ms / 1000
+        self.retry_backoff = retry_backoff_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+        # monotonic time of the last abandoned-job sweep (shared by runners)
+        self._last_abandoned_check = 0.0
+
+        # ---------- Metrics ----------
+        self.claimed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.active = 0
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self, concurrency: int) -> None:
+        global _job_available
+
+        if self.running or concurrency <= 0:
+            return
+
+        self._stopping = False
+        _job_available = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run(index))
+            for index in range(concurrency)
+        ]
+
+    async def _claim(self) -> dict | None:
+        now = datetime.utcnow()
+
+        return await db.analysis_jobs.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "queued", "availableAt": {"$lte": now}},
+                    # Lease expired: the worker running it is gone
+                    {
+                        "status": "running",
+                        "leaseExpiresAt": {"$lt": now},
+                        "attempts": {"$lt": self.max_attempts},
+                    },
+                ]
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "workerId": self.worker_id,
+                    "startedAt": now,
+                    "updatedAt": now,
+                    "leaseExpiresAt": now + self.lease,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("createdAt", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _fail_abandoned(self) -> None:
+        """
+        Fails jobs whose last allowed attempt died with its worker.
+        """
+        now = datetime.utcnow()
+        await db.analysis_jobs.update_many(
+            {
+                "status": "running",
+                "leaseExpiresAt": {"$lt": now},
+                "attempts": {"$gte": self.max_attempts},
+            },
+            {
+                "$set": {
+                    "status": "failed",
+                    "finishedAt": now,
+                    "updatedAt": now,
+                    "leaseExpiresAt": None,
+                    "error": {"statusCode": 500, "detail": "Analysis failed"},
+                }
+            }
+        )
+
+    async def _run(self, index: int) -> None:
+        while not self._stopping:
+            try:
+                job = await self._claim()
+            except Exception:
+                logger.exception("Claiming an analysis job failed")
+                job = None
+
+            if job is None:
+                # Idle: a good moment for housekeeping, once per lease interval
+                if time.monotonic() - self._last_abandoned_check >= self.lease.total_seconds():
+                    self._last_abandoned_check = time.monotonic()
+                    try:
+                        await self._fail_abandoned()
+                    except Exception:
+                        logger.exception("Failing abandoned analysis jobs failed")
+
+                _job_available.clear()
+                try:
+                    await asyncio.wait_for(_job_available.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._execute(job)
+            except Exception:
+                # Recording the outcome failed; the lease expiry retries it
+                logger.exception("Analysis job %s could not be finalized", job["_id"])
+
+    async def _renew_lease(self, job_id: ObjectId) -> None:
+        while True:
+            await asyncio.sleep(self.lease.total_seconds() / 3)
+            try:
+                await db.analysis_jobs.update_one(
+                    {"_id": job_id, "workerId": self.worker_id, "status": "running"},
+                    {"$set": {"leaseExpiresAt": datetime.utcnow() + self.lease}}
+                )
+            except Exception:
+                # Keep trying: two more misses still leave the lease valid
+                logger.exception("Renewing the lease on analysis job %s failed", job_id)
+
+    def _retry_delay(self, job: dict, exc: Exception) -> float:
+        delay = self.retry_backoff * 2 ** (job["attempts"] - 1)
+
+        retry_after = (getattr(exc, "headers", None) or {}).get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+
+        return min(delay, self.lease.total_seconds())
+
+    async def _retry_or_fail(self, job: dict, exc: Exception, error: dict) -> None:
+        if job["attempts"] < self.max_attempts:
+            self.retried += 1
+            await self._finish(job, {
+                "status": "queued",
+                "workerId": None,
+                "availableAt": datetime.utcnow() + timedelta(seconds=self._retry_delay(job, exc)),
+            })
+        else:
+            self.failed += 1
+            await self._finish(job, {
+                "status": "failed",
+                "finishedAt": datetime.utcnow(),
+                "error": error,
+            })
+
+    async def _finish(self, job: dict, fields: dict) -> None:
+        now = datetime.utcnow()
+        await db.analysis_jobs.update_one(
+            # A job whose lease was taken over belongs to the new worker
+            {"_id": job["_id"], "workerId": self.worker_id},
+            {"$set": {**fields, "updatedAt": now, "leaseExpiresAt": None}}
+        )
+        _notify_watchers(job["_id"])
+
+    async def _execute(self, job: dict) -> None:
+        self.claimed += 1
+        self.active += 1
+        _notify_watchers(job["_id"])
+
+        if job["attempts"] == 1:
+            job_queue_wait.observe(
+                (job["startedAt"] - job["createdAt"]).total_seconds(),
+                type=job["type"]
+            )
+
+        started = time.perf_counter()
+        renewal = asyncio.create_task(self._renew_lease(job["_id"]))
+
+        try:
+            handler = JOB_HANDLERS[job["type"]]
+            result = await handler(str(job["userId"]), job["payload"])
+
+        except HTTPException as exc:
+            error = {"statusCode": exc.status_code, "detail": exc.detail}
+
+            if exc.status_code < 500:
+                # Deterministic outcome (not found, bad input): never retried
+                self.failed += 1
+                job_duration.observe(time.perf_counter() - started, type=job["type"], outcome="failed")
+                await self._finish(job, {
+                    "status": "failed",
+                    "finishedAt": datetime.utcnow(),
+                    "error": error,
+                })
+            else:
+                # Saturated inference pool (503), timeout (504), database errors
+                logger.warning(
+                    "Analysis job %s got %d (attempt %d): %s",
+                    job["_id"], exc.status_code, job["attempts"], exc.detail
+                )
+                job_duration.observe(time.perf_counter() - started, type=job["type"], outcome="error")
+                await self._retry_or_fail(job, exc, error)
+
+        except Exception as exc:
+            logger.exception("Analysis job %s failed (attempt %d)", job["_id"], job["attempts"])
+            job_duration.observe(time.perf_counter() - started, type=job["type"], outcome="error")
+            await self._retry_or_fail(job, exc, {"statusCode": 500, "detail": "Analysis failed"})
+
+        else:
+            self.succeeded += 1
+            job_duration.observe(time.perf_counter() - started, type=job["type"], outcome="succeeded")
+            await self._finish(job, {
+                "status": "succeeded",
+                "finishedAt": datetime.utcnow(),
+                "result": result,
+            })
+
+        finally:
+            renewal.cancel()
+            self.active -= 1
+
+    async def stop(self) -> None:
+        """
+        Stops claiming new jobs and waits for the running ones to finish.
+        Called on shutdown, before the database client is closed.
+        """
+        self._stopping = True
+        if _job_available is not None:
+            _job_available.set()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        return {
+            "workerId": self.worker_id,
+            "runners": sum(1 for task in self._tasks if not task.done()),
+            "active": self.active,
+            "claimed": self.claimed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+        }
+
+
+analysis_job_worker = AnalysisJobWorker(
+    lease_seconds=ANALYSIS_JOB_LEASE_SECONDS,
+    max_attempts=ANALYSIS_JOB_MAX_ATTEMPTS,
+    poll_ms=ANALYSIS_JOB_POLL_MS,
+    retry_backoff_seconds=ANALYSIS_JOB_RETRY_BACKOFF_SECONDS
+)
+
+
+async def get_analysis_job_stats() -> dict:
+    return {
+        **analysis_job_worker.stats(),
+        **await get_job_queue_stats(),
+    }
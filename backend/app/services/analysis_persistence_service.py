@@ -1,7 +1,11 @@
+from collections import Counter
 from fastapi import HTTPException, status
 from bson import ObjectId
 from app.db.mongodb import get_database
+from app.core.config import ANALYSIS_WRITE_BEHIND
 from app.models.analysis_model import create_analysis_document
+from app.services.analysis_write_service import analysis_writer
+from app.services.user_counter_service import increment_user_count
 
 db = get_database()
 
@@ -23,6 +27,8 @@ async def save_analysis_result(
 
     strengths: list[str],
     improvements: list[str],
+
+    result_key: str | None = None,
 ):
     """
     Persists a completed analysis result to MongoDB.
@@ -45,11 +51,84 @@ async def save_analysis_result(
 
         strengths=strengths,
         improvements=improvements,
+
+        result_key=result_key,
     )
 
-    result = await db.analyses.insert_one(analysis_doc)
+    # Write-behind: the response does not wait for the insert
+    if ANALYSIS_WRITE_BEHIND:
+        await analysis_writer.enqueue(analysis_doc)
+    else:
+        await db.analyses.insert_one(analysis_doc)
+        await increment_user_count(user_id, "analyses")
 
     return {
-        "analysis_id": result.inserted_id,
+        "analysis_id": analysis_doc["_id"],
         "created_at": analysis_doc["createdAt"],
     }
+
+
+async def find_analysis_by_result_key(
+    user_id: str,
+    resume_id: str,
+    job_description_id: str,
+    result_key: str
+) -> dict | None:
+    """
+    Returns the user's stored analysis of this exact pair and content
+    (same result key), so a repeated run does not insert a duplicate.
+    """
+    doc = analysis_writer.find_pending(
+        userId=ObjectId(user_id),
+        resumeId=ObjectId(resume_id),
+        jobDescriptionId=ObjectId(job_description_id),
+        resultKey=result_key
+    )
+
+    doc = doc or await db.analyses.find_one(
+        {
+            "userId": ObjectId(user_id),
+            "resumeId": ObjectId(resume_id),
+            "jobDescriptionId": ObjectId(job_description_id),
+            "resultKey": result_key,
+        },
+        {"_id": 1, "createdAt": 1}
+    )
+
+    if not doc:
+        return None
+
+    return {
+        "analysis_id": doc["_id"],
+        "created_at": doc["createdAt"],
+    }
+
+
+async def save_analysis_results(analysis_docs: list[dict]) -> list:
+    """
+    Persists several analysis documents: through the write-behind queue
+    when it is enabled, otherwise in one insert_many round trip.
+    Returns the document IDs in input order.
+    """
+    if not analysis_docs:
+        return []
+
+    if ANALYSIS_WRITE_BEHIND:
+        for analysis_doc in analysis_docs:
+            await analysis_writer.enqueue(analysis_doc)
+        return [analysis_doc["_id"] for analysis_doc in analysis_docs]
+
+    try:
+        result = await db.analyses.insert_many(analysis_docs)
+
+        per_user = Counter(str(doc["userId"]) for doc in analysis_docs)
+        for user_id, count in per_user.items():
+            await increment_user_count(user_id, "analyses", count)
+
+        return result.inserted_ids
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save analysis results"
+        )
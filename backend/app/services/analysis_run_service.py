@@ -0,0 +1,165 @@
+import asyncio
+
+from app.core.hashing import content_hash
+from app.core.timing import StageTimer
+from app.services.analysis_service import (
+    fetch_resume_and_jd,
+    load_jd_text,
+    is_skill_profile_current,
+    ensure_skill_profiles,
+    run_ats_from_profiles,
+    format_analysis_result
+)
+from app.services.analysis_persistence_service import (
+    save_analysis_result,
+    find_analysis_by_result_key
+)
+from app.services.analysis_cache_service import (
+    analysis_result_key,
+    get_cached_analysis,
+    store_cached_analysis
+)
+from app.services.resume_blob_service import attach_resume_texts
+from app.services.similarity_service import (
+    compute_similarity_score,
+    get_embeddings_by_hash,
+    pool_similarity
+)
+from app.services.scoring_service import (
+    compute_final_score,
+    get_fit_label
+)
+
+
+# =========================
+# SINGLE ANALYSIS PIPELINE
+# =========================
+# Shared by POST /analysis/run and the analysis job workers.
+
+async def run_analysis_pipeline(
+    user_id: str,
+    resume_id: str,
+    job_description_id: str,
+    timer: StageTimer
+) -> dict:
+    """
+    Runs (or reuses) the analysis of one resume/JD pair, records each
+    stage on timer and returns the API's `analysis` payload.
+    """
+    # ---------- STEP 4.2: Fetch & ownership check (concurrent) ----------
+    with timer.stage("fetch"):
+        resume, job_description = await fetch_resume_and_jd(
+            user_id=user_id,
+            resume_id=resume_id,
+            job_description_id=job_description_id
+        )
+
+        # Legacy resumes without a textHash are keyed by their text
+        if not resume.get("textHash"):
+            await attach_resume_texts([resume])
+
+    # ---------- Result cache (content hashes + model + taxonomy) ----------
+    with timer.stage("cache"):
+        result_key = analysis_result_key(resume, job_description)
+        cached = await get_cached_analysis(result_key)
+
+    timer.tags["cached"] = bool(cached)
+
+    if cached:
+        ats_result = cached["atsResult"]
+        similarity_score = cached["similarityScore"]
+        final_score = cached["finalScore"]
+        fit_label = cached["fitLabel"]
+
+    else:
+        # ---------- Precomputed embeddings (by content hash) ----------
+        with timer.stage("embeddings"):
+            resume_chunks, jd_chunks = await get_embeddings_by_hash([
+                resume.get("textHash") or content_hash(resume.get("extractedText") or ""),
+                job_description.get("textHash") or content_hash(job_description.get("jdText") or "")
+            ])
+
+        # Texts are only loaded when something has to be recomputed
+        needs_text = (
+            resume_chunks is None
+            or jd_chunks is None
+            or not is_skill_profile_current(resume.get("skillProfile"))
+            or not is_skill_profile_current(job_description.get("skillProfile"))
+        )
+        if needs_text:
+            with timer.stage("text"):
+                await asyncio.gather(
+                    attach_resume_texts([resume]),
+                    load_jd_text(job_description)
+                )
+
+        # ---------- STEP 4.4 + 4.5: ATS analysis (stored skill profiles) ----------
+        with timer.stage("ats"):
+            (resume_profile,) = await ensure_skill_profiles("resumes", [resume], "extractedText")
+            (jd_profile,) = await ensure_skill_profiles("job_descriptions", [job_description], "jdText")
+
+            ats_result = run_ats_from_profiles(resume_profile, jd_profile)
+
+        # ---------- STEP 6.3: AI similarity ----------
+        with timer.stage("similarity"):
+            if resume_chunks is not None and jd_chunks is not None:
+                similarity_score = round(pool_similarity(resume_chunks, jd_chunks) * 100)
+            else:
+                similarity_score = await compute_similarity_score(
+                    resume_text=resume["extractedText"],
+                    jd_text=job_description["jdText"]
+                )
+
+        # ---------- STEP 6.4: Final weighted score ----------
+        final_score = compute_final_score(
+            ats_score=ats_result["atsScore"],
+            similarity_score=similarity_score
+        )
+
+        # ---------- STEP 6.5: Fit label ----------
+        fit_label = get_fit_label(final_score)
+
+        await store_cached_analysis(result_key, {
+            "atsResult": ats_result,
+            "similarityScore": similarity_score,
+            "finalScore": final_score,
+            "fitLabel": fit_label,
+        })
+
+    # ---------- STEP 4.6: Save analysis ----------
+    with timer.stage("save"):
+        # A repeated run of the same pair and content reuses the stored record
+        analysis_result = None
+        if cached:
+            analysis_result = await find_analysis_by_result_key(
+                user_id=user_id,
+                resume_id=resume_id,
+                job_description_id=job_description_id,
+                result_key=result_key
+            )
+
+        if not analysis_result:
+            analysis_result = await save_analysis_result(
+                user_id=user_id,
+                resume_id=resume_id,
+                job_description_id=job_description_id,
+                ats_score=ats_result["atsScore"],
+                similarity_score=similarity_score,
+                final_score=final_score,
+                fit_label=fit_label,
+                matched_skills=ats_result["matchedSkills"],
+                missing_skills=ats_result["missingSkills"],
+                categorized_skills=ats_result["categorizedSkills"],  # ✅ ADD THIS
+                strengths=ats_result["strengths"],
+                improvements=ats_result["improvements"],
+                result_key=result_key,
+            )
+
+    return format_analysis_result(
+        analysis_id=analysis_result["analysis_id"],
+        created_at=analysis_result["created_at"],
+        ats_result=ats_result,
+        similarity_score=similarity_score,
+        final_score=final_score,
+        fit_label=fit_label
+    )
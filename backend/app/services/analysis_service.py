@@ -1,6 +1,10 @@
 from fastapi import HTTPException, status
 from bson import ObjectId
+from app.core.executor import run_in_inference_pool
 from app.db.mongodb import get_database
+from app.services.skill_matcher_service import tokenize
+from app.services.skill_taxonomy_service import SkillTaxonomy, get_taxonomy
+import asyncio
 import re
 
 db = get_database()
@@ -8,122 +12,16 @@ db = get_database()
 # =========================
 # SKILL DEFINITIONS
 # =========================
+# Skills, aliases, weights and display names live in the skill
+# taxonomy (see skill_taxonomy_service / app/data/skill_taxonomy.json).
 
-CANONICAL_SKILLS = {
-    "python", "java", "javascript",
-    "fastapi", "django", "flask",
-    "docker", "kubernetes",
-    "mongodb", "postgresql", "mysql",
-    "aws", "azure", "gcp",
-    "rest", "graphql",
-    "jwt", "oauth",
-    "ci", "cd", "ci/cd",
-    "kafka", "rabbitmq",
-    "microservices",
-    "nosql", "sql",
-}
-
-STOPWORDS = {
-    "a", "an", "the", "and", "or", "but", "if", "while",
-    "with", "without", "within", "by", "for", "from",
-    "to", "of", "in", "on", "at", "as", "per",
-    "is", "are", "was", "were", "be", "been", "being",
-    "this", "that", "these", "those",
-    "it", "its", "they", "them", "their", "we", "you", "your",
-    "will", "would", "should", "can", "could", "may", "might",
-    "must", "shall",
-    "role", "roles", "responsibility", "responsibilities",
-    "required", "requirements", "preferred",
-    "experience", "knowledge", "ability",
-    "work", "working", "team", "teams",
-    "company", "business", "environment",
-    "using", "use", "used",
-}
-
-SKILL_ALIASES = {
-    "ci": "ci/cd",
-    "cd": "ci/cd",
-    "ci-cd": "ci/cd",
-
-    "postgres": "postgresql",
-    "psql": "postgresql",
-
-    "rabbit": "rabbitmq",
-
-    "mongo": "mongodb",
-
-    "js": "javascript",
-}
-
-SKILL_DISPLAY_NAMES = {
-    "ci/cd": "CI/CD",
-    "postgresql": "PostgreSQL",
-    "rabbitmq": "RabbitMQ",
-    "mongodb": "MongoDB",
-    "fastapi": "FastAPI",
-    "aws": "AWS",
-    "jwt": "JWT",
-    "nosql": "NoSQL",
-    "sql": "SQL",
-    "javascript": "JavaScript",
-}
-
-
-# =========================
-# SKILL WEIGHTS (ATS IMPORTANCE)
-# =========================
-
-SKILL_WEIGHTS = {
-    # ---- Core backend ----
-    "python": 3,
-    "fastapi": 3,
-    "django": 3,
-    "flask": 3,
-
-    # ---- Databases ----
-    "mongodb": 2,
-    "postgresql": 2,
-    "mysql": 2,
-    "sql": 2,
-    "nosql": 2,
-
-    # ---- Infra / DevOps ----
-    "docker": 2,
-    "kubernetes": 2,
-    "aws": 2,
-    "azure": 2,
-    "gcp": 2,
-
-    # ---- APIs & Auth ----
-    "rest": 1,
-    "graphql": 1,
-    "jwt": 1,
-    "oauth": 1,
-
-    # ---- Messaging / Extras ----
-    "kafka": 1,
-    "rabbitmq": 1,
-    "microservices": 1,
-    "ci/cd": 1,
-}
-
-
-SKILL_PRIORITY = {
-    "python": "core",
-    "fastapi": "core",
-    "docker": "important",
-    "mongodb": "important",
-    "postgresql": "important",
-    "aws": "core",
-    "kafka": "niceToHave",
-    "rabbitmq": "niceToHave",
-    "ci/cd": "important",
-    "jwt": "important",
-    "microservices": "core",
-}
 
+def categorize_skills(
+    skills: list[str],
+    taxonomy: SkillTaxonomy | None = None
+) -> dict:
+    taxonomy = taxonomy or get_taxonomy()
 
-def categorize_skills(skills: list[str]) -> dict:
     categories = {
         "core": [],
         "important": [],
@@ -131,7 +29,7 @@ def categorize_skills(skills: list[str]) -> dict:
     }
 
     for skill in skills:
-        weight = SKILL_WEIGHTS.get(skill.lower(), 1)
+        weight = taxonomy.weight(skill.lower())
 
         if weight >= 3:
             categories["core"].append(skill)
@@ -156,17 +54,23 @@ def preprocess_text(text: str) -> str:
     return text
 
 
-def format_skill(skill: str) -> str:
-    return SKILL_DISPLAY_NAMES.get(skill, skill.upper())
+def format_skill(skill: str, taxonomy: SkillTaxonomy | None = None) -> str:
+    return (taxonomy or get_taxonomy()).display_name(skill)
+
+
+def count_skills(text: str) -> dict[str, int]:
+    """
+    Counts every skill mention (canonical names and aliases)
+    in one pass over the raw text.
+    """
+    return get_taxonomy().matcher.count(text)
 
 
 def count_skill_occurrences(text: str, skill: str) -> int:
     """
     Counts how many times a skill appears in the text.
-    Uses word-boundary matching to avoid partial matches.
     """
-    pattern = rf"\b{re.escape(skill)}\b"
-    return len(re.findall(pattern, text))
+    return count_skills(text).get(skill, 0)
 
 
 
@@ -178,63 +82,35 @@ def normalize_skill(word: str) -> str:
     """
     Normalize skill aliases to canonical form.
     """
-    return SKILL_ALIASES.get(word, word)
+    return get_taxonomy().aliases.get(word, word)
 
 
 def extract_skills_from_text(text: str) -> set[str]:
-    words = text.split()
+    return set(count_skills(text))
 
-    skills = set()
-
-    for word in words:
-        if word in STOPWORDS:
-            continue
-
-        normalized = normalize_skill(word)
-
-        if normalized in CANONICAL_SKILLS:
-            skills.add(normalized)
-
-    return skills
-
-
-
-def match_skills(
-    resume_text: str,
-    jd_skills: set[str]
-) -> tuple[list[str], list[str]]:
-
-    matched = []
-    missing = []
-
-    for skill in jd_skills:
-        if skill in resume_text:
-            matched.append(skill)
-        else:
-            missing.append(skill)
-
-    return matched, missing
 
 
 def calculate_ats_score(
     matched: list[str],
-    missing: list[str]
+    missing: list[str],
+    taxonomy: SkillTaxonomy | None = None
 ) -> int:
     """
     Calculates weighted ATS score.
     Core skills contribute more than nice-to-have skills.
     """
+    taxonomy = taxonomy or get_taxonomy()
 
     total_weight = 0
     matched_weight = 0
 
     for skill in matched:
-        weight = SKILL_WEIGHTS.get(skill.lower(), 1)
+        weight = taxonomy.weight(skill.lower())
         matched_weight += weight
         total_weight += weight
 
     for skill in missing:
-        weight = SKILL_WEIGHTS.get(skill.lower(), 1)
+        weight = taxonomy.weight(skill.lower())
         total_weight += weight
 
     if total_weight == 0:
@@ -284,6 +160,70 @@ def generate_strengths_and_improvements(
 
 
 
+# =========================
+# SKILL PROFILES
+# =========================
+
+def build_skill_profile(text: str) -> dict:
+    """
+    Compact, storable summary of a document's skills.
+    Skills and counts are parallel lists so skill names
+    never end up as MongoDB field names.
+    """
+    taxonomy = get_taxonomy()
+
+    tokens = tokenize(text)
+    counts = taxonomy.matcher.count_tokens(tokens)
+    skills = sorted(counts)
+
+    return {
+        "skills": skills,
+        "counts": [counts[skill] for skill in skills],
+        "tokenCount": sum(1 for token in tokens if token[0].isalnum()),
+        "taxonomyVersion": taxonomy.version,
+    }
+
+
+def is_skill_profile_current(profile: dict | None) -> bool:
+    return bool(profile) and profile.get("taxonomyVersion") == get_taxonomy().version
+
+
+def _build_skill_profiles(texts: list[str]) -> list[dict]:
+    return [build_skill_profile(text) for text in texts]
+
+
+async def ensure_skill_profiles(
+    collection: str,
+    docs: list[dict],
+    text_field: str
+) -> list[dict]:
+    """
+    Returns a current skill profile for each document.
+    Missing or stale profiles (older taxonomy) are rebuilt in one
+    inference-pool job and written back.
+    """
+    stale = [doc for doc in docs if not is_skill_profile_current(doc.get("skillProfile"))]
+
+    if stale:
+        profiles = await run_in_inference_pool(
+            _build_skill_profiles,
+            [doc.get(text_field) or "" for doc in stale]
+        )
+
+        for doc, profile in zip(stale, profiles):
+            doc["skillProfile"] = profile
+
+        await asyncio.gather(*[
+            db[collection].update_one(
+                {"_id": doc["_id"]},
+                {"$set": {"skillProfile": doc["skillProfile"]}}
+            )
+            for doc in stale
+        ])
+
+    return [doc["skillProfile"] for doc in docs]
+
+
 # =========================
 # MAIN PIPELINE
 # =========================
@@ -292,18 +232,35 @@ def run_ats_keyword_match(
     resume_text: str,
     jd_text: str
 ) -> dict:
+    """
+    Full ATS match from raw text.
+    Raw text is matched directly: preprocess_text would turn
+    "CI/CD" into "ci cd" and lose punctuated skills.
+    """
+    return run_ats_from_profiles(
+        build_skill_profile(resume_text),
+        build_skill_profile(jd_text)
+    )
+
 
-    resume_clean = preprocess_text(resume_text)
-    jd_clean = preprocess_text(jd_text)
+def run_ats_from_profiles(
+    resume_profile: dict,
+    jd_profile: dict
+) -> dict:
+    """
+    ATS match from precomputed skill profiles (no text processing).
+    """
+    taxonomy = get_taxonomy()
 
-    jd_skills = extract_skills_from_text(jd_clean)
+    resume_counts = dict(zip(resume_profile["skills"], resume_profile["counts"]))
+    jd_skills = jd_profile["skills"]
 
     strong_skills = []
     partial_skills = []
     missing_skills = []
 
     for skill in jd_skills:
-        count = count_skill_occurrences(resume_clean, skill)
+        count = resume_counts.get(skill, 0)
 
         if count >= 2:
             strong_skills.append(skill)
@@ -317,7 +274,7 @@ def run_ats_keyword_match(
     missing = missing_skills
 
     # ---------- ATS SCORE ----------
-    ats_score = calculate_ats_score(matched, missing)
+    ats_score = calculate_ats_score(matched, missing, taxonomy)
 
     # ---------- FEEDBACK ----------
     strengths, improvements = generate_strengths_and_improvements(
@@ -332,17 +289,14 @@ def run_ats_keyword_match(
     missing = sorted(set(missing))
 
 
-    categorized_matched = categorize_skills(matched)
-    categorized_missing = categorize_skills(missing)
-
     categorized_skills = {
-    "matched": categorize_skills(matched),
-    "missing": categorize_skills(missing)
+    "matched": categorize_skills(matched, taxonomy),
+    "missing": categorize_skills(missing, taxonomy)
 }
 
     # ---------- UI FORMATTING ----------
-    matched = [format_skill(skill) for skill in matched]
-    missing = [format_skill(skill) for skill in missing]
+    matched = [format_skill(skill, taxonomy) for skill in matched]
+    missing = [format_skill(skill, taxonomy) for skill in missing]
 
     return {
     "atsScore": ats_score,
@@ -355,19 +309,101 @@ def run_ats_keyword_match(
 
 
 
+# =========================
+# RESPONSE FORMATTING
+# =========================
+
+def format_analysis_result(
+    analysis_id,
+    created_at,
+    ats_result: dict,
+    similarity_score: int,
+    final_score: int,
+    fit_label: str
+) -> dict:
+    """
+    Shapes a computed analysis into the API's `analysis` payload.
+    """
+    return {
+        "analysisId": str(analysis_id),
+        "scores": {
+            "atsScore": ats_result["atsScore"],
+            "similarityScore": similarity_score,
+            "finalScore": final_score
+        },
+        "fitLabel": fit_label,
+        "matchedSkills": ats_result["matchedSkills"],
+        "missingSkills": ats_result["missingSkills"],
+        "categorizedSkills": ats_result["categorizedSkills"],
+        "strengths": ats_result["strengths"],
+        "improvements": ats_result["improvements"],
+        "createdAt": created_at.isoformat()
+    }
+
+
+
 # =========================
 # FETCH HELPERS
 # =========================
 
+# Content hash and stored skill profile first; text only when needed.
+# Resume text (in resume_blobs, or inline on legacy documents) is loaded
+# separately by attach_resume_texts.
+RESUME_ANALYSIS_PROJECTION = {
+    "_id": 1,
+    "contentHash": 1,
+    "textHash": 1,
+    "skillProfile": 1,
+}
+
+JD_ANALYSIS_PROJECTION = {
+    "_id": 1,
+    "textHash": 1,
+    "skillProfile": 1,
+}
+
+
+async def load_jd_text(job_description: dict) -> dict:
+    """
+    Fills jdText on a job description fetched without it.
+    """
+    if "jdText" not in job_description:
+        doc = await db.job_descriptions.find_one(
+            {"_id": job_description["_id"]},
+            {"_id": 0, "jdText": 1}
+        )
+        job_description["jdText"] = (doc or {}).get("jdText") or ""
+
+    return job_description
+
+
 async def fetch_resume_and_jd(
     user_id: str,
     resume_id: str,
     job_description_id: str
 ):
-    resume = await db.resumes.find_one({
-        "_id": ObjectId(resume_id),
-        "userId": ObjectId(user_id)
-    })
+    """
+    Fetches both documents concurrently (one round trip of latency),
+    without their texts. Legacy JDs without a textHash get their text
+    loaded so they can still be keyed by content; callers do the same
+    for resumes with attach_resume_texts.
+    """
+    resume, job_description = await asyncio.gather(
+        db.resumes.find_one(
+            {
+                "_id": ObjectId(resume_id),
+                "userId": ObjectId(user_id)
+            },
+            RESUME_ANALYSIS_PROJECTION
+        ),
+        db.job_descriptions.find_one(
+            {
+                "_id": ObjectId(job_description_id),
+                "userId": ObjectId(user_id)
+            },
+            JD_ANALYSIS_PROJECTION
+        )
+    )
 
     if not resume:
         raise HTTPException(
@@ -375,15 +411,13 @@ async def fetch_resume_and_jd(
             detail="Resume not found"
         )
 
-    job_description = await db.job_descriptions.find_one({
-        "_id": ObjectId(job_description_id),
-        "userId": ObjectId(user_id)
-    })
-
     if not job_description:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job description not found"
         )
 
+    if not job_description.get("textHash"):
+        await load_jd_text(job_description)
+
     return resume, job_description
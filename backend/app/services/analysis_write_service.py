@@ -0,0 +1,242 @@
+import asyncio
+import logging
+from collections import Counter
+
+from fastapi import HTTPException, status
+from pymongo.errors import BulkWriteError
+
+from app.core.config import (
+    ANALYSIS_WRITE_BATCH_SIZE,
+    ANALYSIS_WRITE_FLUSH_MS,
+    ANALYSIS_WRITE_QUEUE_SIZE,
+    ANALYSIS_WRITE_MAX_RETRIES
+)
+from app.db.mongodb import get_database
+from app.services.user_counter_service import increment_user_count
+
+logger = logging.getLogger(__name__)
+
+db = get_database()
+
+DUPLICATE_KEY = 11000
+
+# Queued by drain(): the writer flushes what it has and exits
+_STOP = object()
+
+
+# =========================
+# WRITE-BEHIND QUEUE
+# =========================
+
+class AnalysisWriteBehind:
+    """
+    Buffers analysis documents and writes them with insert_many once
+    max_batch are queued or max_wait_ms has passed. Documents carry a
+    client-generated _id, so a retried batch is idempotent: documents
+    that already made it in fail with a duplicate key and are skipped.
+    Queued and in-flight documents stay readable through get_pending().
+    """
+
+    def __init__(self, max_batch: int, max_wait_ms: float, max_queue: int, max_retries: int):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_retries = max_retries
+
+        self._queue: asyncio.Queue | None = None
+        self._max_queue = max_queue
+        self._task: asyncio.Task | None = None
+        self._pending: dict = {}
+        self._closing = False
+
+        # ---------- Metrics ----------
+        self.flushes = 0
+        self.written = 0
+        self.retries = 0
+        self.direct_writes = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._closing = False
+            self._queue = asyncio.Queue(maxsize=self._max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    async def enqueue(self, analysis_doc: dict) -> None:
+        """
+        Queues the document and returns immediately. If the writer is
+        not running or the buffer is full, the document is written
+        directly so memory stays bounded; that write raises 500 if the
+        document could not be stored.
+        """
+        if self.running and not self._closing:
+            try:
+                self._queue.put_nowait(analysis_doc)
+                self._pending[analysis_doc["_id"]] = analysis_doc
+                return
+            except asyncio.QueueFull:
+                pass
+
+        self.direct_writes += 1
+        if await self._write([analysis_doc]):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to save analysis result"
+            )
+
+    def get_pending(self, analysis_id) -> dict | None:
+        return self._pending.get(analysis_id)
+
+    def find_pending(self, **fields) -> dict | None:
+        for analysis_doc in self._pending.values():
+            if all(analysis_doc.get(key) == value for key, value in fields.items()):
+                return analysis_doc
+        return None
+
+    def list_pending(self, **fields) -> list[dict]:
+        """
+        Queued and in-flight documents matching fields. Not yet counted
+        in the user's analysis counter (it is bumped after the write).
+        """
+        return [
+            analysis_doc
+            for analysis_doc in self._pending.values()
+            if all(analysis_doc.get(key) == value for key, value in fields.items())
+        ]
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+
+            batch = [first]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._flush(batch)
+            except Exception:
+                # Never let one batch stop the writer
+                logger.exception("Flushing %d analysis documents failed", len(batch))
+
+    async def _flush(self, batch: list[dict]) -> None:
+        try:
+            await self._write(batch)
+        finally:
+            for analysis_doc in batch:
+                self._pending.pop(analysis_doc["_id"], None)
+
+    async def _write(self, batch: list[dict]) -> list[dict]:
+        """
+        Inserts the batch with retries; returns the documents dropped
+        after the last retry (empty when everything was stored).
+        """
+        remaining = batch
+        dropped = []
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                await db.analyses.insert_many(remaining, ordered=False)
+                break
+
+            except BulkWriteError as exc:
+                failed = {
+                    error["index"]
+                    for error in exc.details.get("writeErrors", [])
+                    if error.get("code") != DUPLICATE_KEY
+                }
+                remaining = [doc for i, doc in enumerate(remaining) if i in failed]
+                if not remaining:
+                    break
+
+            except Exception:
+                logger.exception(
+                    "Writing %d analysis documents failed (attempt %d of %d)",
+                    len(remaining), attempt + 1, self.max_retries + 1
+                )
+
+            if attempt < self.max_retries:
+                self.retries += 1
+                await asyncio.sleep(min(0.1 * 2 ** attempt, 5))
+        else:
+            self.dropped += len(remaining)
+            logger.error(
+                "Dropping %d analysis documents after %d retries: %s",
+                len(remaining),
+                self.max_retries,
+                [str(doc["_id"]) for doc in remaining]
+            )
+            dropped = remaining
+            remaining_ids = {doc["_id"] for doc in remaining}
+            batch = [doc for doc in batch if doc["_id"] not in remaining_ids]
+
+        self.flushes += 1
+        self.written += len(batch)
+
+        per_user = Counter(str(doc["userId"]) for doc in batch)
+        for user_id, count in per_user.items():
+            try:
+                await increment_user_count(user_id, "analyses", count)
+            except Exception:
+                # The documents are stored; only the cached count drifts
+                logger.exception("Updating the analysis count of user %s failed", user_id)
+
+        return dropped
+
+    async def drain(self) -> None:
+        """
+        Flushes everything still queued and stops the writer.
+        Called on shutdown, before the database client is closed;
+        documents enqueued meanwhile are written directly.
+        """
+        if not self.running:
+            return
+
+        self._closing = True
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "written": self.written,
+            "retries": self.retries,
+            "directWrites": self.direct_writes,
+            "dropped": self.dropped,
+        }
+
+
+analysis_writer = AnalysisWriteBehind(
+    max_batch=ANALYSIS_WRITE_BATCH_SIZE,
+    max_wait_ms=ANALYSIS_WRITE_FLUSH_MS,
+    max_queue=ANALYSIS_WRITE_QUEUE_SIZE,
+    max_retries=ANALYSIS_WRITE_MAX_RETRIES
+)
+
+
+def get_analysis_writer_stats() -> dict:
+    return analysis_writer.stats()
@@ -0,0 +1,64 @@
+import re
+
+from app.core.config import CHUNK_MAX_WORDS, CHUNK_OVERLAP_WORDS
+
+# =========================
+# DOCUMENT CHUNKING
+# =========================
+# all-MiniLM-L6-v2 truncates input at 256 word-piece tokens, so long
+# resumes are split into windows that fit. Windows are bounded by word
+# count (roughly 1.3 word pieces per English word) so chunking never
+# needs the tokenizer or the model to be loaded.
+
+_SECTION_BREAK = re.compile(r"\n\s*\n")
+
+
+def _sliding_windows(words: list[str], max_words: int, overlap: int) -> list[str]:
+    step = max(max_words - overlap, 1)
+    windows = []
+
+    for start in range(0, len(words), step):
+        windows.append(" ".join(words[start:start + max_words]))
+        if start + max_words >= len(words):
+            break
+
+    return windows
+
+
+def split_into_chunks(
+    text: str,
+    max_words: int = CHUNK_MAX_WORDS,
+    overlap: int = CHUNK_OVERLAP_WORDS
+) -> list[str]:
+    """
+    Splits text into word-bounded chunks.
+    Blank-line separated sections are kept together and small neighbouring
+    sections are merged; sections longer than max_words are split into
+    overlapping sliding windows.
+    """
+    chunks = []
+    current: list[str] = []
+
+    for section in _SECTION_BREAK.split(text):
+        words = section.split()
+        if not words:
+            continue
+
+        if len(words) > max_words:
+            if current:
+                chunks.append(" ".join(current))
+                current = []
+            chunks.extend(_sliding_windows(words, max_words, overlap))
+            continue
+
+        if len(current) + len(words) > max_words:
+            chunks.append(" ".join(current))
+            current = []
+
+        current.extend(words)
+
+    if current:
+        chunks.append(" ".join(current))
+
+    # Always return at least one chunk so every document has a vector
+    return chunks or [" ".join(text.split())]
@@ -0,0 +1,114 @@
+import hashlib
+import logging
+from datetime import datetime
+
+import numpy as np
+from pymongo.errors import BulkWriteError
+
+from app.core.cache import LRUCache
+from app.core.config import (
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_CACHE_SIZE,
+    CHUNK_MAX_WORDS,
+    CHUNK_OVERLAP_WORDS
+)
+from app.db.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+db = get_database()
+
+# Per-process tier in front of the `embeddings` collection
+_lru = LRUCache(EMBEDDING_CACHE_SIZE)
+
+
+def embedding_key(text_hash: str) -> str:
+    """
+    Cache key for a document's chunk embeddings: SHA-256 of the model name,
+    the chunking settings and the content hash of the normalized text.
+    """
+    return hashlib.sha256(
+        f"{EMBEDDING_MODEL_NAME}:{CHUNK_MAX_WORDS}:{CHUNK_OVERLAP_WORDS}:{text_hash}"
+        .encode("utf-8")
+    ).hexdigest()
+
+
+def _to_bytes(matrix: np.ndarray) -> bytes:
+    return np.asarray(matrix, dtype=np.float32).tobytes()
+
+
+def _from_bytes(data: bytes, dim: int) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.float32).reshape(-1, dim)
+
+
+async def get_cached_embeddings(keys: list[str]) -> dict[str, np.ndarray]:
+    """
+    Returns the cached chunk matrices (chunks × dim) for the given keys,
+    LRU first, then MongoDB.
+    Keys that are not cached anywhere are left out of the result.
+    """
+    found = {}
+    missing = []
+
+    for key in dict.fromkeys(keys):
+        matrix = _lru.get(key)
+        if matrix is None:
+            missing.append(key)
+        else:
+            found[key] = matrix
+
+    if not missing:
+        return found
+
+    try:
+        cursor = db.embeddings.find(
+            {"_id": {"$in": missing}},
+            {"_id": 1, "dim": 1, "vectors": 1}
+        )
+        async for doc in cursor:
+            matrix = _from_bytes(doc["vectors"], doc["dim"])
+            _lru.put(doc["_id"], matrix)
+            found[doc["_id"]] = matrix
+
+    except Exception:
+        logger.warning("Embedding cache lookup failed", exc_info=True)
+
+    return found
+
+
+async def store_embeddings(matrices: dict[str, np.ndarray]) -> None:
+    """
+    Adds freshly computed chunk matrices to both cache tiers.
+    A failed write only costs a recompute later, so it is not raised.
+    """
+    if not matrices:
+        return
+
+    for key, matrix in matrices.items():
+        _lru.put(key, matrix)
+
+    now = datetime.utcnow()
+    docs = [
+        {
+            "_id": key,
+            "model": EMBEDDING_MODEL_NAME,
+            "chunks": int(matrix.shape[0]),
+            "dim": int(matrix.shape[1]),
+            "vectors": _to_bytes(matrix),
+            "createdAt": now,
+        }
+        for key, matrix in matrices.items()
+    ]
+
+    try:
+        await db.embeddings.insert_many(docs, ordered=False)
+    except BulkWriteError as exc:
+        # Duplicate keys mean another request cached the same text first
+        if any(error.get("code") != 11000 for error in exc.details.get("writeErrors", [])):
+            logger.warning("Embedding cache write failed", exc_info=True)
+    except Exception:
+        logger.warning("Embedding cache write failed", exc_info=True)
+
+
+def get_embedding_cache_stats() -> dict:
+    return _lru.stats()
@@ -2,6 +2,7 @@ from fastapi import HTTPException, status
 from bson import ObjectId
 from app.db.mongodb import get_database
 from app.models.jd_model import create_jd_document
+from app.services.vector_index_service import schedule_document_precompute
 
 db = get_database()
 
@@ -10,7 +11,8 @@ async def create_job_description(
     user_id: str,
     jd_text: str,
     jd_title: str | None = None,
-    company_name: str | None = None
+    company_name: str | None = None,
+    skill_profile: dict | None = None
 ) -> ObjectId:
     """
     Inserts a job description into MongoDB and returns the inserted ID.
@@ -20,11 +22,11 @@ async def create_job_description(
             user_id=user_id,
             jd_text=jd_text,
             jd_title=jd_title,
-            company_name=company_name
+            company_name=company_name,
+            skill_profile=skill_profile
         )
 
         result = await db.job_descriptions.insert_one(jd_doc)
-        return result.inserted_id
 
     except Exception:
         raise HTTPException(
@@ -32,6 +34,11 @@ async def create_job_description(
             detail="Failed to save job description"
         )
 
+    # ---------- Precompute embedding (background, best effort) ----------
+    schedule_document_precompute(user_id, "job_descriptions", str(result.inserted_id), jd_text)
+
+    return result.inserted_id
+
 
 async def list_user_job_descriptions(user_id: str):
     """
@@ -58,7 +65,7 @@ async def list_user_job_descriptions(user_id: str):
                 "id": str(doc["_id"]),
                 "jdTitle": doc.get("jdTitle"),
                 "companyName": doc.get("companyName"),
-                "createdAt": doc.get("createdAt"),
+                "createdAt": doc["createdAt"].isoformat(),
             })
 
         return job_descriptions
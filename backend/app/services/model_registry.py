@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+
+from app.core.config import EMBEDDING_MODEL_NAME
+from app.core.executor import run_in_inference_pool
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# MODEL REGISTRY
+# =========================
+# Models are loaded on first use (or by the startup preload task),
+# never at import time, so the app can accept requests immediately.
+
+_models: dict = {}
+_load_errors: dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def get_model(name: str = EMBEDDING_MODEL_NAME):
+    """
+    Returns the loaded model, loading it on first call.
+    Safe to call from several inference threads at once.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _lock:
+        if name not in _models:
+            # Heavy import (torch, transformers) deferred until needed
+            from sentence_transformers import SentenceTransformer
+
+            started = time.perf_counter()
+            try:
+                _models[name] = SentenceTransformer(name)
+            except Exception as exc:
+                _load_errors[name] = str(exc)
+                raise
+
+            _load_errors.pop(name, None)
+            logger.info(
+                "Loaded model %s in %.2fs", name, time.perf_counter() - started
+            )
+
+        return _models[name]
+
+
+def register_model(model, name: str = EMBEDDING_MODEL_NAME) -> None:
+    """
+    Installs an already-built model under name, e.g. a stand-in encoder
+    for benchmarks. Anything with SentenceTransformer's encode() works.
+    """
+    with _lock:
+        _models[name] = model
+        _load_errors.pop(name, None)
+
+
+def is_model_loaded(name: str = EMBEDDING_MODEL_NAME) -> bool:
+    return name in _models
+
+
+def get_model_status(name: str = EMBEDDING_MODEL_NAME) -> dict:
+    return {
+        "model": name,
+        "loaded": is_model_loaded(name),
+        "error": _load_errors.get(name),
+    }
+
+
+async def preload_model(name: str = EMBEDDING_MODEL_NAME) -> None:
+    """
+    Loads the model on the inference pool. Used as a background startup task.
+    """
+    try:
+        await run_in_inference_pool(get_model, name, timeout=None)
+    except Exception:
+        logger.exception("Background load of model %s failed", name)
+
+
+def _run_warmup(name: str, batch_size: int) -> dict:
+    started = time.perf_counter()
+    model = get_model(name)
+    loaded_at = time.perf_counter()
+
+    model.encode(
+        ["Warmup sentence for the embedding model."] * batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+    finished = time.perf_counter()
+
+    return {
+        "model": name,
+        "loadSeconds": round(loaded_at - started, 3),
+        "encodeSeconds": round(finished - loaded_at, 3),
+        "batchSize": batch_size,
+    }
+
+
+async def warmup_model(
+    batch_size: int,
+    name: str = EMBEDDING_MODEL_NAME
+) -> dict:
+    """
+    Loads the model (if needed) and encodes a dummy batch.
+    """
+    return await run_in_inference_pool(_run_warmup, name, batch_size, timeout=None)
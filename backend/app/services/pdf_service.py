@@ -1,23 +1,47 @@
 from fastapi import HTTPException, status
 from typing import ByteString
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import threading
 import fitz  # PyMuPDF
 
+from app.core.config import (
+    PDF_MAX_TEXT_CHARS,
+    PDF_PARALLEL_WORKERS,
+    PDF_PARALLEL_MIN_PAGES
+)
 
-async def read_pdf_bytes(file) -> ByteString:
+UPLOAD_READ_CHUNK_SIZE = 64 * 1024  # 64KB
+
+
+async def read_pdf_bytes(file, max_size: int) -> ByteString:
     """
-    Reads uploaded PDF file bytes safely.
-    Assumes file is already validated (PDF + size).
+    Reads the uploaded PDF once, in chunks, into a single buffer.
+    Starlette has already received the whole body by now, so this saves
+    a copy, not the upload: requests that declare an oversized
+    Content-Length are turned away earlier by BodySizeLimitMiddleware.
+    This check covers the rest (chunked requests).
     """
+    too_large = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"File size exceeds {max_size // (1024 * 1024)}MB limit"
+    )
+
+    # Size is known up front when the client sent it
+    if file.size is not None and file.size > max_size:
+        raise too_large
+
+    buffer = bytearray()
+
     try:
-        file_bytes = await file.read()
+        while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+            buffer.extend(chunk)
 
-        if not file_bytes:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail="Uploaded file is empty"
-            )
+            if len(buffer) > max_size:
+                raise too_large
 
-        return file_bytes
+    except HTTPException:
+        raise
 
     except Exception:
         raise HTTPException(
@@ -25,29 +49,158 @@ async def read_pdf_bytes(file) -> ByteString:
             detail="Failed to read PDF file"
         )
 
+    if not buffer:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Uploaded file is empty"
+        )
+
+    return bytes(buffer)
+
+
+# =========================
+# PAGE EXTRACTION
+# =========================
+
+def _collect_pages(doc, start: int, stop: int, max_chars: int) -> list[str]:
+    """
+    Extracts text from pages [start, stop), stopping early once
+    max_chars have been collected (0: no cap).
+    """
+    pages = []
+    collected = 0
+
+    for page_number in range(start, stop):
+        page_text = doc[page_number].get_text()
+
+        if page_text:
+            pages.append(page_text)
+            collected += len(page_text)
+
+        if max_chars and collected >= max_chars:
+            break
+
+    return pages
+
+
+def _extract_page_range(
+    pdf_bytes: ByteString,
+    start: int,
+    stop: int,
+    max_chars: int
+) -> list[str]:
+    """
+    Process-pool entry point: opens its own document, since PyMuPDF
+    objects cannot be shared across threads or processes.
+    """
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    return _collect_pages(doc, start, stop, max_chars)
+
+
+def _warm_up_worker() -> None:
+    # Importing this module in the child is the slow part of a spawn
+    return None
+
+
+_process_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+# Page ranges per worker: small enough that hitting the text cap
+# leaves most of a long document unextracted
+RANGES_PER_WORKER = 4
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+
+    with _pool_lock:
+        if _process_pool is None:
+            # spawn: never fork a process that has torch threads running
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PDF_PARALLEL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def start_pdf_pool() -> None:
+    """
+    Spawns the PDF worker processes ahead of the first large upload,
+    which would otherwise wait for them. Blocking; run it off the loop.
+    """
+    pool = _get_process_pool()
+    for future in [pool.submit(_warm_up_worker) for _ in range(PDF_PARALLEL_WORKERS)]:
+        future.result()
+
+
+def _extract_pages_parallel(pdf_bytes: ByteString, page_count: int) -> list[str]:
+    """
+    Splits the document into contiguous page ranges and extracts
+    them on the PDF process pool, preserving page order. Only
+    PDF_PARALLEL_WORKERS ranges are in flight at a time, so once the
+    text cap is reached no further pages are extracted.
+    """
+    per_range = -(-page_count // (PDF_PARALLEL_WORKERS * RANGES_PER_WORKER))  # ceil
+    starts = iter(range(0, page_count, per_range))
+    pool = _get_process_pool()
+
+    def submit_next(in_flight: list) -> None:
+        start = next(starts, None)
+        if start is not None:
+            in_flight.append(pool.submit(
+                _extract_page_range,
+                pdf_bytes,
+                start,
+                min(start + per_range, page_count),
+                PDF_MAX_TEXT_CHARS
+            ))
+
+    in_flight = []
+    for _ in range(PDF_PARALLEL_WORKERS):
+        submit_next(in_flight)
+
+    pages = []
+    collected = 0
+
+    try:
+        while in_flight:
+            # Oldest first keeps page order
+            ranged_pages = in_flight.pop(0).result()
+            pages.extend(ranged_pages)
+            collected += sum(len(page) for page in ranged_pages)
+
+            if PDF_MAX_TEXT_CHARS and collected >= PDF_MAX_TEXT_CHARS:
+                break
+
+            submit_next(in_flight)
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+    return pages
+
 
 def extract_text_from_pdf(pdf_bytes: ByteString) -> str:
     """
     Extracts text from a PDF using PyMuPDF.
-    Returns cleaned text string.
+    Returns cleaned text string, capped at PDF_MAX_TEXT_CHARS when set.
+    Large documents are extracted page-parallel.
     """
     try:
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        page_count = doc.page_count
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Invalid or corrupted PDF file"
         )
 
-    extracted_text = []
+    if PDF_PARALLEL_WORKERS > 1 and page_count >= PDF_PARALLEL_MIN_PAGES:
+        extracted_text = _extract_pages_parallel(pdf_bytes, page_count)
+    else:
+        extracted_text = _collect_pages(doc, 0, page_count, PDF_MAX_TEXT_CHARS)
 
-    for page in doc:
-        page_text = page.get_text()
-
-        if page_text:
-            extracted_text.append(page_text)
-
-    full_text = "\n".join(extracted_text).strip()
+    full_text = "\n".join(extracted_text).strip()[:PDF_MAX_TEXT_CHARS or None]
 
     # Handle image-only or empty PDFs
     if not full_text or len(full_text) < 50:
@@ -57,3 +210,13 @@ def extract_text_from_pdf(pdf_bytes: ByteString) -> str:
         )
 
     return full_text
+
+
+def shutdown_pdf_pool() -> None:
+    global _process_pool
+
+    with _pool_lock:
+        pool, _process_pool = _process_pool, None
+
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
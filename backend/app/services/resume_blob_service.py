@@ -0,0 +1,99 @@
+from datetime import datetime
+
+from pymongo.errors import DuplicateKeyError
+
+from app.core.executor import run_in_inference_pool
+from app.core.hashing import bytes_hash, content_hash
+from app.db.mongodb import get_database
+from app.services.analysis_service import build_skill_profile, is_skill_profile_current
+from app.services.pdf_service import extract_text_from_pdf
+
+db = get_database()
+
+# Resume text is content-addressed: one `resume_blobs` document per
+# distinct PDF, keyed by the SHA-256 of its bytes (`_id`, so the lookup
+# is a single unique-index hit). Resume records link to it through
+# `contentHash` instead of carrying their own copy of the text.
+
+
+def _extract_blob_fields(pdf_bytes: bytes) -> dict:
+    extracted_text = extract_text_from_pdf(pdf_bytes)
+
+    return {
+        "extractedText": extracted_text,
+        "textHash": content_hash(extracted_text),
+        "skillProfile": build_skill_profile(extracted_text),
+    }
+
+
+async def get_or_create_resume_blob(pdf_bytes: bytes) -> tuple[dict, bool]:
+    """
+    Returns the blob for these PDF bytes and whether it was just created.
+    Known PDFs skip extraction entirely; their skill profile is only
+    rebuilt if the taxonomy changed since it was stored.
+    """
+    blob_id = bytes_hash(pdf_bytes)
+
+    blob = await db.resume_blobs.find_one({"_id": blob_id})
+
+    if blob:
+        if not is_skill_profile_current(blob.get("skillProfile")):
+            blob["skillProfile"] = await run_in_inference_pool(
+                build_skill_profile, blob["extractedText"]
+            )
+            await db.resume_blobs.update_one(
+                {"_id": blob_id},
+                {"$set": {"skillProfile": blob["skillProfile"]}}
+            )
+        return blob, False
+
+    blob = {
+        "_id": blob_id,
+        **await run_in_inference_pool(_extract_blob_fields, pdf_bytes),
+        "sizeBytes": len(pdf_bytes),
+        "createdAt": datetime.utcnow(),
+    }
+
+    try:
+        await db.resume_blobs.insert_one(blob)
+    except DuplicateKeyError:
+        # Same PDF uploaded concurrently; the stored blob is equivalent
+        pass
+
+    return blob, True
+
+
+async def attach_resume_texts(resumes: list[dict]) -> list[dict]:
+    """
+    Fills `extractedText` on resume documents fetched without it, with
+    one $in query per source: resume_blobs for documents that link to a
+    blob, the resume itself for older documents that store it inline.
+    """
+    without_text = [resume for resume in resumes if "extractedText" not in resume]
+
+    linked = {resume["contentHash"] for resume in without_text if resume.get("contentHash")}
+    inline = [resume["_id"] for resume in without_text if not resume.get("contentHash")]
+
+    blob_texts = {}
+    if linked:
+        cursor = db.resume_blobs.find(
+            {"_id": {"$in": list(linked)}},
+            {"_id": 1, "extractedText": 1}
+        )
+        blob_texts = {blob["_id"]: blob["extractedText"] async for blob in cursor}
+
+    inline_texts = {}
+    if inline:
+        cursor = db.resumes.find(
+            {"_id": {"$in": inline}},
+            {"_id": 1, "extractedText": 1}
+        )
+        inline_texts = {doc["_id"]: doc.get("extractedText") async for doc in cursor}
+
+    for resume in without_text:
+        if resume.get("contentHash"):
+            resume["extractedText"] = blob_texts.get(resume["contentHash"], "")
+        else:
+            resume["extractedText"] = inline_texts.get(resume["_id"]) or ""
+
+    return resumes
@@ -2,6 +2,7 @@ from fastapi import HTTPException, status
 from bson import ObjectId
 from app.db.mongodb import get_database
 from app.models.resume_model import create_resume_document
+from app.services.vector_index_service import schedule_document_precompute
 
 db = get_database()
 
@@ -10,21 +11,23 @@ async def create_resume(
     user_id: str,
     resume_title: str | None,
     original_filename: str,
-    extracted_text: str
+    blob: dict
 ) -> ObjectId:
     """
-    Inserts a resume document into MongoDB and returns the inserted ID.
+    Inserts a resume document linked to its content blob
+    and returns the inserted ID.
     """
     try:
         resume_doc = create_resume_document(
             user_id=user_id,
             resume_title=resume_title,
             original_filename=original_filename,
-            extracted_text=extracted_text
+            content_hash=blob["_id"],
+            text_hash=blob["textHash"],
+            skill_profile=blob["skillProfile"]
         )
 
         result = await db.resumes.insert_one(resume_doc)
-        return result.inserted_id
 
     except Exception:
         raise HTTPException(
@@ -32,6 +35,11 @@ async def create_resume(
             detail="Failed to save resume"
         )
 
+    # ---------- Precompute embedding (background, best effort) ----------
+    schedule_document_precompute(user_id, "resumes", str(result.inserted_id), blob["extractedText"])
+
+    return result.inserted_id
+
 
 async def list_user_resumes(user_id: str):
     """
@@ -58,7 +66,7 @@ async def list_user_resumes(user_id: str):
                 "id": str(doc["_id"]),
                 "resumeTitle": doc.get("resumeTitle"),
                 "originalFileName": doc.get("originalFileName"),
-                "createdAt": doc.get("createdAt"),
+                "createdAt": doc["createdAt"].isoformat(),
             })
 
         return resumes
@@ -1,12 +1,221 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import asyncio
+import time
+
 import numpy as np
 
-# Load model ONCE (singleton-style)
-_model = SentenceTransformer("all-MiniLM-L6-v2")
+from app.core.config import (
+    EMBEDDING_BATCH_MAX_SIZE,
+    EMBEDDING_BATCH_MAX_WAIT_MS,
+    EMBEDDING_ENCODE_BATCH_SIZE,
+    SIMILARITY_POOLING,
+    SIMILARITY_TOP_K
+)
+from app.core.executor import run_in_inference_pool
+from app.core.hashing import content_hash
+from app.core.metrics import observe_encode
+from app.services.chunking_service import split_into_chunks
+from app.services.embedding_cache_service import (
+    embedding_key,
+    get_cached_embeddings,
+    store_embeddings
+)
+from app.services.model_registry import get_model
+
+
+def _encode_batch(texts: list[str]) -> np.ndarray:
+    """
+    Encodes texts in one model call (loading the model on first use).
+    SentenceTransformer sorts inputs by length internally, so each
+    mini-batch of EMBEDDING_ENCODE_BATCH_SIZE is padded only to the
+    longest text in its own length bucket.
+    """
+    model = get_model()
+
+    started = time.perf_counter()
+    vectors = model.encode(
+        texts,
+        batch_size=EMBEDDING_ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+    observe_encode(texts, time.perf_counter() - started)
+
+    return vectors
+
+
+# =========================
+# MICRO-BATCHER
+# =========================
+
+class EncodeBatcher:
+    """
+    Collects encode requests from concurrent coroutines for up to
+    max_wait_ms (or until max_batch texts are pending) and runs them
+    as a single encode call on the inference pool.
+    """
+
+    def __init__(self, max_batch: int, max_wait_ms: float):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+        # ---------- Metrics ----------
+        self.batches = 0
+        self.texts = 0
+        self.max_batch_seen = 0
+        self.last_batch_size = 0
+
+    async def encode(self, texts: list[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text, future))
+            futures.append(future)
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        vectors = await asyncio.gather(*futures)
+        return np.vstack(vectors)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = self._pending[:self.max_batch]
+            self._pending = self._pending[self.max_batch:]
+
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        # Identical texts in one window are encoded once
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        positions = {text: i for i, text in enumerate(unique_texts)}
+
+        self.batches += 1
+        self.texts += len(unique_texts)
+        self.last_batch_size = len(unique_texts)
+        self.max_batch_seen = max(self.max_batch_seen, len(unique_texts))
+
+        try:
+            vectors = await run_in_inference_pool(_encode_batch, unique_texts)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for text, future in batch:
+            if not future.done():
+                future.set_result(vectors[positions[text]])
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "avgBatchSize": round(self.texts / self.batches, 2) if self.batches else 0,
+            "maxBatchSize": self.max_batch_seen,
+            "lastBatchSize": self.last_batch_size,
+        }
+
 
+_batcher = EncodeBatcher(
+    max_batch=EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_ms=EMBEDDING_BATCH_MAX_WAIT_MS
+)
 
-def compute_similarity_score(
+
+async def encode_texts(texts: list[str]) -> np.ndarray:
+    """
+    Returns normalized embeddings for texts, batched with
+    any other encode requests in flight.
+    """
+    return await _batcher.encode(texts)
+
+
+def get_batcher_stats() -> dict:
+    return _batcher.stats()
+
+
+async def get_document_embeddings(texts: list[str]) -> list[np.ndarray]:
+    """
+    Returns one chunk matrix (chunks × dim, rows normalized) per text.
+    Cached matrices are reused; the chunks of all uncached texts are
+    encoded together and written back to the cache.
+    """
+    keys = [embedding_key(content_hash(text)) for text in texts]
+    matrices = await get_cached_embeddings(keys)
+
+    missing = {
+        key: split_into_chunks(text)
+        for key, text in zip(keys, texts)
+        if key not in matrices
+    }
+
+    if missing:
+        all_chunks = [chunk for chunks in missing.values() for chunk in chunks]
+        encoded = await encode_texts(all_chunks)
+
+        fresh = {}
+        offset = 0
+        for key, chunks in missing.items():
+            fresh[key] = encoded[offset:offset + len(chunks)]
+            offset += len(chunks)
+
+        await store_embeddings(fresh)
+        matrices.update(fresh)
+
+    return [matrices[key] for key in keys]
+
+
+async def get_embeddings_by_hash(text_hashes: list[str]) -> list[np.ndarray | None]:
+    """
+    Cached chunk matrices looked up by content hash alone, so callers
+    that stored the hash need not load the text. None where not cached.
+    """
+    keys = [embedding_key(text_hash) for text_hash in text_hashes]
+    matrices = await get_cached_embeddings(keys)
+
+    return [matrices.get(key) for key in keys]
+
+
+def pool_similarity(
+    resume_chunks: np.ndarray,
+    jd_chunks: np.ndarray,
+    pooling: str = SIMILARITY_POOLING,
+    top_k: int = SIMILARITY_TOP_K
+) -> float:
+    """
+    Reduces the JD-chunk × resume-chunk cosine matrix to one score.
+    - max:  best resume match for each JD chunk, averaged over the JD
+    - mean: average over every chunk pair
+    - topk: average of the top_k strongest chunk pairs
+    """
+    matrix = jd_chunks @ resume_chunks.T
+
+    if pooling == "mean":
+        return float(matrix.mean())
+
+    if pooling == "topk":
+        flat = matrix.ravel()
+        k = min(max(top_k, 1), flat.size)
+        return float(np.partition(flat, -k)[-k:].mean())
+
+    return float(matrix.max(axis=1).mean())
+
+
+async def compute_similarity_score(
     resume_text: str,
     jd_text: str
 ) -> int:
@@ -18,23 +227,13 @@ def compute_similarity_score(
     if not resume_text or not jd_text:
         return 0
 
-    # Generate embeddings
-    embeddings = _model.encode(
-        [resume_text, jd_text],
-        convert_to_numpy=True,
-        normalize_embeddings=True
+    resume_chunks, jd_chunks = await get_document_embeddings(
+        [resume_text, jd_text]
     )
 
-    resume_embedding = embeddings[0].reshape(1, -1)
-    jd_embedding = embeddings[1].reshape(1, -1)
-
-    # Cosine similarity
-    similarity = cosine_similarity(
-        resume_embedding,
-        jd_embedding
-    )[0][0]
+    similarity = pool_similarity(resume_chunks, jd_chunks)
 
     # Convert to percentage
-    similarity_score = round(float(similarity) * 100)
+    similarity_score = round(similarity * 100)
 
     return similarity_score
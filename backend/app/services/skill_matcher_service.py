@@ -0,0 +1,62 @@
+import re
+from collections import Counter
+
+# Alphanumeric runs and single punctuation marks are separate tokens, so
+# "CI/CD", "c++" and "node.js" survive tokenization and word boundaries
+# come for free (a token is always a whole alphanumeric run).
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[^\sa-z0-9]")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Counts skill mentions in a single left-to-right pass.
+    Every surface form (canonical name or alias) is stored as a token
+    sequence under its first token; at each position only phrases that
+    start with the current token are tried, longest first. Cost grows
+    with text length, not with the number of skills.
+    """
+
+    def __init__(self, canonical_skills: set[str], aliases: dict[str, str]):
+        surface_forms = {skill: skill for skill in canonical_skills}
+        surface_forms.update(aliases)
+
+        phrases: dict[str, list[tuple[list[str], str]]] = {}
+        for surface, canonical in surface_forms.items():
+            tokens = tokenize(surface)
+            if tokens:
+                phrases.setdefault(tokens[0], []).append((tokens, canonical))
+
+        for candidates in phrases.values():
+            candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+
+        self._phrases = phrases
+
+    def count(self, text: str) -> Counter:
+        """
+        Returns canonical skill → number of mentions in text.
+        """
+        return self.count_tokens(tokenize(text))
+
+    def count_tokens(self, tokens: list[str]) -> Counter:
+        """
+        Same as count() for text that is already tokenized.
+        """
+        counts = Counter()
+
+        position = 0
+        while position < len(tokens):
+            step = 1
+
+            for phrase, canonical in self._phrases.get(tokens[position], ()):
+                if tokens[position:position + len(phrase)] == phrase:
+                    counts[canonical] += 1
+                    step = len(phrase)
+                    break
+
+            position += step
+
+        return counts
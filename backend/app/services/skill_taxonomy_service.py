@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime
+
+from app.core.config import (
+    SKILL_TAXONOMY_SOURCE,
+    SKILL_TAXONOMY_PATH,
+    SKILL_TAXONOMY_RELOAD_SECONDS
+)
+from app.core.executor import run_in_inference_pool
+from app.db.mongodb import get_database
+from app.services.skill_matcher_service import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+db = get_database()
+
+
+# =========================
+# COMPILED TAXONOMY
+# =========================
+
+class SkillTaxonomy:
+    """
+    Immutable, compiled view of a skill taxonomy: the single-pass matcher
+    plus weight, priority and display-name tables. A new version is built
+    off to the side and swapped in as a whole, so a request always sees
+    one consistent taxonomy.
+    """
+
+    def __init__(self, definition: dict):
+        self.default_weight = int(definition.get("defaultWeight", 1))
+
+        skills = set()
+        aliases = {}
+        self.weights: dict[str, int] = {}
+        self.priorities: dict[str, str] = {}
+        self.display_names: dict[str, str] = {}
+
+        for entry in definition["skills"]:
+            name = entry["name"].lower()
+            skills.add(name)
+
+            if "weight" in entry:
+                self.weights[name] = int(entry["weight"])
+            if "priority" in entry:
+                self.priorities[name] = entry["priority"]
+            if "displayName" in entry:
+                self.display_names[name] = entry["displayName"]
+
+            for alias in entry.get("aliases", []):
+                aliases[alias.lower()] = name
+
+        self.skills = frozenset(skills)
+        self.aliases = aliases
+        self.matcher = SkillMatcher(self.skills, self.aliases)
+
+        # Declared version plus a content hash, so an edited file that
+        # forgot to bump its version still invalidates stored profiles
+        digest = hashlib.sha256(
+            json.dumps(definition["skills"], sort_keys=True).encode("utf-8")
+        ).hexdigest()[:8]
+        self.version = f"{definition.get('version', 'unversioned')}-{digest}"
+
+    def weight(self, skill: str) -> int:
+        return self.weights.get(skill, self.default_weight)
+
+    def display_name(self, skill: str) -> str:
+        return self.display_names.get(skill, skill.upper())
+
+    def summary(self) -> dict:
+        return {
+            "version": self.version,
+            "skills": len(self.skills),
+            "aliases": len(self.aliases),
+        }
+
+
+# =========================
+# LOADING
+# =========================
+
+def _read_taxonomy_file(path: str) -> dict:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _compile(definition: dict) -> SkillTaxonomy:
+    return SkillTaxonomy(definition)
+
+
+async def _load_definition() -> dict:
+    if SKILL_TAXONOMY_SOURCE == "mongodb":
+        doc = await db.skill_taxonomies.find_one(
+            {"active": True},
+            {"_id": 0, "version": 1, "defaultWeight": 1, "skills": 1},
+            sort=[("createdAt", -1)]
+        )
+        if doc:
+            return doc
+
+        logger.warning("No active taxonomy in MongoDB, using %s", SKILL_TAXONOMY_PATH)
+
+    return await run_in_inference_pool(_read_taxonomy_file, SKILL_TAXONOMY_PATH)
+
+
+# The bundled file is compiled at import so the app always has a taxonomy
+_current = _compile(_read_taxonomy_file(SKILL_TAXONOMY_PATH))
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """
+    Returns the active taxonomy. Callers should fetch it once per
+    operation and keep using that reference.
+    """
+    return _current
+
+
+def set_taxonomy(taxonomy: SkillTaxonomy) -> None:
+    global _current
+
+    # Single reference assignment: readers see the old or the new
+    # taxonomy, never a partially built one
+    _current = taxonomy
+
+
+async def reload_taxonomy() -> dict:
+    """
+    Loads the taxonomy from its configured source, compiles it on the
+    inference pool and swaps it in if the version changed.
+    """
+    definition = await _load_definition()
+    taxonomy = await run_in_inference_pool(_compile, definition, timeout=None)
+
+    previous = get_taxonomy().version
+    if taxonomy.version != previous:
+        set_taxonomy(taxonomy)
+        logger.info("Skill taxonomy swapped: %s -> %s", previous, taxonomy.version)
+
+    return {
+        **get_taxonomy().summary(),
+        "previousVersion": previous,
+        "reloaded": taxonomy.version != previous,
+        "checkedAt": datetime.utcnow().isoformat(),
+    }
+
+
+async def watch_taxonomy() -> None:
+    """
+    Background task: re-checks the taxonomy source every
+    SKILL_TAXONOMY_RELOAD_SECONDS so every worker picks up changes.
+    """
+    while True:
+        await asyncio.sleep(SKILL_TAXONOMY_RELOAD_SECONDS)
+
+        try:
+            await reload_taxonomy()
+        except Exception:
+            logger.exception("Skill taxonomy reload failed")
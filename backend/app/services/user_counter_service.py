@@ -0,0 +1,39 @@
+from bson import ObjectId
+
+from app.db.mongodb import get_database
+
+db = get_database()
+
+# Per-user document counts kept in `user_counters` ({_id: userId,
+# <collection>: n}) so list endpoints don't count_documents per request.
+# A counter is created on first read from a real count; inserts only
+# increment counters that already exist, so totals are approximate under
+# concurrent writes but never drift far from that backfill.
+
+
+async def increment_user_count(user_id: str, collection: str, amount: int = 1) -> None:
+    await db.user_counters.update_one(
+        {"_id": ObjectId(user_id), collection: {"$exists": True}},
+        {"$inc": {collection: amount}}
+    )
+
+
+async def get_user_count(user_id: str, collection: str) -> int:
+    counter = await db.user_counters.find_one(
+        {"_id": ObjectId(user_id)},
+        {collection: 1}
+    )
+
+    if counter and collection in counter:
+        return counter[collection]
+
+    # First read for this user: backfill from the collection
+    total = await db[collection].count_documents({"userId": ObjectId(user_id)})
+
+    await db.user_counters.update_one(
+        {"_id": ObjectId(user_id)},
+        {"$max": {collection: total}},
+        upsert=True
+    )
+
+    return total
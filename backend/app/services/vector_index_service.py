@@ -0,0 +1,326 @@
+import asyncio
+import logging
+import time
+
+import numpy as np
+from bson import ObjectId
+from fastapi import HTTPException, status
+
+from app.core.cache import LRUCache
+from app.core.config import (
+    SIMILARITY_POOLING,
+    SIMILARITY_TOP_K,
+    VECTOR_INDEX_MAX_USERS
+)
+from app.db.mongodb import get_database
+from app.services.resume_blob_service import attach_resume_texts
+from app.services.similarity_service import (
+    get_document_embeddings,
+    pool_similarity
+)
+
+logger = logging.getLogger(__name__)
+
+db = get_database()
+
+# Collection → field holding the document text
+TEXT_FIELDS = {
+    "resumes": "extractedText",
+    "job_descriptions": "jdText",
+}
+
+
+def _text_projection(collection: str) -> dict:
+    projection = {"_id": 1, TEXT_FIELDS[collection]: 1}
+
+    if collection == "resumes":
+        # Newer resumes link to their text in resume_blobs
+        projection["contentHash"] = 1
+
+    return projection
+
+
+async def _resolve_texts(collection: str, docs: list[dict]) -> list[dict]:
+    if collection == "resumes":
+        await attach_resume_texts(docs)
+
+    return docs
+
+
+# =========================
+# VECTOR INDEX
+# =========================
+
+class DocumentVectorIndex:
+    """
+    Brute-force index over one user's documents of one kind.
+    Each document keeps its chunk matrix; all chunks are stacked into a
+    single float32 matrix so a query is one matmul followed by a
+    per-document reduction, matching the pooling used by /analysis/run.
+    holds_jds tells which side is the job description: max pooling
+    always averages over the JD's chunks.
+    """
+
+    def __init__(self, holds_jds: bool = False):
+        self.holds_jds = holds_jds
+        self._chunks: dict[str, np.ndarray] = {}
+
+        # Stacked view, rebuilt lazily after any change
+        self._ids: list[str] = []
+        self._offsets: np.ndarray | None = None
+        self._matrix: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def ids(self) -> set[str]:
+        return set(self._chunks)
+
+    def upsert(self, doc_id: str, chunk_matrix: np.ndarray) -> None:
+        self._chunks[doc_id] = chunk_matrix
+        self._matrix = None
+
+    def remove(self, doc_id: str) -> None:
+        if self._chunks.pop(doc_id, None) is not None:
+            self._matrix = None
+
+    def _stack(self) -> None:
+        self._ids = list(self._chunks)
+        sizes = [len(self._chunks[doc_id]) for doc_id in self._ids]
+
+        self._offsets = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64)
+        self._matrix = np.vstack([self._chunks[doc_id] for doc_id in self._ids])
+
+    def _pair(self, indexed: np.ndarray, query: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # (resume_chunks, jd_chunks) in pool_similarity's order
+        return (query, indexed) if self.holds_jds else (indexed, query)
+
+    def search(
+        self,
+        query_chunks: np.ndarray,
+        top_k: int,
+        pooling: str = SIMILARITY_POOLING
+    ) -> list[tuple[str, float]]:
+        if not self._chunks:
+            return []
+
+        if self._matrix is None:
+            self._stack()
+
+        # rows: every indexed chunk, columns: query chunks
+        scores = self._matrix @ query_chunks.T
+        counts = np.diff(np.append(self._offsets, len(self._matrix)))
+
+        if pooling == "mean":
+            doc_scores = np.add.reduceat(scores, self._offsets, axis=0).sum(axis=1)
+            doc_scores = doc_scores / (counts * scores.shape[1])
+        elif pooling == "topk":
+            bounds = np.append(self._offsets, len(self._matrix))
+            doc_scores = np.array([
+                pool_similarity(
+                    *self._pair(self._matrix[start:end], query_chunks), "topk", SIMILARITY_TOP_K
+                )
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ])
+        elif self.holds_jds:
+            # best query (resume) chunk per indexed JD chunk, averaged over each JD
+            doc_scores = np.add.reduceat(scores.max(axis=1), self._offsets) / counts
+        else:
+            # best indexed (resume) chunk per query JD chunk, averaged over the JD
+            doc_scores = np.maximum.reduceat(scores, self._offsets, axis=0).mean(axis=1)
+
+        k = min(top_k, len(doc_scores))
+        best = np.argpartition(-doc_scores, k - 1)[:k]
+        best = best[np.argsort(-doc_scores[best])]
+
+        return [(self._ids[i], float(doc_scores[i])) for i in best]
+
+
+# One index per (user, collection), bounded to the most recently used users
+_indexes = LRUCache(VECTOR_INDEX_MAX_USERS)
+
+
+def _get_index(user_id: str, collection: str) -> DocumentVectorIndex:
+    key = (user_id, collection)
+    index = _indexes.get(key)
+
+    if index is None:
+        index = DocumentVectorIndex(holds_jds=collection == "job_descriptions")
+        _indexes.put(key, index)
+
+    return index
+
+
+def index_document(
+    user_id: str,
+    collection: str,
+    doc_id: str,
+    chunk_matrix: np.ndarray
+) -> None:
+    """
+    Adds a freshly uploaded document to the user's index if it is loaded.
+    Unloaded indexes pick the document up on their next sync.
+    """
+    index = _indexes.get((user_id, collection))
+    if index is not None:
+        index.upsert(doc_id, chunk_matrix)
+
+
+# Running precompute tasks; referenced so they are not garbage-collected
+_precompute_tasks: set[asyncio.Task] = set()
+
+
+async def _precompute_document(user_id: str, collection: str, doc_id: str, text: str) -> None:
+    try:
+        (chunk_matrix,) = await get_document_embeddings([text])
+        index_document(user_id, collection, doc_id, chunk_matrix)
+    except Exception:
+        # Not fatal: analysis and ranking embed lazily on first use
+        logger.warning("Embedding precompute failed for %s %s", collection, doc_id, exc_info=True)
+
+
+def schedule_document_precompute(user_id: str, collection: str, doc_id: str, text: str) -> None:
+    """
+    Embeds a new document in the background, so the upload response
+    does not wait for the model (or its first load). Re-uploads of known
+    text hit the embedding cache.
+    """
+    task = asyncio.create_task(_precompute_document(user_id, collection, doc_id, text))
+    _precompute_tasks.add(task)
+    task.add_done_callback(_precompute_tasks.discard)
+
+
+def remove_document(user_id: str, collection: str, doc_id: str) -> None:
+    """
+    Hook for delete paths: drops a document from the user's index.
+    """
+    index = _indexes.get((user_id, collection))
+    if index is not None:
+        index.remove(doc_id)
+
+
+async def _sync_index(user_id: str, collection: str) -> DocumentVectorIndex:
+    """
+    Brings the index in line with MongoDB: embeds documents it has not
+    seen (uploads handled by other workers, or the first build) and drops
+    documents that no longer exist. Only ids are read unless something
+    is missing.
+    """
+    index = _get_index(user_id, collection)
+
+    cursor = db[collection].find({"userId": ObjectId(user_id)}, {"_id": 1})
+    stored_ids = {str(doc["_id"]) async for doc in cursor}
+
+    indexed_ids = index.ids()
+
+    for doc_id in indexed_ids - stored_ids:
+        index.remove(doc_id)
+
+    new_ids = stored_ids - indexed_ids
+    if new_ids:
+        text_field = TEXT_FIELDS[collection]
+        cursor = db[collection].find(
+            {"_id": {"$in": [ObjectId(doc_id) for doc_id in new_ids]}},
+            _text_projection(collection)
+        )
+        docs = await _resolve_texts(collection, [doc async for doc in cursor])
+
+        matrices = await get_document_embeddings(
+            [doc.get(text_field) or "" for doc in docs]
+        )
+        for doc, matrix in zip(docs, matrices):
+            index.upsert(str(doc["_id"]), matrix)
+
+    return index
+
+
+# =========================
+# RANKING
+# =========================
+
+async def _fetch_query_document(user_id: str, collection: str, doc_id: str) -> dict:
+    doc = await db[collection].find_one(
+        {"_id": ObjectId(doc_id), "userId": ObjectId(user_id)},
+        _text_projection(collection)
+    )
+
+    if not doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found" if collection == "resumes" else "Job description not found"
+        )
+
+    (doc,) = await _resolve_texts(collection, [doc])
+    return doc
+
+
+async def _describe_documents(collection: str, doc_ids: list[str]) -> dict[str, dict]:
+    if collection == "resumes":
+        projection = {"_id": 1, "resumeTitle": 1, "originalFileName": 1}
+    else:
+        projection = {"_id": 1, "jdTitle": 1, "companyName": 1}
+
+    cursor = db[collection].find(
+        {"_id": {"$in": [ObjectId(doc_id) for doc_id in doc_ids]}},
+        projection
+    )
+
+    described = {}
+    async for doc in cursor:
+        if collection == "resumes":
+            title = doc.get("resumeTitle") or doc.get("originalFileName")
+            subtitle = doc.get("originalFileName")
+        else:
+            title = doc.get("jdTitle")
+            subtitle = doc.get("companyName")
+
+        described[str(doc["_id"])] = {"title": title, "subtitle": subtitle}
+
+    return described
+
+
+async def rank_documents(
+    user_id: str,
+    query_collection: str,
+    query_id: str,
+    target_collection: str,
+    top_k: int
+) -> dict:
+    """
+    Ranks the user's documents in target_collection against one
+    document from query_collection.
+    """
+    started = time.perf_counter()
+
+    query_doc = await _fetch_query_document(user_id, query_collection, query_id)
+    query_text = query_doc.get(TEXT_FIELDS[query_collection]) or ""
+
+    (query_chunks,) = await get_document_embeddings([query_text])
+    index = await _sync_index(user_id, target_collection)
+
+    hits = index.search(query_chunks, top_k)
+    described = await _describe_documents(target_collection, [doc_id for doc_id, _ in hits])
+
+    results = [
+        {
+            "id": doc_id,
+            "title": described.get(doc_id, {}).get("title"),
+            "subtitle": described.get(doc_id, {}).get("subtitle"),
+            "similarityScore": round(score * 100),
+        }
+        for doc_id, score in hits
+    ]
+
+    return {
+        "queryId": query_id,
+        "total": len(index),
+        "results": results,
+        "tookMs": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def get_vector_index_stats() -> dict:
+    return {
+        **_indexes.stats(),
+        "documents": sum(len(index) for index in _indexes.values()),
+    }
@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.core.config import (
+    ANALYSIS_JOB_WORKERS,
+    SKILL_TAXONOMY_SOURCE,
+    SKILL_TAXONOMY_RELOAD_SECONDS
+)
+from app.core.executor import shutdown_inference_pool
+from app.db.mongodb import connect_to_database, ping_database, close_database
+from app.services.analysis_job_service import analysis_job_worker
+from app.services.model_registry import preload_model
+from app.services.pdf_service import shutdown_pdf_pool
+from app.services.skill_taxonomy_service import reload_taxonomy, watch_taxonomy
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# STANDALONE JOB WORKER
+# =========================
+# Runs queued analyses (/analysis/run?async=true, /analysis/run-batch?async=true)
+# without serving HTTP, so inference capacity scales apart from API pods:
+#
+#     python -m app.worker --concurrency 4
+#
+# Run API pods with ANALYSIS_JOB_WORKERS=0 to leave all jobs to these.
+# Analyses are written directly (no write-behind buffer), so a job is
+# only marked succeeded once its analysis is stored.
+
+async def run_worker(concurrency: int) -> None:
+    connect_to_database()
+    await ping_database()
+
+    if SKILL_TAXONOMY_SOURCE == "mongodb":
+        await reload_taxonomy()
+
+    background_tasks = []
+    if SKILL_TAXONOMY_RELOAD_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(watch_taxonomy()))
+
+    # Loaded before the first job is claimed
+    await preload_model()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    analysis_job_worker.start(concurrency)
+    logger.info("Analysis job worker %s running %d jobs at a time", analysis_job_worker.worker_id, concurrency)
+
+    await stop.wait()
+
+    # ---------- Shutdown ----------
+    logger.info("Stopping: finishing running jobs")
+    await analysis_job_worker.stop()
+
+    for task in background_tasks:
+        task.cancel()
+
+    shutdown_inference_pool()
+    shutdown_pdf_pool()
+    close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run queued analysis jobs.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=max(ANALYSIS_JOB_WORKERS, 1),
+        help="jobs run at the same time (default: ANALYSIS_JOB_WORKERS)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(run_worker(args.concurrency))
@@ -0,0 +1,199 @@
+"""
+Per-request authentication overhead.
+
+Compares how protected requests were authenticated before and after
+the token cache:
+
+- jose-sync:   python-jose decode in a sync dependency (old behaviour;
+               FastAPI runs it on the threadpool)
+- <backend>:   uncached decode in the async dependency, per JWT backend
+- cached:      async dependency served from the verified-token cache
+
+Measured twice: the bare verification call (µs/op), and full requests
+against a one-route app over an in-process ASGI transport (requests/s
+and per-request latency), so the threadpool hop is included.
+
+Usage (from backend/):
+    python -m benchmarks.bench_auth
+    python -m benchmarks.bench_auth --calls 20000 --requests 2000 --tokens 50
+    python -m benchmarks.bench_auth --json results/auth.json
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000, help="verification calls per variant")
+    parser.add_argument("--requests", type=int, default=2000, help="HTTP requests per variant")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight")
+    parser.add_argument("--tokens", type=int, default=20, help="distinct tokens (users) in rotation")
+    parser.add_argument("--json", help="write results to this file")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+
+# Settings are read at import time
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-0123")
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, HTTPException  # noqa: E402
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from jose import JWTError, jwt as jose_jwt  # noqa: E402
+
+from app.core import jwt as app_jwt  # noqa: E402
+from app.core import token_cache  # noqa: E402
+from app.core.auth_dependency import get_current_user, security  # noqa: E402
+from app.core.config import JWT_ALGORITHM, JWT_SECRET  # noqa: E402
+from app.core.jwt import TokenError, create_access_token  # noqa: E402
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+# =========================
+# VARIANTS
+# =========================
+
+def jose_decode(token: str) -> dict:
+    return jose_jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+
+
+def jose_sync_dependency(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    # The dependency as it was before the token cache
+    try:
+        payload = jose_decode(credentials.credentials)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    return payload
+
+
+def uncached_dependency(decode):
+    async def dependency(credentials: HTTPAuthorizationCredentials = Depends(security)):
+        try:
+            payload = decode(credentials.credentials)
+        except TokenError:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+        if payload.get("sub") is None:
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+        return payload
+
+    return dependency
+
+
+def variants() -> list[tuple[str, object, object]]:
+    """
+    (name, verify function, FastAPI dependency)
+    """
+    found = [("jose-sync", jose_decode, jose_sync_dependency)]
+
+    decoders = {"jose": app_jwt._decode_with_jose}
+    if importlib.util.find_spec("jwt") is not None:
+        decoders["pyjwt"] = app_jwt._load_pyjwt_decoder()
+
+    for name, decode in decoders.items():
+        found.append((f"{name}-async", decode, uncached_dependency(decode)))
+
+    found.append((f"cached ({os.getenv('JWT_BACKEND', 'jose')})", token_cache.verify_token, get_current_user))
+    return found
+
+
+# =========================
+# MEASUREMENTS
+# =========================
+
+def bench_calls(verify, tokens: list[str]) -> float:
+    token_cache.clear_token_cache()
+
+    started = time.perf_counter()
+    for index in range(ARGS.calls):
+        verify(tokens[index % len(tokens)])
+    elapsed = time.perf_counter() - started
+
+    return elapsed / ARGS.calls * 1e6
+
+
+async def bench_requests(dependency, tokens: list[str]) -> dict:
+    token_cache.clear_token_cache()
+
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(current_user=Depends(dependency)):
+        return {"id": current_user["sub"]}
+
+    latencies: list[float] = []
+    counter = iter(range(ARGS.requests))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker():
+            for index in counter:
+                headers = {"Authorization": f"Bearer {tokens[index % len(tokens)]}"}
+                sent = time.perf_counter()
+                response = await client.get("/me", headers=headers)
+                latencies.append((time.perf_counter() - sent) * 1000)
+                assert response.status_code == 200, response.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(ARGS.concurrency)])
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requestsPerSec": round(ARGS.requests / elapsed, 1),
+        "p50Ms": round(percentile(latencies, 50), 3),
+        "p95Ms": round(percentile(latencies, 95), 3),
+        "p99Ms": round(percentile(latencies, 99), 3),
+    }
+
+
+async def main() -> list[dict]:
+    tokens = [
+        create_access_token({"sub": f"user-{index}", "role": "user"})
+        for index in range(ARGS.tokens)
+    ]
+
+    results = []
+    for name, verify, dependency in variants():
+        results.append({
+            "variant": name,
+            "verifyUs": round(bench_calls(verify, tokens), 2),
+            **await bench_requests(dependency, tokens),
+        })
+
+    return results
+
+
+if __name__ == "__main__":
+    results = asyncio.run(main())
+
+    print(f"calls={ARGS.calls} requests={ARGS.requests} concurrency={ARGS.concurrency} tokens={ARGS.tokens}")
+    header = f"{'variant':<16}{'verify µs':>11}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['variant']:<16}{row['verifyUs']:>11}{row['requestsPerSec']:>10}"
+            f"{row['p50Ms']:>9}{row['p95Ms']:>9}{row['p99Ms']:>9}"
+        )
+
+    if ARGS.json:
+        os.makedirs(os.path.dirname(ARGS.json) or ".", exist_ok=True)
+        with open(ARGS.json, "w", encoding="utf-8") as file:
+            json.dump({"args": vars(ARGS), "results": results}, file, indent=2)
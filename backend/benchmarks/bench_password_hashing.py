@@ -0,0 +1,163 @@
+"""
+Login throughput vs. concurrent analysis latency.
+
+Runs bursts of bcrypt verifications (what /auth/login does) while a probe
+coroutine performs a simulated analysis step (ATS scoring on skill
+profiles + chunk similarity) every few milliseconds. Compares:
+
+- inline: bcrypt called directly inside the coroutine (old behaviour)
+- pool:   bcrypt on the password executor (verify_and_update_password)
+
+Probe latency is measured from when the step was due to when it
+finished, so time spent waiting for a blocked event loop is included.
+
+Usage (from backend/):
+    python -m benchmarks.bench_password_hashing
+    python -m benchmarks.bench_password_hashing --rounds 12 --duration 5 --concurrency 1 4 16
+    python -m benchmarks.bench_password_hashing --json results/password.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor (BCRYPT_ROUNDS)")
+    parser.add_argument("--workers", type=int, default=2, help="password executor size (PASSWORD_HASH_MAX_WORKERS)")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per scenario")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="concurrent logins")
+    parser.add_argument("--probe-interval-ms", type=float, default=10.0)
+    parser.add_argument("--json", help="write results to this file")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+
+# Settings are read at import time
+os.environ["BCRYPT_ROUNDS"] = str(ARGS.rounds)
+os.environ["PASSWORD_HASH_MAX_WORKERS"] = str(ARGS.workers)
+# Only imported for the analysis code; no connection is made
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+
+import numpy as np  # noqa: E402
+
+from app.core.security import (  # noqa: E402
+    hash_password,
+    verify_password,
+    verify_and_update_password
+)
+from app.services.analysis_service import (  # noqa: E402
+    build_skill_profile,
+    run_ats_from_profiles
+)
+from app.services.similarity_service import pool_similarity  # noqa: E402
+
+RESUME = (
+    "Senior backend engineer: Python, FastAPI, Docker, Kubernetes, AWS, "
+    "MongoDB, PostgreSQL, Redis, Kafka, CI/CD, REST APIs, microservices. "
+) * 20
+JD = "Backend engineer with Python, Django, Docker, AWS, Kafka, RabbitMQ, CI/CD and GraphQL. " * 5
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def analysis_probe(stop: asyncio.Event, interval: float, latencies: list[float]) -> None:
+    resume_profile = build_skill_profile(RESUME)
+    jd_profile = build_skill_profile(JD)
+
+    rng = np.random.default_rng(0)
+    resume_chunks = rng.standard_normal((8, 384)).astype(np.float32)
+    jd_chunks = rng.standard_normal((3, 384)).astype(np.float32)
+
+    loop = asyncio.get_running_loop()
+
+    while not stop.is_set():
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+
+        run_ats_from_profiles(resume_profile, jd_profile)
+        pool_similarity(resume_chunks, jd_chunks)
+
+        latencies.append((loop.time() - scheduled) * 1000)
+
+
+async def login_worker(mode: str, stop: asyncio.Event, stored_hash: str, counter: list[int]) -> None:
+    while not stop.is_set():
+        if mode == "inline":
+            verify_password("correct horse battery staple", stored_hash)
+            await asyncio.sleep(0)
+        else:
+            await verify_and_update_password("correct horse battery staple", stored_hash)
+        counter[0] += 1
+
+
+async def run_scenario(mode: str, concurrency: int, stored_hash: str) -> dict:
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    counter = [0]
+
+    probe = asyncio.create_task(
+        analysis_probe(stop, ARGS.probe_interval_ms / 1000, latencies)
+    )
+    workers = [
+        asyncio.create_task(login_worker(mode, stop, stored_hash, counter))
+        for _ in range(concurrency)
+    ]
+
+    started = time.perf_counter()
+    await asyncio.sleep(ARGS.duration)
+    stop.set()
+    await asyncio.gather(probe, *workers)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "loginsPerSec": round(counter[0] / elapsed, 1),
+        "probeSamples": len(latencies),
+        "probeP50Ms": round(percentile(latencies, 50), 2),
+        "probeP95Ms": round(percentile(latencies, 95), 2),
+        "probeP99Ms": round(percentile(latencies, 99), 2),
+        "probeMaxMs": round(max(latencies, default=0.0), 2),
+        "probeMeanMs": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+    }
+
+
+async def main() -> list[dict]:
+    stored_hash = hash_password("correct horse battery staple")
+
+    results = []
+    for mode in ("inline", "pool"):
+        for concurrency in ARGS.concurrency:
+            results.append(await run_scenario(mode, concurrency, stored_hash))
+
+    return results
+
+
+if __name__ == "__main__":
+    results = asyncio.run(main())
+
+    print(f"bcrypt rounds={ARGS.rounds} workers={ARGS.workers} duration={ARGS.duration}s")
+    header = f"{'mode':<8}{'logins in flight':>18}{'logins/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['mode']:<8}{row['concurrency']:>18}{row['loginsPerSec']:>10}"
+            f"{row['probeP50Ms']:>9}{row['probeP95Ms']:>9}{row['probeP99Ms']:>9}{row['probeMaxMs']:>9}"
+        )
+
+    if ARGS.json:
+        os.makedirs(os.path.dirname(ARGS.json) or ".", exist_ok=True)
+        with open(ARGS.json, "w", encoding="utf-8") as file:
+            json.dump({"rounds": ARGS.rounds, "workers": ARGS.workers, "results": results}, file, indent=2)
@@ -0,0 +1,316 @@
+"""
+Analysis pipeline benchmark suite.
+
+Measures each stage of the analysis pipeline on synthetic resumes and job
+descriptions of varying length and skill density, PDF extraction on
+generated PDFs, and end-to-end POST /analysis/run through an in-process
+ASGI client. Reports throughput and p50/p95/p99 and can save a JSON
+results file; compare two of them with benchmarks/compare.py.
+
+Stages:
+    preprocess    preprocess_text
+    skills        build_skill_profile (tokenize + single-pass skill match)
+    match         run_ats_from_profiles (matching, scoring, feedback)
+    ats_score     calculate_ats_score
+    chunking      split_into_chunks
+    embedding     encode of a resume's chunks (the model, or --encoder hash)
+    similarity    pool_similarity on chunk matrices
+    pdf           extract_text_from_pdf on generated PDFs
+    e2e           POST /analysis/run: cold (new pair) and warm (cached result);
+                  also checks that both /analysis/rank directions score a
+                  pair exactly as /analysis/run does
+
+End-to-end runs use mongomock-motor as the MongoDB stand-in
+(pip install -r requirements-dev.txt) unless --mongo-uri points at a real server;
+pass a throwaway database, the benchmark writes to it.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pipeline --encoder hash
+    python -m benchmarks.bench_pipeline --stages skills match pdf --sizes 300 3000
+    python -m benchmarks.bench_pipeline --encoder hash --json results/$(git rev-parse --short HEAD).json
+"""
+import argparse
+import asyncio
+import os
+
+STAGES = ("preprocess", "skills", "match", "ats_score", "chunking", "embedding", "similarity", "pdf", "e2e")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[300, 1000, 3000], help="resume length in words")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.02, 0.1], help="fraction of words that are skills")
+    parser.add_argument("--jd-ratio", type=float, default=0.25, help="JD length as a fraction of the resume length")
+    parser.add_argument("--pdf-pages", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--iterations", type=int, default=200, help="timed iterations per case")
+    parser.add_argument("--e2e-iterations", type=int, default=100)
+    parser.add_argument("--e2e-words", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=1, help="requests in flight for e2e")
+    parser.add_argument("--encoder", choices=("model", "hash"), default="model",
+                        help="hash: deterministic stand-in instead of the sentence-transformers model")
+    parser.add_argument("--mongo-uri", help="real MongoDB for e2e instead of mongomock-motor")
+    parser.add_argument("--json", help="write results to this file")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+
+# Settings are read at import time
+if ARGS.mongo_uri:
+    os.environ["MONGO_URI"] = ARGS.mongo_uri
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-0123")
+# Only the benchmark user is registered; its hash cost is not measured
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ["MODEL_PRELOAD_ON_STARTUP"] = "false"
+
+import httpx  # noqa: E402
+
+from app.services.analysis_service import (  # noqa: E402
+    build_skill_profile,
+    calculate_ats_score,
+    preprocess_text,
+    run_ats_from_profiles
+)
+from app.services.chunking_service import split_into_chunks  # noqa: E402
+from app.services.model_registry import get_model, register_model  # noqa: E402
+from app.services.pdf_service import extract_text_from_pdf, shutdown_pdf_pool  # noqa: E402
+from app.services.similarity_service import _encode_batch, pool_similarity  # noqa: E402
+
+from benchmarks.common import measure, measure_async, print_table, write_results  # noqa: E402
+from benchmarks.synthetic import HashEncoder, make_job_description, make_pdf, make_resume  # noqa: E402
+
+# Words per generated PDF page (fits one page at the generator's font size)
+PDF_WORDS_PER_PAGE = 300
+
+
+def text_cases():
+    for words in ARGS.sizes:
+        for density in ARGS.densities:
+            jd_words = max(int(words * ARGS.jd_ratio), 50)
+            yield (
+                f"words={words} density={density}",
+                make_resume(words, density),
+                make_job_description(jd_words, density)
+            )
+
+
+def result(benchmark: str, case: str, summary: dict) -> dict:
+    return {"benchmark": benchmark, "case": case, **summary}
+
+
+# =========================
+# STAGE BENCHMARKS
+# =========================
+
+def bench_text_stages() -> list[dict]:
+    results = []
+    iterations = ARGS.iterations
+
+    for case, resume, jd in text_cases():
+        resume_profile = build_skill_profile(resume)
+        jd_profile = build_skill_profile(jd)
+
+        resume_skills = set(resume_profile["skills"])
+        matched = [skill for skill in jd_profile["skills"] if skill in resume_skills]
+        missing = [skill for skill in jd_profile["skills"] if skill not in resume_skills]
+
+        if "preprocess" in ARGS.stages:
+            results.append(result("preprocess", case, measure(lambda: preprocess_text(resume), iterations)))
+
+        if "skills" in ARGS.stages:
+            results.append(result("skills", case, measure(lambda: build_skill_profile(resume), iterations)))
+
+        if "match" in ARGS.stages:
+            results.append(result(
+                "match", case,
+                measure(lambda: run_ats_from_profiles(resume_profile, jd_profile), iterations)
+            ))
+
+        if "ats_score" in ARGS.stages:
+            results.append(result(
+                "ats_score", case,
+                measure(lambda: calculate_ats_score(matched, missing), iterations)
+            ))
+
+        if "chunking" in ARGS.stages:
+            results.append(result("chunking", case, measure(lambda: split_into_chunks(resume), iterations)))
+
+        resume_chunks = split_into_chunks(resume)
+        if "embedding" in ARGS.stages:
+            # Model inference is orders of magnitude slower than the rest
+            results.append(result(
+                "embedding", f"{case} chunks={len(resume_chunks)}",
+                measure(lambda: _encode_batch(resume_chunks), max(iterations // 10, 5), warmup=1)
+            ))
+
+        if "similarity" in ARGS.stages:
+            resume_matrix = _encode_batch(resume_chunks)
+            jd_matrix = _encode_batch(split_into_chunks(jd))
+            results.append(result(
+                "similarity", case,
+                measure(lambda: pool_similarity(resume_matrix, jd_matrix), iterations)
+            ))
+
+    return results
+
+
+def bench_pdf() -> list[dict]:
+    results = []
+
+    for pages in ARGS.pdf_pages:
+        pdf_bytes = make_pdf(make_resume(PDF_WORDS_PER_PAGE * pages, 0.05), pages)
+        iterations = max(ARGS.iterations // pages, 10)
+
+        results.append(result(
+            "pdf_extract", f"pages={pages}",
+            measure(lambda: extract_text_from_pdf(pdf_bytes), iterations, warmup=2)
+        ))
+
+    shutdown_pdf_pool()
+    return results
+
+
+# =========================
+# END TO END
+# =========================
+
+def _connect_stand_in() -> None:
+    from app.db.mongodb import connect_to_database
+
+    if ARGS.mongo_uri:
+        connect_to_database()
+        return
+
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("e2e needs mongomock-motor (pip install -r requirements-dev.txt) or --mongo-uri")
+
+    connect_to_database(client=AsyncMongoMockClient())
+
+
+async def _upload_pair(client, headers: dict, seed: int) -> dict:
+    resume = make_resume(ARGS.e2e_words, 0.05, seed=seed)
+    jd = make_job_description(max(int(ARGS.e2e_words * ARGS.jd_ratio), 50), 0.05, seed=seed)
+    pages = -(-ARGS.e2e_words // PDF_WORDS_PER_PAGE)
+
+    uploaded = await client.post(
+        "/resumes/upload",
+        headers=headers,
+        files={"file": (f"resume-{seed}.pdf", make_pdf(resume, pages), "application/pdf")},
+        data={"resumeTitle": f"Resume {seed}"}
+    )
+    created = await client.post(
+        "/job-descriptions",
+        headers=headers,
+        json={"jdTitle": f"JD {seed}", "jdText": jd}
+    )
+    uploaded.raise_for_status()
+    created.raise_for_status()
+
+    return {
+        "resumeId": uploaded.json()["resume"]["id"],
+        "jobDescriptionId": created.json()["jobDescription"]["id"],
+    }
+
+
+async def check_rank_consistency(client, headers: dict, pair: dict, similarity_score: int) -> None:
+    """
+    Both ranking directions must score a pair like /analysis/run did.
+    """
+    directions = (
+        ("/analysis/rank/resumes", "jobDescriptionId", "resumeId"),
+        ("/analysis/rank/job-descriptions", "resumeId", "jobDescriptionId"),
+    )
+
+    for path, query_key, target_key in directions:
+        response = await client.get(
+            path, headers=headers, params={query_key: pair[query_key], "limit": 100}
+        )
+        response.raise_for_status()
+
+        scores = {hit["id"]: hit["similarityScore"] for hit in response.json()["results"]}
+        if scores.get(pair[target_key]) != similarity_score:
+            raise SystemExit(
+                f"{path} scored {pair} {scores.get(pair[target_key])}, "
+                f"/analysis/run scored it {similarity_score}"
+            )
+
+
+async def bench_e2e() -> list[dict]:
+    _connect_stand_in()
+
+    from app.main import app
+
+    results = []
+    warmup = 3
+    iterations = ARGS.e2e_iterations
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            credentials = {"name": "Bench", "email": "bench@example.com", "password": "benchmark-password"}
+            await client.post("/auth/register", json=credentials)
+            login = await client.post("/auth/login", json=credentials)
+            headers = {"Authorization": f"Bearer {login.json()['token']}"}
+
+            # Upload cost is not measured; each cold run gets its own pair
+            pairs = [await _upload_pair(client, headers, seed) for seed in range(warmup)]
+
+            async def run(pair: dict) -> dict:
+                response = await client.post("/analysis/run", headers=headers, json=pair)
+                response.raise_for_status()
+                return response.json()["analysis"]
+
+            case = f"words={ARGS.e2e_words} concurrency={ARGS.concurrency}"
+
+            # The first pairs warm the process up and are reused for warm runs
+            for pair in pairs[:warmup]:
+                analysis = await run(pair)
+                await check_rank_consistency(client, headers, pair, analysis["scores"]["similarityScore"])
+
+            # Uploaded after the check so the ranked pair is always in the top results
+            pairs += [await _upload_pair(client, headers, seed) for seed in range(warmup, warmup + iterations)]
+
+            cold = await measure_async(
+                lambda index: run(pairs[warmup + index]), iterations,
+                concurrency=ARGS.concurrency, warmup=0
+            )
+            results.append(result("analysis_run_cold", case, cold))
+
+            warm = await measure_async(
+                lambda index: run(pairs[index % warmup]), iterations,
+                concurrency=ARGS.concurrency, warmup=0
+            )
+            results.append(result("analysis_run_warm", case, warm))
+
+    return results
+
+
+async def main() -> list[dict]:
+    if ARGS.encoder == "hash":
+        register_model(HashEncoder())
+    else:
+        get_model()
+
+    results = bench_text_stages()
+
+    if "pdf" in ARGS.stages:
+        results.extend(bench_pdf())
+
+    if "e2e" in ARGS.stages:
+        results.extend(await bench_e2e())
+
+    return results
+
+
+if __name__ == "__main__":
+    results = asyncio.run(main())
+
+    print(f"encoder={ARGS.encoder} iterations={ARGS.iterations} e2e-iterations={ARGS.e2e_iterations}")
+    print_table(results)
+
+    if ARGS.json:
+        write_results(ARGS.json, "pipeline", vars(ARGS), results)
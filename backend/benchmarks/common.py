@@ -0,0 +1,124 @@
+"""
+Shared helpers for the benchmark scripts: timing loops, percentile
+summaries and result files that benchmarks/compare.py can diff.
+"""
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(durations_s: list[float], wall_s: float | None = None) -> dict:
+    """
+    Per-operation latency percentiles (ms) and throughput. Throughput uses
+    wall time when operations overlapped (concurrent runs), otherwise the
+    sum of the individual durations.
+    """
+    samples_ms = [duration * 1000 for duration in durations_s]
+    elapsed = wall_s if wall_s is not None else sum(durations_s)
+
+    return {
+        "iterations": len(samples_ms),
+        "opsPerSec": round(len(samples_ms) / elapsed, 2) if elapsed else 0.0,
+        "meanMs": round(statistics.fmean(samples_ms), 4) if samples_ms else 0.0,
+        "p50Ms": round(percentile(samples_ms, 50), 4),
+        "p95Ms": round(percentile(samples_ms, 95), 4),
+        "p99Ms": round(percentile(samples_ms, 99), 4),
+    }
+
+
+def measure(fn, iterations: int, warmup: int = 3) -> dict:
+    """
+    Times fn() iterations times after a few untimed warmup calls.
+    """
+    for _ in range(warmup):
+        fn()
+
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+
+    return summarize(durations)
+
+
+async def measure_async(fn, iterations: int, concurrency: int = 1, warmup: int = 3) -> dict:
+    """
+    Awaits fn(i) for i in range(iterations), `concurrency` at a time.
+    """
+    for index in range(warmup):
+        await fn(index)
+
+    durations = []
+    indexes = iter(range(iterations))
+
+    async def worker():
+        for index in indexes:
+            started = time.perf_counter()
+            await fn(index)
+            durations.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    wall = time.perf_counter() - started
+
+    return summarize(durations, wall if concurrency > 1 else None)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(path: str, suite: str, args: dict, results: list[dict]) -> None:
+    """
+    Results file layout read by compare.py: every entry in `results`
+    has a `benchmark` and a `case` that identify it across runs.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(
+            {"suite": suite, "environment": environment(), "args": args, "results": results},
+            file,
+            indent=2
+        )
+
+
+def print_table(results: list[dict]) -> None:
+    header = f"{'benchmark':<22}{'case':<30}{'ops/s':>11}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['benchmark']:<22}{row['case']:<30}{row['opsPerSec']:>11}"
+            f"{row['p50Ms']:>11}{row['p95Ms']:>11}{row['p99Ms']:>11}"
+        )
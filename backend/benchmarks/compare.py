@@ -0,0 +1,103 @@
+"""
+Compares two benchmark result files and flags regressions.
+
+Results are matched by (benchmark, case). A case regresses when its
+latency percentile grows by more than --threshold percent over the
+baseline; the exit status is 1 if any case regressed, so this can gate CI.
+Keep both runs on the same machine and settings: numbers from different
+hardware are not comparable.
+
+Usage (from backend/):
+    python -m benchmarks.compare results/base.json results/head.json
+    python -m benchmarks.compare base.json head.json --metric p95Ms --threshold 15
+"""
+import argparse
+import json
+import sys
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", choices=("p50Ms", "p95Ms", "p99Ms", "meanMs"), default="p50Ms")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+    parser.add_argument("--min-ms", type=float, default=0.01,
+                        help="ignore cases faster than this in both runs (timer noise)")
+    return parser.parse_args()
+
+
+def load(path: str) -> tuple[dict, dict]:
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+
+    results = {(row["benchmark"], row["case"]): row for row in data["results"]}
+    return data.get("environment", {}), results
+
+
+def compare(baseline: dict, candidate: dict, metric: str, threshold: float, min_ms: float) -> list[dict]:
+    rows = []
+
+    for key in sorted(baseline.keys() | candidate.keys()):
+        before = baseline.get(key, {}).get(metric)
+        after = candidate.get(key, {}).get(metric)
+
+        if before is None or after is None:
+            status = "added" if before is None else "removed"
+            change = None
+        else:
+            change = (after - before) / before * 100 if before else 0.0
+            if max(before, after) < min_ms:
+                status = "noise"
+            elif change > threshold:
+                status = "REGRESSED"
+            elif change < -threshold:
+                status = "improved"
+            else:
+                status = "same"
+
+        rows.append({
+            "benchmark": key[0],
+            "case": key[1],
+            "before": before,
+            "after": after,
+            "change": change,
+            "status": status,
+        })
+
+    return rows
+
+
+def main() -> int:
+    args = parse_args()
+
+    base_env, baseline = load(args.baseline)
+    head_env, candidate = load(args.candidate)
+
+    print(f"baseline:  {base_env.get('commit')} ({base_env.get('timestamp')})")
+    print(f"candidate: {head_env.get('commit')} ({head_env.get('timestamp')})")
+    if base_env.get("platform") != head_env.get("platform") or base_env.get("cpus") != head_env.get("cpus"):
+        print("warning: results come from different machines")
+
+    rows = compare(baseline, candidate, args.metric, args.threshold, args.min_ms)
+
+    header = f"{'benchmark':<22}{'case':<30}{'before':>11}{'after':>11}{'change':>10}  status"
+    print(f"\n{args.metric}, threshold {args.threshold}%")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        change = "" if row["change"] is None else f"{row['change']:+.1f}%"
+        before = "" if row["before"] is None else row["before"]
+        after = "" if row["after"] is None else row["after"]
+        print(f"{row['benchmark']:<22}{row['case']:<30}{before:>11}{after:>11}{change:>10}  {row['status']}")
+
+    regressed = [row for row in rows if row["status"] == "REGRESSED"]
+    if regressed:
+        print(f"\n{len(regressed)} regression(s) above {args.threshold}%")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,404 @@
+"""
+Load-test scenario runner.
+
+Drives the real app (lifespan included) in-process over httpx's ASGI
+transport against a MongoDB stand-in, with closed-loop virtual users at
+increasing concurrency, and reports concurrency-vs-latency curves.
+
+Scenarios:
+    mixed      weighted mix of the traffic below (--mix)
+    login      POST /auth/login (bcrypt)
+    upload     POST /resumes/upload with a new PDF (extraction, profile, embeddings)
+    jd         POST /job-descriptions
+    analysis   POST /analysis/run on the user's resumes x JDs
+    history    GET /analysis/history, first page and the next one
+
+An event-loop lag probe runs alongside every scenario: a coroutine that
+asks to wake up every --lag-interval-ms and records how late it was.
+Lag that grows with concurrency means work is running on the event loop
+instead of a pool, and it shows up as latency for every request in
+flight, not only the one doing the work. Running each path on its own
+shows which one collapses first.
+
+Everything is in one process, so the numbers include the client's own
+overhead; compare levels and scenarios with each other, not with a
+deployed server. mongomock-motor executes queries synchronously on the
+event loop, so with the default stand-in, database time counts as loop
+lag too; point --mongo-uri at a throwaway database to separate the two.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest --encoder hash
+    python -m benchmarks.loadtest --scenarios analysis upload --concurrency 1 8 32 --duration 10
+    python -m benchmarks.loadtest --encoder hash --mix run=60,history=25,jd=10,upload=4,login=1 --json results/load.json
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import time
+from collections import defaultdict
+
+SCENARIOS = ("mixed", "login", "upload", "jd", "analysis", "history")
+DEFAULT_MIX = "analysis=45,history=30,jd=10,upload=10,login=5"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64], help="virtual users per level")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario and level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weights of the mixed scenario")
+    parser.add_argument("--users", type=int, default=8, help="registered accounts the virtual users share")
+    parser.add_argument("--seed-documents", type=int, default=4, help="resumes and JDs created per account up front")
+    parser.add_argument("--resume-words", type=int, default=600)
+    parser.add_argument("--upload-pool", type=int, default=500,
+                        help="distinct PDFs generated up front (beyond that they are generated during the run)")
+    parser.add_argument("--bcrypt-rounds", type=int, help="override BCRYPT_ROUNDS (default: the app's)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between a virtual user's requests")
+    parser.add_argument("--lag-interval-ms", type=float, default=5.0)
+    parser.add_argument("--encoder", choices=("model", "hash"), default="model",
+                        help="hash: deterministic stand-in instead of the sentence-transformers model")
+    parser.add_argument("--mongo-uri", help="real MongoDB instead of mongomock-motor (use a throwaway database)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+
+# Settings are read at import time
+if ARGS.mongo_uri:
+    os.environ["MONGO_URI"] = ARGS.mongo_uri
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-0123")
+if ARGS.bcrypt_rounds:
+    os.environ["BCRYPT_ROUNDS"] = str(ARGS.bcrypt_rounds)
+os.environ["MODEL_PRELOAD_ON_STARTUP"] = "false"
+
+import httpx  # noqa: E402
+
+from app.db.mongodb import connect_to_database  # noqa: E402
+from app.services.model_registry import get_model, register_model  # noqa: E402
+
+from benchmarks.common import percentile, print_table, summarize, write_results  # noqa: E402
+from benchmarks.synthetic import HashEncoder, make_job_description, make_pdf, make_resume  # noqa: E402
+
+PASSWORD = "load-test-password"
+PDF_WORDS_PER_PAGE = 300
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name == "run":
+            name = "analysis"
+        if name not in SCENARIOS or name == "mixed":
+            raise SystemExit(f"Unknown operation in --mix: {name!r}")
+        mix[name] = int(weight)
+    return mix
+
+
+# =========================
+# VIRTUAL USERS
+# =========================
+
+class Account:
+    def __init__(self, email: str):
+        self.email = email
+        self.headers: dict = {}
+        self.resume_ids: list[str] = []
+        self.jd_ids: list[str] = []
+
+
+class Traffic:
+    """
+    The operations a virtual user can perform, each one request flow
+    against the shared client. Raises on any unexpected status.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, accounts: list[Account]):
+        self.client = client
+        self.accounts = accounts
+        # Every upload and JD is new content, so dedup never short-circuits it
+        self._document_seeds = itertools.count(10_000)
+        self._pdfs: list[tuple[int, bytes]] = []
+
+    def prepare_uploads(self, count: int) -> None:
+        """
+        Generates PDFs ahead of the run, so building them on the shared
+        event loop is not measured as server-side latency and loop lag.
+        """
+        self._pdfs = [self._make_pdf(next(self._document_seeds)) for _ in range(count)]
+        self._pdfs.reverse()
+
+    def _make_pdf(self, seed: int) -> tuple[int, bytes]:
+        rng = random.Random(seed)
+        text = make_resume(ARGS.resume_words, rng.choice((0.02, 0.05, 0.1)), seed=seed)
+        pages = -(-ARGS.resume_words // PDF_WORDS_PER_PAGE)
+        return seed, make_pdf(text, pages)
+
+    def _check(self, response: httpx.Response, *expected: int) -> httpx.Response:
+        if response.status_code not in expected:
+            raise RuntimeError(f"{response.request.method} {response.request.url.path}: {response.status_code}")
+        return response
+
+    async def login(self, account: Account, rng: random.Random) -> None:
+        response = await self.client.post("/auth/login", json={"email": account.email, "password": PASSWORD})
+        self._check(response, 200)
+        account.headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
+    async def upload(self, account: Account, rng: random.Random) -> None:
+        seed, pdf_bytes = self._pdfs.pop() if self._pdfs else self._make_pdf(next(self._document_seeds))
+
+        response = await self.client.post(
+            "/resumes/upload",
+            headers=account.headers,
+            files={"file": (f"resume-{seed}.pdf", pdf_bytes, "application/pdf")},
+            data={"resumeTitle": f"Resume {seed}"}
+        )
+        self._check(response, 201)
+        account.resume_ids.append(response.json()["resume"]["id"])
+
+    async def jd(self, account: Account, rng: random.Random) -> None:
+        seed = next(self._document_seeds)
+        text = make_job_description(max(ARGS.resume_words // 4, 50), rng.choice((0.05, 0.1)), seed=seed)
+
+        response = await self.client.post(
+            "/job-descriptions",
+            headers=account.headers,
+            json={"jdTitle": f"JD {seed}", "jdText": text}
+        )
+        self._check(response, 201)
+        account.jd_ids.append(response.json()["jobDescription"]["id"])
+
+    async def analysis(self, account: Account, rng: random.Random) -> None:
+        response = await self.client.post(
+            "/analysis/run",
+            headers=account.headers,
+            json={
+                "resumeId": rng.choice(account.resume_ids),
+                "jobDescriptionId": rng.choice(account.jd_ids),
+            }
+        )
+        self._check(response, 200)
+
+    async def history(self, account: Account, rng: random.Random) -> None:
+        response = await self.client.get("/analysis/history", headers=account.headers, params={"limit": 10})
+        self._check(response, 200)
+
+        next_cursor = response.json().get("nextCursor")
+        if next_cursor:
+            response = await self.client.get(
+                "/analysis/history",
+                headers=account.headers,
+                params={"limit": 10, "cursor": next_cursor}
+            )
+            self._check(response, 200)
+
+
+async def lag_probe(stop: asyncio.Event, samples: list[float]) -> None:
+    loop = asyncio.get_running_loop()
+    interval = ARGS.lag_interval_ms / 1000
+
+    while not stop.is_set():
+        due = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(loop.time() - due, 0.0) * 1000)
+
+
+async def run_level(traffic: Traffic, scenario: str, concurrency: int, mix: dict[str, int]) -> dict:
+    operations = list(mix) if scenario == "mixed" else [scenario]
+    weights = [mix[name] for name in operations] if scenario == "mixed" else [1]
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    lag: list[float] = []
+
+    stop = asyncio.Event()
+    deadline = time.perf_counter() + ARGS.duration
+
+    async def virtual_user(index: int) -> None:
+        rng = random.Random(f"{ARGS.seed}-{scenario}-{concurrency}-{index}")
+        account = traffic.accounts[index % len(traffic.accounts)]
+
+        while time.perf_counter() < deadline:
+            operation = rng.choices(operations, weights)[0]
+            started = time.perf_counter()
+            try:
+                await getattr(traffic, operation)(account, rng)
+            except Exception:
+                errors[operation] += 1
+            else:
+                latencies[operation].append(time.perf_counter() - started)
+
+            # A networked client always yields between requests; without
+            # this, stand-in calls that never suspend starve the lag probe
+            await asyncio.sleep(ARGS.think_ms / 1000)
+
+    probe = asyncio.create_task(lag_probe(stop, lag))
+    started = time.perf_counter()
+    await asyncio.gather(*[virtual_user(index) for index in range(concurrency)])
+    wall = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "overall": summarize(all_latencies, wall),
+        "operations": {name: summarize(values, wall) for name, values in sorted(latencies.items())},
+        "errors": dict(errors),
+        "loopLagP50Ms": round(percentile(lag, 50), 2),
+        "loopLagP99Ms": round(percentile(lag, 99), 2),
+        "loopLagMaxMs": round(max(lag, default=0.0), 2),
+        # Share of the run the loop could not serve the probe on time;
+        # unlike percentiles, not skewed by fewer samples under blocking
+        "loopBlockedPct": round(sum(lag) / (wall * 1000) * 100, 1),
+    }
+
+
+# =========================
+# SETUP
+# =========================
+
+def connect_stand_in() -> None:
+    if ARGS.mongo_uri:
+        connect_to_database()
+        return
+
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("loadtest needs mongomock-motor (pip install -r requirements-dev.txt) or --mongo-uri")
+
+    connect_to_database(client=AsyncMongoMockClient())
+
+
+async def create_accounts(traffic: Traffic) -> None:
+    """
+    Registers and logs in every account and gives each a few resumes
+    and JDs, so analysis and history have something to work on.
+    """
+    rng = random.Random(ARGS.seed)
+
+    for account in traffic.accounts:
+        response = await traffic.client.post(
+            "/auth/register",
+            json={"name": "Load Test", "email": account.email, "password": PASSWORD}
+        )
+        if response.status_code not in (200, 201, 409):
+            raise RuntimeError(f"register: {response.status_code} {response.text}")
+
+        await traffic.login(account, rng)
+        for _ in range(ARGS.seed_documents):
+            await traffic.upload(account, rng)
+            await traffic.jd(account, rng)
+
+
+def knee(levels: list[dict]) -> int | None:
+    """
+    First concurrency level where throughput grew by less than 10% over
+    the previous level: adding users from here on only adds queueing.
+    """
+    for previous, current in zip(levels, levels[1:]):
+        if current["overall"]["opsPerSec"] < previous["overall"]["opsPerSec"] * 1.1:
+            return current["concurrency"]
+    return None
+
+
+def print_curves(levels: list[dict]) -> None:
+    by_scenario = defaultdict(list)
+    for level in levels:
+        by_scenario[level["scenario"]].append(level)
+
+    for scenario, rows in by_scenario.items():
+        print(f"\n{scenario}")
+        header = (
+            f"{'users':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'lag p99':>10}{'lag max':>10}{'blocked':>9}{'errors':>8}"
+        )
+        print(header)
+        print("-" * len(header))
+        for row in rows:
+            overall = row["overall"]
+            print(
+                f"{row['concurrency']:>6}{overall['opsPerSec']:>10}{overall['p50Ms']:>10}"
+                f"{overall['p95Ms']:>10}{overall['p99Ms']:>10}{row['loopLagP99Ms']:>10}"
+                f"{row['loopLagMaxMs']:>10}{row['loopBlockedPct']:>8}%{sum(row['errors'].values()):>8}"
+            )
+
+        saturated = knee(rows)
+        if saturated:
+            print(f"throughput stops scaling at {saturated} users")
+
+
+async def main() -> list[dict]:
+    if ARGS.encoder == "hash":
+        register_model(HashEncoder())
+    else:
+        get_model()
+
+    connect_stand_in()
+    mix = parse_mix(ARGS.mix)
+
+    from app.main import app
+
+    levels = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=120, limits=limits) as client:
+            traffic = Traffic(client, [
+                Account(f"load-{ARGS.seed}-{index}@example.com") for index in range(ARGS.users)
+            ])
+            await create_accounts(traffic)
+            if "upload" in ARGS.scenarios or "mixed" in ARGS.scenarios:
+                traffic.prepare_uploads(ARGS.upload_pool)
+
+            for scenario in ARGS.scenarios:
+                for concurrency in ARGS.concurrency:
+                    levels.append(await run_level(traffic, scenario, concurrency, mix))
+
+    return levels
+
+
+def flatten(levels: list[dict]) -> list[dict]:
+    """
+    One row per scenario, operation and level, in the layout compare.py reads.
+    """
+    rows = []
+    for level in levels:
+        case = f"concurrency={level['concurrency']}"
+        rows.append({
+            "benchmark": f"load_{level['scenario']}",
+            "case": case,
+            **level["overall"],
+            "errors": sum(level["errors"].values()),
+            "loopLagP99Ms": level["loopLagP99Ms"],
+            "loopLagMaxMs": level["loopLagMaxMs"],
+            "loopBlockedPct": level["loopBlockedPct"],
+        })
+
+        if level["scenario"] == "mixed":
+            for operation, summary in level["operations"].items():
+                rows.append({"benchmark": f"load_mixed_{operation}", "case": case, **summary})
+    return rows
+
+
+if __name__ == "__main__":
+    levels = asyncio.run(main())
+
+    print(f"encoder={ARGS.encoder} users={ARGS.users} duration={ARGS.duration}s per level")
+    print_curves(levels)
+
+    rows = flatten(levels)
+    print()
+    print_table(rows)
+
+    if ARGS.json:
+        write_results(ARGS.json, "loadtest", vars(ARGS), rows)
@@ -0,0 +1,123 @@
+"""
+Deterministic synthetic resumes, job descriptions and PDFs.
+
+Texts are built from a filler vocabulary with skill mentions (taken from
+the live skill taxonomy, canonical names and aliases) mixed in at a given
+density, i.e. the fraction of words that are skill mentions. The same
+seed always yields the same text, so runs are comparable across commits.
+"""
+import hashlib
+import random
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from app.services.skill_taxonomy_service import get_taxonomy
+
+FILLER = (
+    "designed built delivered owned improved migrated scaled maintained "
+    "led mentored reviewed automated reduced increased shipped launched "
+    "service platform pipeline system feature product customer internal "
+    "latency throughput reliability cost quality release onboarding "
+    "project stakeholders roadmap incidents on-call dashboards reports "
+    "across multiple regions using modern practices with measurable impact "
+    "the a of and to for in on with by from over"
+).split()
+
+SECTIONS = ("Summary", "Experience", "Projects", "Skills", "Education")
+
+
+def skill_vocabulary() -> list[str]:
+    taxonomy = get_taxonomy()
+    return sorted(taxonomy.skills | set(taxonomy.aliases))
+
+
+def _words(rng: random.Random, count: int, density: float, skills: list[str]) -> list[str]:
+    words = []
+    while len(words) < count:
+        if rng.random() < density:
+            words.extend(rng.choice(skills).split())
+        else:
+            words.append(rng.choice(FILLER))
+    return words[:count]
+
+
+def _sentences(rng: random.Random, words: list[str]) -> str:
+    sentences = []
+    position = 0
+    while position < len(words):
+        length = rng.randint(8, 18)
+        sentence = " ".join(words[position:position + length])
+        sentences.append(sentence[:1].upper() + sentence[1:] + ".")
+        position += length
+    return " ".join(sentences)
+
+
+def make_resume(words: int, density: float, seed: int = 0) -> str:
+    """
+    A resume of about `words` words in blank-line separated sections.
+    """
+    rng = random.Random(f"resume-{words}-{density}-{seed}")
+    skills = skill_vocabulary()
+
+    per_section = max(words // len(SECTIONS), 1)
+    sections = [
+        f"{title}\n{_sentences(rng, _words(rng, per_section, density, skills))}"
+        for title in SECTIONS
+    ]
+    return "\n\n".join(sections)
+
+
+def make_job_description(words: int, density: float, seed: int = 0) -> str:
+    rng = random.Random(f"jd-{words}-{density}-{seed}")
+    return _sentences(rng, _words(rng, words, density, skill_vocabulary()))
+
+
+def make_pdf(text: str, pages: int = 1) -> bytes:
+    """
+    A text-based PDF with `text` spread evenly over `pages` pages.
+    """
+    words = text.split()
+    per_page = -(-len(words) // pages)  # ceil
+
+    doc = fitz.open()
+    for page_number in range(pages):
+        page = doc.new_page()
+        overflow = page.insert_textbox(
+            fitz.Rect(40, 40, 560, 800),
+            " ".join(words[page_number * per_page:(page_number + 1) * per_page]),
+            fontsize=8
+        )
+        # PyMuPDF writes nothing at all when the text does not fit
+        if overflow < 0:
+            raise ValueError(f"{per_page} words do not fit on one page; use more pages")
+    return doc.tobytes()
+
+
+class HashEncoder:
+    """
+    Stand-in for the sentence-transformers model: hashes words into a
+    fixed-size vector. Measures everything around the model (chunking,
+    batching, caching, pooling, persistence) on machines without the
+    model, and keeps e2e numbers from being dominated by inference.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                digest = hashlib.blake2b(word.encode("utf-8"), digest_size=4).digest()
+                vectors[row, int.from_bytes(digest, "little") % self.dimension] += 1.0
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1.0, norms)
+
+        return vectors